@@ -0,0 +1,138 @@
+"""Connection pool benchmark for the HTTP client
+
+Runs concurrent memory searches against a local HTTP server that adds a
+fixed latency per request and a fixed delay before the first response on
+each new connection (standing in for the TCP and TLS handshakes of a real
+server), once per connection setting, and reports the throughput of each.
+
+The gates are ratios between settings measured in the same run, and the
+latency keeps the client far from CPU-bound, so they hold on slow and
+single-CPU machines alike. Fails (exit 1) unless the default pool
+- reaches --min-parallelism of the ideal speedup over a single connection
+  (one request in flight per worker), i.e. requests are not serialized, and
+- beats opening a connection per request by --min-reuse-gain, i.e.
+  connections are kept alive and reused.
+
+Usage:
+    python benchmarks/connection_pool.py [--requests 96] [--workers 8] [--latency-ms 100]
+"""
+
+import argparse
+import gzip
+import json
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from deep_mem.api import APIClient, ConnectionOptions  # noqa: E402
+
+# Search response of realistic size (~50 KB), so compression matters
+BODY = json.dumps({
+    "memories": [
+        {"id": f"m{i}", "title": f"Memory {i}", "content": "lorem ipsum dolor " * 150,
+         "similarity_score": 0.5}
+        for i in range(20)
+    ],
+}).encode()
+GZIPPED_BODY = gzip.compress(BODY)
+
+SETTINGS = {
+    "1 connection": ConnectionOptions(max_connections=1, max_keepalive_connections=1),
+    "no keep-alive": ConnectionOptions(max_keepalive_connections=0),
+    "default": ConnectionOptions(),
+    "default, no compression": ConnectionOptions(compression=False),
+}
+
+
+def make_server(latency: float, handshake: float) -> ThreadingHTTPServer:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep connections open
+        # Headers and body are separate writes; without TCP_NODELAY each
+        # keep-alive response stalls ~40 ms on the client's delayed ACK
+        disable_nagle_algorithm = True
+
+        def setup(self):
+            super().setup()
+            time.sleep(handshake)
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            time.sleep(latency)
+            gzipped = "gzip" in self.headers.get("Accept-Encoding", "")
+            body = GZIPPED_BODY if gzipped else BODY
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            if gzipped:
+                self.send_header("Content-Encoding", "gzip")
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def run(url: str, options: ConnectionOptions, requests: int, workers: int) -> float:
+    """Return requests per second"""
+    with APIClient(url, "token", connection=options) as client:
+        client.search_memories("warmup")
+        started = time.perf_counter()
+        with ThreadPoolExecutor(workers) as executor:
+            list(executor.map(lambda i: client.search_memories(f"q{i}"), range(requests)))
+        return requests / (time.perf_counter() - started)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=96)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--latency-ms", type=float, default=100)
+    parser.add_argument("--handshake-ms", type=float, default=50,
+                        help="Delay before the first response on a new connection")
+    parser.add_argument(
+        "--min-parallelism", type=float, default=0.5,
+        help="Required speedup of the default pool over a single connection, "
+             "as a fraction of --workers",
+    )
+    parser.add_argument(
+        "--min-reuse-gain", type=float, default=1.2,
+        help="Required throughput of the default pool over no keep-alive",
+    )
+    args = parser.parse_args()
+
+    server = make_server(args.latency_ms / 1000, args.handshake_ms / 1000)
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+    results = {}
+    try:
+        for name, options in SETTINGS.items():
+            results[name] = run(url, options, args.requests, args.workers)
+            print(f"{name:<24} {results[name]:8.1f} req/s")
+    finally:
+        server.shutdown()
+
+    speedup = results["default"] / results["1 connection"]
+    need_speedup = args.min_parallelism * args.workers
+    reuse_gain = results["default"] / results["no keep-alive"]
+    checks = [
+        (speedup >= need_speedup,
+         f"default pool is {speedup:.1f}x a single connection (need {need_speedup:.1f}x)"),
+        (reuse_gain >= args.min_reuse_gain,
+         f"default pool is {reuse_gain:.2f}x no keep-alive (need {args.min_reuse_gain:.2f}x)"),
+    ]
+    for ok, message in checks:
+        print(f"{'OK' if ok else 'FAIL':<4} {message}")
+    return 0 if all(ok for ok, _ in checks) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,139 @@
+"""Search, cache and output timings at realistic corpus size
+
+Generates a synthetic corpus (deep_mem.corpus), serves it from an
+in-process mock server (deep_mem.testing) and runs generated queries
+through DeepMemorySearcher three times: with a cold thread cache, with
+the same cache warm, and with the thread metadata index added (the CLI's
+setup). The first two leave the index out, since it answers Phase 2 from
+thread summaries without any get_thread request. Every result is also
+rendered through the `--json` builder and the rich display. Reports
+per-stage percentiles and output sizes. Fails (exit 1) if any query
+errors, if the cold pass fetches no threads (nothing to compare), or if
+the warm pass fetches as many threads as the cold one (i.e. the thread
+cache is not used).
+
+Usage:
+    python benchmarks/corpus_scale.py [--memories 20000] [--queries 200] [--corpus DIR]
+"""
+
+import argparse
+import io
+import json
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from rich.console import Console  # noqa: E402
+
+from deep_mem import cli  # noqa: E402
+from deep_mem.api import APIClient  # noqa: E402
+from deep_mem.cache import ThreadCache, ThreadIndex  # noqa: E402
+from deep_mem.corpus import CorpusSpec, generate_queries, load_into  # noqa: E402
+from deep_mem.search import DeepMemorySearcher  # noqa: E402
+from deep_mem.testing import MockServer  # noqa: E402
+
+
+def percentile(samples: list[float], q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def run_pass(searcher: DeepMemorySearcher, queries: list[str], limit: int) -> dict[str, list]:
+    stages: dict[str, list] = {
+        "search": [], "json": [], "rich": [], "json_bytes": [], "errors": [],
+    }
+    for query in queries:
+        started = time.perf_counter()
+        try:
+            result = searcher.search(query, memory_limit=limit)
+        except Exception as e:
+            stages["errors"].append(f"{query!r}: {e}")
+            continue
+        stages["search"].append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        output = json.dumps(cli.result_to_dict(result), ensure_ascii=False, indent=2)
+        stages["json"].append(time.perf_counter() - started)
+        stages["json_bytes"].append(len(output.encode()))
+
+        started = time.perf_counter()
+        cli.display_result(result, verbose=True)
+        stages["rich"].append(time.perf_counter() - started)
+    return stages
+
+
+def report(name: str, stages: dict[str, list], requests: dict[str, int]) -> None:
+    print(f"\n{name}: {len(stages['search'])} queries, {len(stages['errors'])} errors, "
+          f"requests {dict(sorted(requests.items()))}")
+    for stage in ("search", "json", "rich"):
+        samples = [s * 1000 for s in stages[stage]]
+        if samples:
+            print(f"  {stage:<7} p50 {statistics.median(samples):8.2f} ms  "
+                  f"p95 {percentile(samples, 0.95):8.2f} ms  max {max(samples):8.2f} ms")
+    if stages["json_bytes"]:
+        print(f"  json output: mean {statistics.mean(stages['json_bytes']) / 1024:.1f} KB, "
+              f"max {max(stages['json_bytes']) / 1024:.1f} KB")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--memories", type=int, default=20_000)
+    parser.add_argument("--threads", type=int, help="Default: memories / 10")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--limit", type=int, default=10, help="Memories per search")
+    parser.add_argument("--corpus", help="Use a directory written by python -m deep_mem.corpus")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    spec = CorpusSpec(memories=args.memories, threads=args.threads, seed=args.seed)
+    server = MockServer()
+    started = time.perf_counter()
+    load_into(server, Path(args.corpus) if args.corpus else spec)
+    print(f"Loaded {server.memory_count} memories, {server.thread_count} threads "
+          f"in {time.perf_counter() - started:.1f}s")
+    if args.corpus:
+        queries_path = Path(args.corpus) / "queries.txt"
+        queries = [q.strip() for q in queries_path.read_text(encoding="utf-8").splitlines()
+                   if q.strip()][:args.queries]
+    else:
+        queries = list(generate_queries(spec, args.queries))
+
+    # Render into a buffer; only the rendering cost is of interest
+    cli.console._console = Console(file=io.StringIO(), width=120, force_terminal=True)
+
+    passes = {}
+    with tempfile.TemporaryDirectory() as cache_dir, \
+            APIClient.for_app(server) as client, \
+            ThreadCache(Path(cache_dir) / "threads.db") as thread_cache, \
+            ThreadIndex(Path(cache_dir) / "threads.db") as thread_index:
+        searchers = {
+            "cold cache": DeepMemorySearcher(client, thread_cache=thread_cache),
+            "warm cache": DeepMemorySearcher(client, thread_cache=thread_cache),
+            "warm cache + index": DeepMemorySearcher(
+                client, thread_cache=thread_cache, thread_index=thread_index,
+            ),
+        }
+        for name, searcher in searchers.items():
+            server.reset_counts()
+            stages = run_pass(searcher, queries, args.limit)
+            passes[name] = (stages, dict(server.requests))
+            report(name, stages, passes[name][1])
+
+    errors = [e for stages, _ in passes.values() for e in stages["errors"]]
+    for error in errors[:5]:
+        print(f"  error: {error}")
+    cold, warm, indexed = (
+        passes[name][1].get("threads/get", 0) for name in searchers
+    )
+    ok = not errors and cold > 0 and warm < cold
+    print(f"\n{'OK' if ok else 'FAIL':<4} {len(errors)} errors; thread fetches "
+          f"cold {cold}, warm {warm}, with index {indexed}")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,87 @@
+"""Import-time budget check for the deep-mem CLI
+
+Agents shell out to deep-mem many times per session, so cold start is a
+large share of each call. This script fails (exit 1) if importing the CLI
+pulls in modules that belong on a lazy path, or if startup exceeds the
+time budget.
+
+Usage:
+    python benchmarks/import_budget.py [--budget-ms 75] [--runs 5]
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# Entry points and the modules each must not import
+CHECKS = {
+    # `deep-mem --help` / `--version`
+    "import deep_mem.cli": (
+        "rich", "httpx", "asyncio", "sqlite3", "dotenv", "socketserver",
+    ),
+    # Everything the `search --json` path loads before the first request
+    "import deep_mem.cli, deep_mem.config, deep_mem.search, deep_mem.daemon": (
+        "rich", "rich.markdown", "asyncio",
+    ),
+}
+
+
+def import_profile(statement: str) -> tuple[float, set[str]]:
+    """Run statement in a fresh interpreter
+
+    Returns the cumulative time spent importing deep_mem modules (in ms,
+    interpreter startup excluded) and the names of all imported modules.
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    modules = set()
+    total_us = 0
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if not cumulative.strip().isdigit():
+            continue  # header row
+        # Top-level imports have a single space before the name
+        if name.startswith(" deep_mem"):
+            total_us += int(cumulative)
+        modules.add(name.strip())
+    return total_us / 1000, modules
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--budget-ms", type=float, default=75.0,
+                        help="Max median import time of deep_mem.cli")
+    parser.add_argument("--runs", type=int, default=5, help="Runs per measurement")
+    args = parser.parse_args()
+
+    failed = False
+    for statement, forbidden in CHECKS.items():
+        _, modules = import_profile(statement)
+        leaked = sorted(m for m in forbidden if m in modules)
+        status = "FAIL" if leaked else "OK"
+        print(f"{status:4} {statement}: {'imports ' + ', '.join(leaked) if leaked else 'lazy'}")
+        failed |= bool(leaked)
+
+    timings = [import_profile("import deep_mem.cli")[0] for _ in range(args.runs)]
+    median = statistics.median(timings)
+    over = median > args.budget_ms
+    print(f"{'FAIL' if over else 'OK':4} deep_mem.cli import: "
+          f"{median:.1f} ms median (budget {args.budget_ms:.0f} ms)")
+    failed |= over
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
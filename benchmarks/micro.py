@@ -0,0 +1,231 @@
+"""Micro-benchmarks for the CPU-bound parsing and rendering paths
+
+Every search parses a memory search response, parses thread metadata,
+and then renders either JSON (`--json`) or rich output; `expand` renders
+a whole thread, deciding per message whether it is Markdown. This script
+times each of those at several payload sizes and compares the results
+with stored baselines (micro_baseline.json next to this file). Fails
+(exit 1) if a case is slower than its baseline by more than --tolerance.
+
+Baselines are scaled by a calibration workload timed on both machines, so
+a baseline recorded on a faster or slower machine still applies roughly.
+After an intended change in speed, rewrite them with --update.
+
+Usage:
+    python benchmarks/micro.py [-k 'parse_*'] [--tolerance 0.5] [--update]
+"""
+
+import argparse
+import io
+import json
+import platform
+import sys
+import timeit
+from fnmatch import fnmatchcase as fnmatch
+from pathlib import Path
+from typing import Any, Callable
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from rich.console import Console  # noqa: E402
+
+from deep_mem import cli  # noqa: E402
+from deep_mem.search import DeepMemorySearcher, DeepSearchResult  # noqa: E402
+from deep_mem.testing import sample_corpus  # noqa: E402
+
+BASELINE_PATH = Path(__file__).resolve().parent / "micro_baseline.json"
+
+# Items per payload: memories per search response, threads per thread
+# search response and memories per JSON result
+SIZES = (10, 100, 1000)
+# Memories per rendered result and messages per rendered thread; rich
+# rendering costs about a millisecond per printed item
+RENDER_SIZES = (10, 100)
+
+# Every nth message of a "markdown" thread has headings and a code block
+MARKDOWN_EVERY = 4
+
+MARKDOWN_MESSAGE = """## 方案对比
+
+Use a **connection pool** and retry on 5xx:
+
+```python
+with httpx.Client(limits=limits) as client:
+    response = client.get(url)
+```
+
+- 优点: fewer handshakes
+- 缺点: idle sockets
+"""
+
+
+def memory_response(records: list[dict[str, Any]], shape: str) -> dict[str, Any] | list:
+    """A memory search response in one of the shapes the searcher accepts"""
+    container, layout = shape.split("-")
+    items = []
+    for i, memory in enumerate(records):
+        score = round(1 - i / (len(records) + 1), 4)
+        if layout == "nested":
+            items.append({"memory": memory, "similarity_score": score,
+                          "relevance_reason": "matched query terms"})
+        else:
+            items.append({**memory, "similarity_score": score})
+    if container == "list":
+        return items
+    return {"results": items, "total_found": len(items)}
+
+
+def build_cases() -> dict[str, Callable[[], Any]]:
+    """Benchmark name -> zero-argument callable"""
+    records, threads = sample_corpus(
+        memories=max(SIZES), threads=max(SIZES), messages_per_thread=0, seed=1,
+    )
+    _, (long_thread,) = sample_corpus(
+        memories=0, threads=1, messages_per_thread=max(RENDER_SIZES), seed=1,
+    )
+    searcher = DeepMemorySearcher(client=None)
+    thread_objs = [payload["thread"] for payload in threads]
+    buffer = io.StringIO()
+    console = Console(file=buffer, width=120, force_terminal=True)
+    cli.console._console = console
+
+    def render(fn: Callable[[], Any]) -> Callable[[], Any]:
+        def run() -> None:
+            buffer.seek(0)
+            buffer.truncate()
+            fn()
+        return run
+
+    cases: dict[str, Callable[[], Any]] = {}
+    for n in SIZES:
+        for shape in ("list-nested", "list-flat", "results-nested", "results-flat"):
+            response = memory_response(records[:n], shape)
+            cases[f"parse_memories/{shape}/n={n}"] = (
+                lambda response=response: searcher._parse_memories(response)
+            )
+
+        subset = thread_objs[:n]
+        cases[f"parse_thread/n={n}"] = (
+            lambda subset=subset: [searcher._parse_thread(t) for t in subset]
+        )
+
+        result = DeepSearchResult(
+            query="连接池 retry",
+            memories=searcher._parse_memories(memory_response(records[:n], "results-nested")),
+            related_threads=[searcher._parse_thread(t) for t in thread_objs[:max(1, n // 2)]],
+            total_memories_found=n,
+            total_threads_found=max(1, n // 2),
+        )
+        # The same serialization as `search --json`
+        cases[f"json_output/n={n}"] = lambda result=result: json.dumps(
+            cli.result_to_dict(result), ensure_ascii=False, indent=2,
+        )
+        if n in RENDER_SIZES:
+            cases[f"display_result/n={n}"] = render(
+                lambda result=result: cli.display_result(result, verbose=True)
+            )
+
+    for n in RENDER_SIZES:
+        plain = {"thread": long_thread["thread"], "messages": long_thread["messages"][:n]}
+        markdown = {
+            "thread": plain["thread"],
+            "messages": [
+                {**msg, "content": MARKDOWN_MESSAGE} if i % MARKDOWN_EVERY == 0 else msg
+                for i, msg in enumerate(plain["messages"])
+            ],
+        }
+        cases[f"thread_detail/plain/n={n}"] = render(
+            lambda plain=plain: cli.display_thread_detail(plain, console)
+        )
+        cases[f"thread_detail/markdown/n={n}"] = render(
+            lambda markdown=markdown: cli.display_thread_detail(markdown, console)
+        )
+    return cases
+
+
+def calibration() -> None:
+    """Fixed pure-Python workload used to compare machine speed"""
+    data = [{"id": f"mem-{i}", "text": "记忆 memory " * 8, "score": i / 7} for i in range(200)]
+    decoded = json.loads(json.dumps(data, ensure_ascii=False))
+    sorted((item["text"][:20], item["id"]) for item in decoded)
+
+
+def measure(fn: Callable[[], Any], repeat: int) -> float:
+    """Best time per call in microseconds"""
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number * 1e6
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-k", dest="pattern",
+                        help="Only run cases matching this glob, e.g. 'parse_*' or '*/n=10'")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing rounds per case")
+    parser.add_argument("--tolerance", type=float, default=0.5,
+                        help="Allowed slowdown over baseline, as a fraction")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--update", action="store_true",
+                        help="Store the measured times as the new baselines")
+    args = parser.parse_args()
+
+    stored: dict[str, Any] = {}
+    if args.baseline.exists():
+        stored = json.loads(args.baseline.read_text(encoding="utf-8"))
+    baselines = stored.get("cases", {})
+
+    cases = build_cases()
+    if args.pattern:
+        pattern = args.pattern if "*" in args.pattern else f"*{args.pattern}*"
+        cases = {name: fn for name, fn in cases.items() if fnmatch(name, pattern)}
+
+    # Calibrate before and after; the faster run is the least disturbed by
+    # CPU frequency ramps and neighbours
+    calibration_us = measure(calibration, args.repeat)
+    print(f"Timing {len(cases)} cases...")
+    measured = {name: measure(fn, args.repeat) for name, fn in cases.items()}
+    calibration_us = min(calibration_us, measure(calibration, args.repeat))
+    # >1 when this machine is slower than the one that recorded the baselines
+    speed = calibration_us / stored["calibration_us"] if stored else 1.0
+    print(f"calibration {calibration_us:.1f} us (x{speed:.2f} of baseline machine)")
+
+    slower = []
+    width = max(map(len, cases), default=0)
+    for name, us in measured.items():
+        base = baselines.get(name)
+        if base is None:
+            verdict = "NEW"
+        else:
+            ratio = us / (base * speed)
+            verdict = f"{ratio:5.2f}x"
+            if ratio > 1 + args.tolerance:
+                verdict += "  FAIL"
+                slower.append(name)
+        print(f"{name:<{width}}  {us:12.1f} us  {verdict}")
+
+    if args.update:
+        cases_out = {**baselines, **measured} if args.pattern else measured
+        if args.pattern and stored:
+            # Keep the stored calibration and convert the new times to the
+            # speed of the machine it was measured on
+            calibration_us = stored["calibration_us"]
+            cases_out.update({name: us / speed for name, us in measured.items()})
+        args.baseline.write_text(json.dumps({
+            "python": platform.python_version(),
+            "calibration_us": round(calibration_us, 2),
+            "cases": {name: round(us, 2) for name, us in sorted(cases_out.items())},
+        }, indent=2) + "\n", encoding="utf-8")
+        print(f"Wrote {len(cases_out)} baselines to {args.baseline}")
+        return 0
+
+    if slower:
+        print(f"\nFAIL {len(slower)} cases more than {args.tolerance:.0%} slower than baseline:")
+        for name in slower:
+            print(f"  {name}")
+        return 1
+    print(f"\nOK   {len(measured)} cases within {args.tolerance:.0%} of baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
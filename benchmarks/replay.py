@@ -0,0 +1,91 @@
+"""Replay recorded traffic through the current deep-mem
+
+Takes a cassette recorded with MEM_RECORD_FILE (see deep_mem.cassette),
+reruns every recorded deep memory search through DeepMemorySearcher with
+the server replaced by ReplayTransport, and reports search latency
+percentiles. With --scale 0 the recorded server time drops out and only
+deep-mem's own work is measured; run the same cassette against two
+versions to compare them. Fails (exit 1) if any search errors.
+
+Searches start with empty thread caches, so threads that were cache hits
+while recording may be missing from the cassette; those requests are
+counted as misses and the searches carry on without them.
+
+Usage:
+    python benchmarks/replay.py CASSETTE [--scale 1.0] [--searches 500]
+"""
+
+import argparse
+import statistics
+import sys
+import tempfile
+import time
+from itertools import islice
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from deep_mem.api import APIClient  # noqa: E402
+from deep_mem.cache import ThreadCache, ThreadIndex  # noqa: E402
+from deep_mem.cassette import ReplayTransport, recorded_searches  # noqa: E402
+from deep_mem.search import DeepMemorySearcher  # noqa: E402
+
+
+def percentile(samples: list[float], q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("cassette", type=Path)
+    parser.add_argument("--scale", type=float, default=1.0,
+                        help="Factor for recorded response times (0: no delay)")
+    parser.add_argument("--searches", type=int, help="Replay only the first N searches")
+    args = parser.parse_args()
+
+    transport = ReplayTransport.load(args.cassette, scale=args.scale)
+    searches = [
+        payload for payload in recorded_searches(args.cassette)
+        if payload.get("mode", "deep") == "deep" and not payload.get("filter_labels")
+    ]
+    searches = list(islice(searches, args.searches))
+    print(f"Loaded {len(transport)} recorded responses, {len(searches)} searches")
+    if not searches:
+        print("FAIL no deep memory searches in cassette")
+        return 1
+
+    latencies, errors = [], []
+    with tempfile.TemporaryDirectory() as cache_dir, \
+            APIClient("http://replay", "replay", transport=transport) as client, \
+            ThreadCache(Path(cache_dir) / "threads.db") as thread_cache, \
+            ThreadIndex(Path(cache_dir) / "threads.db") as thread_index:
+        searcher = DeepMemorySearcher(
+            client, thread_cache=thread_cache, thread_index=thread_index,
+        )
+        started = time.perf_counter()
+        for payload in searches:
+            search_started = time.perf_counter()
+            try:
+                searcher.search(payload["query"], memory_limit=payload.get("limit", 10))
+            except Exception as e:
+                errors.append(f"{payload['query']!r}: {e}")
+                continue
+            latencies.append(time.perf_counter() - search_started)
+        total = time.perf_counter() - started
+
+    if latencies:
+        samples = [s * 1000 for s in latencies]
+        print(f"search  p50 {statistics.median(samples):8.2f} ms  "
+              f"p95 {percentile(samples, 0.95):8.2f} ms  max {max(samples):8.2f} ms  "
+              f"total {total:.2f}s (scale {args.scale:g})")
+    for error in errors[:5]:
+        print(f"  error: {error}")
+    ok = not errors
+    print(f"{'OK' if ok else 'FAIL':<4} {len(errors)} errors, "
+          f"{transport.misses} requests missing from the cassette")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
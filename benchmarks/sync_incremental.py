@@ -0,0 +1,130 @@
+"""Incremental sync check for the offline mirror
+
+Syncs a mirror from the in-process mock server: a first full copy, a
+second sync with nothing changed, a third after one thread gained a
+message and one memory was added, and a fourth after one thread was
+deleted on the server. Fails (exit 1) unless the second sync downloads
+no threads and rewrites no memories, the third picks up exactly the two
+changes, and the fourth drops the deleted thread from the mirror and the
+full-text index. A last sync with the thread listing capped below the
+number of threads must report the truncation and delete nothing. The
+thread objects returned by
+get_thread carry an updated_at that summaries lack, so a mirror that
+versions threads by their full object instead of their summary would
+download every thread on every sync.
+
+Usage:
+    python benchmarks/sync_incremental.py [--memories 500] [--threads 50]
+"""
+
+import argparse
+import copy
+import sqlite3
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from deep_mem import mirror as mirror_module  # noqa: E402
+from deep_mem.api import APIClient  # noqa: E402
+from deep_mem.fulltext import ThreadTextIndex  # noqa: E402
+from deep_mem.mirror import Mirror, SyncStats, sync  # noqa: E402
+from deep_mem.testing import MockServer, sample_corpus  # noqa: E402
+
+
+class DetailedThreadClient:
+    """APIClient whose get_thread adds updated_at to the thread object"""
+
+    def __init__(self, client: APIClient):
+        self._client = client
+
+    def __getattr__(self, name: str):
+        return getattr(self._client, name)
+
+    def get_thread(self, thread_id: str) -> dict:
+        payload = self._client.get_thread(thread_id)
+        thread = {**payload["thread"], "updated_at": payload["thread"]["created_at"]}
+        return {**payload, "thread": thread}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--memories", type=int, default=500)
+    parser.add_argument("--threads", type=int, default=50)
+    args = parser.parse_args()
+
+    memories, threads = sample_corpus(args.memories, args.threads)
+    server = MockServer(memories, threads)
+    checks = []
+
+    def run(name: str, mirror: Mirror, client: DetailedThreadClient) -> SyncStats:
+        server.reset_counts()
+        stats = sync(client, mirror, text_index=text_index)
+        print(f"{name:<10} memories listed {stats.memories_seen:5}, "
+              f"written {stats.memories_written:5}; threads fetched {stats.threads_fetched:4}, "
+              f"removed {stats.threads_removed:3}, "
+              f"get_thread requests {server.requests.get('threads/get', 0)}")
+        return stats
+
+    with tempfile.TemporaryDirectory() as cache_dir, \
+            APIClient.for_app(server) as api_client, \
+            Mirror(Path(cache_dir) / "mirror.db") as mirror:
+        try:
+            text_index = ThreadTextIndex(Path(cache_dir) / "fulltext.db")
+        except sqlite3.OperationalError:
+            text_index = None  # SQLite without FTS5; check the mirror only
+        client = DetailedThreadClient(api_client)
+        first = run("first", mirror, client)
+        checks.append(("first sync copies every thread", first.threads_fetched == len(threads)))
+
+        second = run("unchanged", mirror, client)
+        checks.append(("unchanged sync fetches no threads",
+                       second.threads_fetched == 0 and not server.requests.get("threads/get")))
+        checks.append(("unchanged sync rewrites no memories", second.memories_written == 0))
+        checks.append(("unchanged sync lists fewer memories",
+                       second.memories_seen < first.memories_seen))
+
+        changed = copy.deepcopy(threads[0])
+        changed["messages"].append({"role": "user", "content": "one more message"})
+        changed["thread"]["message_count"] = len(changed["messages"])
+        changed["thread"]["last_activity"] = "2099-01-01T00:00:00Z"
+        server.add_threads([changed])
+        server.add_memories([
+            {**memories[0], "id": "mem-new", "created_at": "2099-01-01T00:00:00Z"},
+        ])
+
+        third = run("changed", mirror, client)
+        checks.append(("changed sync fetches the changed thread only", third.threads_fetched == 1))
+        checks.append(("changed sync writes the new memory only", third.memories_written == 1))
+
+        deleted = threads[1]["thread"]["thread_id"]
+        indexed = len(text_index) if text_index is not None else 0
+        server.remove_threads([deleted])
+        fourth = run("deleted", mirror, client)
+        checks.append(("deleted thread is dropped from the mirror",
+                       fourth.threads_removed == 1 and mirror.get_thread(deleted) is None))
+        if text_index is not None:
+            checks.append(("deleted thread is dropped from the full-text index",
+                           len(text_index) == indexed - 1))
+
+        limit = mirror_module.SYNC_THREAD_LIMIT
+        mirror_module.SYNC_THREAD_LIMIT = server.thread_count - 1
+        try:
+            capped = run("capped", mirror, client)
+        finally:
+            mirror_module.SYNC_THREAD_LIMIT = limit
+        checks.append(("capped listing is reported and deletes nothing",
+                       capped.threads_truncated and capped.threads_removed == 0
+                       and mirror.counts()["threads"] == server.thread_count))
+        if text_index is not None:
+            text_index.close()
+
+    failed = [name for name, ok in checks if not ok]
+    for name, ok in checks:
+        print(f"{'OK' if ok else 'FAIL':<4} {name}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
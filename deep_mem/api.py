@@ -1,42 +1,458 @@
 """API client for Nowledge Mem server"""
 
-from typing import Any
-import httpx
+import itertools
+import json
+import threading
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Iterator, Self
+
+from deep_mem import timings
+from deep_mem.hooks import NO_HOOKS, Hooks
+
+if TYPE_CHECKING:
+    # httpx is imported on first request so callers that never reach the
+    # network (daemon forwarding, --help) don't pay for it
+    import httpx
+
+    from concurrent.futures import ThreadPoolExecutor
+    from pathlib import Path
+
+    from deep_mem.cache import ResultCache
+    from deep_mem.config import Config
+    from deep_mem.resilience import CircuitBreaker, HedgingPolicy, RetryPolicy
+    from deep_mem.stream import ThreadEvent
+
+# Bytes read per network chunk when streaming thread payloads
+STREAM_CHUNK_SIZE = 64 * 1024
 
 SUCCESS_CODES = frozenset({200, 201, 202, 204})
 
+# `unix:///path/to/mem.sock` addresses the server over a Unix domain socket
+UNIX_URL_PREFIX = "unix://"
+
+# Marks the 404 deep_mem.cassette.ReplayTransport answers for unrecorded
+# requests; it says nothing about the server, so it is never cached
+REPLAY_MISS_HEADER = "x-deep-mem-replay-miss"
+
 
 class APIError(Exception):
-    """Raised when API request fails"""
-    def __init__(self, message: str, status_code: int | None = None):
+    """Raised when API request fails
+
+    cacheable is False when the status doesn't come from the server (e.g. a
+    request missing from a replay cassette), so a 404 must not be
+    remembered as a deleted thread.
+    """
+    def __init__(self, message: str, status_code: int | None = None, cacheable: bool = True):
         super().__init__(message)
         self.status_code = status_code
+        self.cacheable = cacheable
 
 
-class APIClient:
-    """HTTP client for Nowledge Mem API"""
+class CircuitOpenError(APIError):
+    """Raised without contacting the server while the circuit breaker is open"""
+    pass
+
+
+@dataclass
+class ConnectionOptions:
+    """Connection pool, protocol and timeout settings for the HTTP client
+
+    Unset timeouts fall back to the client's overall timeout. The pool
+    limits are httpx's own defaults: a batch run (8 searches at once, each
+    fetching up to 5 threads) must not queue for connections.
+
+    Attributes:
+        max_connections: Max concurrent connections to the server
+        max_keepalive_connections: Idle connections kept open for reuse
+        keepalive_expiry: Seconds an idle connection is kept open
+        http2: Negotiate HTTP/2 (requires the `http2` extra)
+        compression: Accept compressed responses; disable for a local server,
+            where compressing costs more than it saves
+        connect_timeout: Seconds to establish a connection
+        read_timeout: Seconds to wait for each chunk of the response
+        write_timeout: Seconds to send each chunk of the request
+        pool_timeout: Seconds to wait for a free connection from the pool
+    """
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 30.0
+    http2: bool = False
+    compression: bool = True
+    connect_timeout: float | None = None
+    read_timeout: float | None = None
+    write_timeout: float | None = None
+    pool_timeout: float | None = None
+
+    def client_kwargs(self, timeout: float) -> dict[str, Any]:
+        """Keyword arguments for httpx.Client / httpx.AsyncClient"""
+        import httpx
+
+        if self.http2:
+            try:
+                import h2  # noqa: F401
+            except ImportError:
+                from deep_mem.config import ConfigError
+                raise ConfigError(
+                    "MEM_HTTP2 requires the h2 package: pip install 'deep-mem[http2]'"
+                ) from None
+
+        def pick(value: float | None) -> float:
+            return timeout if value is None else value
+
+        return {
+            "timeout": httpx.Timeout(
+                connect=pick(self.connect_timeout),
+                read=pick(self.read_timeout),
+                write=pick(self.write_timeout),
+                pool=pick(self.pool_timeout),
+            ),
+            "limits": httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_keepalive_connections,
+                keepalive_expiry=self.keepalive_expiry,
+            ),
+            "http2": self.http2,
+        }
+
+
+def _check_response(response: "httpx.Response", action: str, with_body: bool = False) -> None:
+    """Raise APIError if the response status is not a success code"""
+    if response.status_code in SUCCESS_CODES:
+        return
+    message = f"{action} failed: {response.status_code}"
+    if REPLAY_MISS_HEADER in response.headers:
+        raise APIError(f"{message} (not in replay cassette)", response.status_code, cacheable=False)
+    if with_body:
+        message += f" - {response.text[:200]}"
+    raise APIError(message, status_code=response.status_code)
+
+
+def _unsent(error: Exception | None) -> bool:
+    """Whether a transport error means the request never reached the server"""
+    import httpx
+    return isinstance(error, (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout))
+
 
-    def __init__(self, base_url: str, auth_token: str, timeout: float = 30.0):
+def _split_unix_url(url: str) -> tuple[str, str | None]:
+    """Split a unix:// URL into an HTTP base URL and the socket path"""
+    if not url.startswith(UNIX_URL_PREFIX):
+        return url, None
+    path = url[len(UNIX_URL_PREFIX):]
+    if not path:
+        from deep_mem.config import ConfigError
+        raise ConfigError(f"Missing socket path in API URL: {url}")
+    return "http://localhost", path
+
+
+def _decode_json(body: bytes) -> Any:
+    with timings.stage("decode"):
+        return json.loads(body)
+
+
+def _abandon(future) -> None:
+    """Done-callback for the losing copy of a hedged request: close its
+    response and keep its trace out of the timings
+    """
+    if not future.cancelled() and future.exception() is None:
+        response, trace = future.result()
+        response.close()
+        if trace is not None:
+            trace.cancel()
+
+
+def _memory_search_payload(
+    query: str,
+    limit: int,
+    mode: str,
+    filter_labels: str | None,
+) -> dict[str, Any]:
+    payload: dict[str, Any] = {
+        "query": query,
+        "limit": limit,
+        "mode": mode,
+    }
+    if filter_labels:
+        payload["filter_labels"] = filter_labels
+    return payload
+
+
+class _BaseClient:
+    """Connection settings and request policy shared by the sync and async clients
+
+    Without a retry_policy every request is attempted once; without a
+    circuit_breaker requests are always sent; without a hedging policy
+    slow requests are never duplicated.
+
+    base_url may be a `unix:///path.sock` URL to talk to a local server over
+    a Unix domain socket. A transport (e.g. httpx.WSGITransport or
+    httpx.ASGITransport wrapping an in-process app) replaces the network
+    entirely; pool settings then do not apply. With record_path, every
+    request/response pair is appended to that cassette file (see
+    deep_mem.cassette).
+
+    hooks receive request, retry and result cache events (see
+    deep_mem.hooks). Hooks passed in belong to the caller and are left
+    open; those from_config builds are closed with the client.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        auth_token: str,
+        timeout: float = 30.0,
+        result_cache: "ResultCache | None" = None,
+        retry_policy: "RetryPolicy | None" = None,
+        circuit_breaker: "CircuitBreaker | None" = None,
+        hedging: "HedgingPolicy | None" = None,
+        connection: ConnectionOptions | None = None,
+        transport: "httpx.BaseTransport | httpx.AsyncBaseTransport | None" = None,
+        hooks: Hooks | None = None,
+        record_path: "Path | None" = None,
+    ):
+        base_url, self.uds = _split_unix_url(base_url)
         self.base_url = base_url.rstrip("/")
         self.auth_token = auth_token
         self.timeout = timeout
-        self._client: httpx.Client | None = None
+        self.connection = connection or ConnectionOptions()
+        self.transport = transport
+        self.record_path = record_path
+        self.hooks = hooks or NO_HOOKS
+        self._owns_hooks = False
+        self.result_cache = result_cache
+        self.retry_policy = retry_policy
+        self.circuit_breaker = circuit_breaker
+        self.hedging = hedging
+        self._client = None
+        # Requests may be issued from several threads (concurrent Phase 2,
+        # speculative search), so client creation must happen once
+        self._client_lock = threading.Lock()
 
-    def _get_client(self) -> httpx.Client:
-        if self._client is None:
-            self._client = httpx.Client(
-                headers={
-                    "Authorization": f"Bearer {self.auth_token}",
-                    "Content-Type": "application/json",
-                },
-                timeout=self.timeout,
+    @classmethod
+    def from_config(
+        cls,
+        config: "Config",
+        transport: "httpx.BaseTransport | httpx.AsyncBaseTransport | None" = None,
+    ) -> Self:
+        """Build a client from Config, with its caches and request policies
+
+        With config.replay_file set (and no transport given), responses come
+        from that cassette instead of the server.
+        """
+        from deep_mem.hooks import hooks_from_config
+        from deep_mem.resilience import CircuitBreaker, HedgingPolicy, RetryPolicy
+
+        result_cache = None
+        if config.result_cache_size > 0:
+            from deep_mem.cache import ResultCache
+            result_cache = ResultCache(
+                max_entries=config.result_cache_size,
+                max_bytes=config.result_cache_bytes,
+                ttl=config.result_cache_ttl,
+            )
+        circuit_breaker = None
+        if config.breaker_threshold > 0:
+            circuit_breaker = CircuitBreaker(
+                failure_threshold=config.breaker_threshold,
+                reset_timeout=config.breaker_reset,
+                # A replay must not trip (or reset) the live breaker
+                state_path=None if config.replay_file else config.breaker_state_path,
+            )
+        hedging = None
+        if config.hedge_percentile > 0:
+            hedging = HedgingPolicy(percentile=config.hedge_percentile)
+        if transport is None and config.replay_file is not None:
+            from deep_mem.cassette import ReplayTransport
+            if not config.replay_file.is_file():
+                from deep_mem.config import ConfigError
+                raise ConfigError(f"MEM_REPLAY_FILE not found: {config.replay_file}")
+            transport = ReplayTransport.load(config.replay_file, scale=config.replay_scale)
+        client = cls(
+            config.api_url,
+            config.auth_token,
+            config.timeout,
+            result_cache=result_cache,
+            retry_policy=RetryPolicy(
+                max_retries=config.max_retries,
+                backoff_base=config.retry_backoff,
+            ),
+            circuit_breaker=circuit_breaker,
+            hedging=hedging,
+            connection=ConnectionOptions(
+                max_connections=config.max_connections,
+                max_keepalive_connections=config.max_keepalive_connections,
+                keepalive_expiry=config.keepalive_expiry,
+                http2=config.http2,
+                compression=config.compression,
+                connect_timeout=config.connect_timeout,
+                read_timeout=config.read_timeout,
+                write_timeout=config.write_timeout,
+                pool_timeout=config.pool_timeout,
+            ),
+            transport=transport,
+            hooks=hooks_from_config(config),
+            record_path=config.record_file,
+        )
+        client._owns_hooks = True
+        return client
+
+    def _cached_body(self, key: tuple) -> bytes | None:
+        """Cached response body for key, or None"""
+        if self.result_cache is None:
+            return None
+        body = self.result_cache.get(key)
+        if body is None:
+            self.hooks.cache_miss("result")
+        else:
+            self.hooks.cache_hit("result")
+        return body
+
+    def _cached(self, key: tuple) -> Any | None:
+        """Decoded cached response for key, or None"""
+        body = self._cached_body(key)
+        return None if body is None else _decode_json(body)
+
+    def _store_body(self, key: tuple, response: "httpx.Response") -> bytes:
+        """Cache the response body under key and return it"""
+        if self.result_cache is not None:
+            self.result_cache.put(key, response.content)
+        return response.content
+
+    def _store(self, key: tuple, response: "httpx.Response") -> Any:
+        """Cache the response body under key and return it decoded"""
+        return _decode_json(self._store_body(key, response))
+
+    def _headers(self) -> dict[str, str]:
+        headers = {
+            "Authorization": f"Bearer {self.auth_token}",
+            "Content-Type": "application/json",
+        }
+        if not self.connection.compression:
+            headers["Accept-Encoding"] = "identity"
+        return headers
+
+    def _client_kwargs(self, transport_cls: type) -> dict[str, Any]:
+        """Keyword arguments for the httpx client
+
+        transport_cls is the network transport class (sync or async) used
+        for Unix socket URLs and for recording.
+        """
+        kwargs = {"headers": self._headers(), **self.connection.client_kwargs(self.timeout)}
+        transport = self.transport
+        if transport is None and (self.uds is not None or self.record_path is not None):
+            # A custom transport replaces the client's own pool, so it
+            # carries the pool settings itself
+            transport = transport_cls(
+                uds=self.uds,
+                limits=kwargs.pop("limits"),
+                http2=kwargs.pop("http2"),
             )
+        if self.record_path is not None:
+            from deep_mem.cassette import RecordingTransport
+            transport = RecordingTransport(transport, self.record_path)
+        if transport is not None:
+            kwargs["transport"] = transport
+        return kwargs
+
+    def _hedge_delay(self, hedge_key: str | None) -> float | None:
+        if self.hedging is None or hedge_key is None:
+            return None
+        return self.hedging.delay(hedge_key)
+
+    def _record_latency(self, hedge_key: str | None, started: float) -> None:
+        if self.hedging is not None and hedge_key is not None:
+            self.hedging.record(hedge_key, time.perf_counter() - started)
+
+    def _report_attempt(
+        self,
+        action: str,
+        started: float,
+        response: "httpx.Response | None" = None,
+        error: Exception | None = None,
+    ) -> None:
+        """Pass the outcome of an attempt to the hooks"""
+        seconds = time.perf_counter() - started
+        if response is None:
+            self.hooks.request_end(action, seconds, None, None, type(error).__name__)
+        else:
+            # Streamed bodies are unread at this point
+            size = len(response.content) if response.is_stream_consumed else None
+            self.hooks.request_end(action, seconds, response.status_code, size)
+
+    def _before_attempt(self) -> bool:
+        """Check the circuit breaker; True if this attempt is its probe"""
+        if self.circuit_breaker is not None:
+            return self.circuit_breaker.before_request()
+        return False
+
+    def _retry_delay(
+        self,
+        attempt: int,
+        response: "httpx.Response | None" = None,
+        error: Exception | None = None,
+    ) -> float | None:
+        """Record the outcome of an attempt and decide whether to retry
+
+        response is None for transport errors, passed as error. Only errors
+        raised before the request reached the server are retried: after a
+        read or write timeout the server may be hung, and retrying would
+        hold the caller for several timeouts before the breaker counts one
+        failure. Returns the backoff delay in seconds, or None if the
+        outcome is final.
+        """
+        failed = response is None or (
+            self.retry_policy is not None
+            and response.status_code in self.retry_policy.retry_statuses
+        )
+        if self.circuit_breaker is not None:
+            if failed:
+                self.circuit_breaker.record_failure()
+            else:
+                self.circuit_breaker.record_success()
+
+        if not failed or self.retry_policy is None:
+            return None
+        if response is None and not _unsent(error):
+            return None
+        if attempt >= self.retry_policy.max_retries:
+            return None
+        if self.circuit_breaker is not None and self.circuit_breaker.is_open:
+            return None
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        return self.retry_policy.delay(attempt, retry_after)
+
+
+class APIClient(_BaseClient):
+    """HTTP client for Nowledge Mem API"""
+
+    _client: "httpx.Client | None"
+    _hedge_executor: "ThreadPoolExecutor | None" = None
+
+    @classmethod
+    def for_app(cls, app: Any, auth_token: str = "in-process", **kwargs: Any) -> Self:
+        """Client calling a WSGI app in-process, without any sockets"""
+        import httpx
+        return cls("http://localhost", auth_token, transport=httpx.WSGITransport(app=app), **kwargs)
+
+    def _get_client(self) -> "httpx.Client":
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    # Includes importing httpx, a large share of a cold CLI call
+                    with timings.stage("setup"):
+                        import httpx
+                        self._client = httpx.Client(**self._client_kwargs(httpx.HTTPTransport))
         return self._client
 
     def close(self) -> None:
+        if self._hedge_executor is not None:
+            self._hedge_executor.shutdown(wait=False)
+            self._hedge_executor = None
         if self._client is not None:
             self._client.close()
             self._client = None
+        if self._owns_hooks:
+            self.hooks.close()
 
     def __enter__(self) -> "APIClient":
         return self
@@ -45,6 +461,117 @@ class APIClient:
         self.close()
         return False
 
+    def _send(
+        self,
+        method: str,
+        path: str,
+        action: str,
+        with_body: bool = False,
+        stream: bool = False,
+        hedge_key: str | None = None,
+        **kwargs: Any,
+    ) -> "httpx.Response":
+        """Send a request with retries, raising APIError on failure
+
+        With stream=True the body is left unread and the caller must close
+        the response. Requests with a hedge_key may be hedged; only pass one
+        for idempotent reads.
+        """
+        self._get_client()  # Imports httpx, timed as setup
+        import httpx
+
+        for attempt in itertools.count():
+            probe = self._before_attempt()
+            try:
+                self.hooks.request_start(action)
+                started = time.perf_counter()
+                try:
+                    response = self._attempt(method, path, stream, hedge_key, kwargs)
+                except httpx.TransportError as e:
+                    self._report_attempt(action, started, error=e)
+                    delay = self._retry_delay(attempt, error=e)
+                    if delay is None:
+                        raise
+                    reason = type(e).__name__
+                else:
+                    self._report_attempt(action, started, response)
+                    delay = self._retry_delay(attempt, response)
+                    if delay is None:
+                        if stream and response.status_code not in SUCCESS_CODES:
+                            response.read()
+                            response.close()
+                        _check_response(response, action, with_body)
+                        return response
+                    response.close()
+                    reason = str(response.status_code)
+            finally:
+                if probe:
+                    # Even if the probe recorded no outcome (e.g. an unexpected
+                    # error); otherwise the breaker would stay half-open for good
+                    self.circuit_breaker.end_probe()
+            self.hooks.retry(action, attempt + 1, delay, reason)
+            time.sleep(delay)
+
+    def _attempt(
+        self,
+        method: str,
+        path: str,
+        stream: bool,
+        hedge_key: str | None,
+        kwargs: dict[str, Any],
+    ) -> "httpx.Response":
+        """Send one attempt, duplicating it if it outlives the hedging delay"""
+        client = self._get_client()
+
+        def send() -> "tuple[httpx.Response, timings.RequestTrace | None]":
+            started = time.perf_counter()
+            request = client.build_request(method, f"{self.base_url}{path}", **kwargs)
+            trace = timings.RequestTrace() if timings.active() else None
+            if trace is not None:
+                request.extensions["trace"] = trace
+            response = client.send(request, stream=stream)
+            if trace is not None:
+                trace.end()
+            self._record_latency(hedge_key, started)
+            return response, trace
+
+        def finish(sent: "tuple[httpx.Response, timings.RequestTrace | None]") -> "httpx.Response":
+            """Record the trace of the attempt whose response is used"""
+            response, trace = sent
+            if trace is not None:
+                trace.finish(body_read=not stream)
+            return response
+
+        delay = self._hedge_delay(hedge_key)
+        if delay is None:
+            return finish(send())
+
+        from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+        with self._client_lock:
+            if self._hedge_executor is None:
+                self._hedge_executor = ThreadPoolExecutor(thread_name_prefix="deep-mem-hedge")
+            executor = self._hedge_executor
+
+        primary = executor.submit(timings.bind(send))
+        if wait([primary], timeout=delay).done:
+            return finish(primary.result())
+
+        hedge = executor.submit(timings.bind(send))
+        pending = {primary, hedge}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            winners = [f for f in (primary, hedge) if f in done and f.exception() is None]
+            if winners:
+                winner = winners[0]
+                self.hedging.record_hedge(won=winner is hedge)
+                # The slower request can't be aborted; discard its response
+                for future in (primary, hedge):
+                    if future is not winner:
+                        future.add_done_callback(_abandon)
+                return finish(winner.result())
+        return finish(primary.result())  # Both failed; raise the original error
+
     def search_memories(
         self,
         query: str,
@@ -63,35 +590,50 @@ class APIClient:
         Returns:
             Search results with memories and metadata
         """
-        client = self._get_client()
-        payload = {
-            "query": query,
-            "limit": limit,
-            "mode": mode,
-        }
-        if filter_labels:
-            payload["filter_labels"] = filter_labels
+        return _decode_json(self.search_memories_raw(query, limit, mode, filter_labels))
 
-        response = client.post(f"{self.base_url}/memories/search", json=payload)
+    def search_memories_raw(
+        self,
+        query: str,
+        limit: int = 10,
+        mode: str = "deep",
+        filter_labels: str | None = None,
+    ) -> bytes:
+        """Like search_memories, but return the undecoded response body"""
+        key = ("memories/search", query, limit, mode, filter_labels)
+        body = self._cached_body(key)
+        if body is not None:
+            return body
 
-        if response.status_code not in SUCCESS_CODES:
-            raise APIError(
-                f"Memory search failed: {response.status_code} - {response.text[:200]}",
-                status_code=response.status_code,
-            )
-        return response.json()
+        payload = _memory_search_payload(query, limit, mode, filter_labels)
+        response = self._send(
+            "POST", "/memories/search", "Memory search", with_body=True,
+            hedge_key="memories/search", json=payload,
+        )
+        return self._store_body(key, response)
 
     def get_memory(self, memory_id: str) -> dict[str, Any]:
         """Get a specific memory by ID"""
-        client = self._get_client()
-        response = client.get(f"{self.base_url}/memories/{memory_id}")
+        response = self._send("GET", f"/memories/{memory_id}", "Get memory")
+        return _decode_json(response.content)
 
-        if response.status_code not in SUCCESS_CODES:
-            raise APIError(
-                f"Get memory failed: {response.status_code}",
-                status_code=response.status_code,
-            )
-        return response.json()
+    def list_memories(
+        self,
+        limit: int = 100,
+        offset: int = 0,
+        updated_since: str | None = None,
+    ) -> dict[str, Any] | list:
+        """List memories page by page (used by `deep-mem sync`)
+
+        GET /memories is not part of the documented API; servers without
+        it answer 404. updated_since asks for memories updated (or created)
+        at or after that timestamp; servers that ignore it list everything.
+        """
+        params: dict[str, Any] = {"limit": limit, "offset": offset}
+        if updated_since:
+            params["updated_since"] = updated_since
+        response = self._send("GET", "/memories", "List memories", params=params)
+        return _decode_json(response.content)
 
     def search_threads(
         self,
@@ -109,45 +651,276 @@ class APIClient:
         Returns:
             Search results with threads and metadata
         """
-        client = self._get_client()
+        key = ("threads/search", query, limit, mode)
+        cached = self._cached(key)
+        if cached is not None:
+            return cached
+
         params = {
             "query": query,
             "limit": limit,
             "mode": mode,
         }
-
-        response = client.get(f"{self.base_url}/threads/search", params=params)
-
-        if response.status_code not in SUCCESS_CODES:
-            raise APIError(
-                f"Thread search failed: {response.status_code} - {response.text[:200]}",
-                status_code=response.status_code,
-            )
-        return response.json()
+        response = self._send(
+            "GET", "/threads/search", "Thread search", with_body=True, params=params,
+        )
+        return self._store(key, response)
 
     def get_thread(self, thread_id: str) -> dict[str, Any]:
         """Get a specific thread with all messages"""
-        client = self._get_client()
-        response = client.get(f"{self.base_url}/threads/{thread_id}")
+        response = self._send(
+            "GET", f"/threads/{thread_id}", "Get thread", hedge_key="threads/get",
+        )
+        return _decode_json(response.content)
 
-        if response.status_code not in SUCCESS_CODES:
-            raise APIError(
-                f"Get thread failed: {response.status_code}",
-                status_code=response.status_code,
-            )
-        return response.json()
+    def stream_thread(self, thread_id: str) -> Iterator["ThreadEvent"]:
+        """Stream a thread, yielding messages as they are decoded
+
+        Yields the events described in deep_mem.stream. Peak memory is
+        bounded by the largest message, not the whole thread. Closing the
+        iterator early closes the connection. Only establishing the
+        response is retried.
+        """
+        from deep_mem.stream import iter_thread_events
+
+        response = self._send("GET", f"/threads/{thread_id}", "Get thread", stream=True)
+        try:
+            yield from iter_thread_events(response.iter_bytes(STREAM_CHUNK_SIZE))
+        finally:
+            response.close()
 
     def get_thread_summaries(self, limit: int = 50) -> dict[str, Any]:
         """Get thread summaries/titles"""
+        response = self._send(
+            "GET", "/threads/summaries", "Get summaries", params={"limit": limit},
+        )
+        return _decode_json(response.content)
+
+
+class AsyncAPIClient(_BaseClient):
+    """Asynchronous HTTP client for Nowledge Mem API
+
+    Mirrors APIClient method for method. A single instance shares one
+    connection pool and can serve many concurrent searches on one event loop.
+    """
+
+    _client: "httpx.AsyncClient | None"
+
+    @classmethod
+    def for_app(cls, app: Any, auth_token: str = "in-process", **kwargs: Any) -> Self:
+        """Client calling an ASGI app in-process, without any sockets"""
+        import httpx
+        return cls("http://localhost", auth_token, transport=httpx.ASGITransport(app=app), **kwargs)
+
+    def _get_client(self) -> "httpx.AsyncClient":
+        if self._client is None:
+            with timings.stage("setup"):
+                import httpx
+                self._client = httpx.AsyncClient(
+                    **self._client_kwargs(httpx.AsyncHTTPTransport)
+                )
+        return self._client
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        if self._owns_hooks:
+            self.hooks.close()
+
+    async def __aenter__(self) -> "AsyncAPIClient":
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> bool:
+        await self.aclose()
+        return False
+
+    async def _send(
+        self,
+        method: str,
+        path: str,
+        action: str,
+        with_body: bool = False,
+        hedge_key: str | None = None,
+        **kwargs: Any,
+    ) -> "httpx.Response":
+        """Send a request with retries (see APIClient._send)"""
+        import asyncio
+
+        self._get_client()  # Imports httpx, timed as setup
+        import httpx
+
+        for attempt in itertools.count():
+            probe = self._before_attempt()
+            try:
+                self.hooks.request_start(action)
+                started = time.perf_counter()
+                try:
+                    response = await self._attempt(method, path, hedge_key, kwargs)
+                except httpx.TransportError as e:
+                    self._report_attempt(action, started, error=e)
+                    delay = self._retry_delay(attempt, error=e)
+                    if delay is None:
+                        raise
+                    reason = type(e).__name__
+                else:
+                    self._report_attempt(action, started, response)
+                    delay = self._retry_delay(attempt, response)
+                    if delay is None:
+                        _check_response(response, action, with_body)
+                        return response
+                    reason = str(response.status_code)
+            finally:
+                if probe:
+                    # Even if the probe recorded no outcome (e.g. an unexpected
+                    # error); otherwise the breaker would stay half-open for good
+                    self.circuit_breaker.end_probe()
+            self.hooks.retry(action, attempt + 1, delay, reason)
+            await asyncio.sleep(delay)
+
+    async def _attempt(
+        self,
+        method: str,
+        path: str,
+        hedge_key: str | None,
+        kwargs: dict[str, Any],
+    ) -> "httpx.Response":
+        """Send one attempt, duplicating it if it outlives the hedging delay"""
+        import asyncio
+
         client = self._get_client()
-        response = client.get(
-            f"{self.base_url}/threads/summaries",
-            params={"limit": limit},
+
+        async def send() -> "tuple[httpx.Response, timings.RequestTrace | None]":
+            started = time.perf_counter()
+            request = client.build_request(method, f"{self.base_url}{path}", **kwargs)
+            trace = timings.RequestTrace() if timings.active() else None
+            if trace is not None:
+                request.extensions["trace"] = trace.trace_async
+            response = await client.send(request)
+            if trace is not None:
+                trace.end()
+            self._record_latency(hedge_key, started)
+            return response, trace
+
+        def finish(sent: "tuple[httpx.Response, timings.RequestTrace | None]") -> "httpx.Response":
+            """Record the trace of the attempt whose response is used"""
+            response, trace = sent
+            if trace is not None:
+                trace.finish()
+            return response
+
+        delay = self._hedge_delay(hedge_key)
+        if delay is None:
+            return finish(await send())
+
+        primary = asyncio.ensure_future(send())
+        done, _ = await asyncio.wait({primary}, timeout=delay)
+        if done:
+            return finish(primary.result())
+
+        hedge = asyncio.ensure_future(send())
+        pending = {primary, hedge}
+        winner = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in (primary, hedge):
+                    if task in done and task.exception() is None:
+                        winner = task
+                        self.hedging.record_hedge(won=task is hedge)
+                        return finish(task.result())
+            return finish(primary.result())  # Both failed; raise the original error
+        finally:
+            for task in (primary, hedge):
+                if task in pending:
+                    task.cancel()
+                elif task is not winner and not task.cancelled() and task.exception() is None:
+                    # Finished together with the winner; discard its response
+                    response, trace = task.result()
+                    if trace is not None:
+                        trace.cancel()
+                    await response.aclose()
+
+    async def search_memories(
+        self,
+        query: str,
+        limit: int = 10,
+        mode: str = "deep",
+        filter_labels: str | None = None,
+    ) -> dict[str, Any]:
+        """Search memories with semantic search (see APIClient.search_memories)"""
+        return _decode_json(await self.search_memories_raw(query, limit, mode, filter_labels))
+
+    async def search_memories_raw(
+        self,
+        query: str,
+        limit: int = 10,
+        mode: str = "deep",
+        filter_labels: str | None = None,
+    ) -> bytes:
+        """Like search_memories, but return the undecoded response body"""
+        key = ("memories/search", query, limit, mode, filter_labels)
+        body = self._cached_body(key)
+        if body is not None:
+            return body
+
+        payload = _memory_search_payload(query, limit, mode, filter_labels)
+        response = await self._send(
+            "POST", "/memories/search", "Memory search", with_body=True,
+            hedge_key="memories/search", json=payload,
         )
+        return self._store_body(key, response)
 
-        if response.status_code not in SUCCESS_CODES:
-            raise APIError(
-                f"Get summaries failed: {response.status_code}",
-                status_code=response.status_code,
-            )
-        return response.json()
+    async def get_memory(self, memory_id: str) -> dict[str, Any]:
+        """Get a specific memory by ID"""
+        response = await self._send("GET", f"/memories/{memory_id}", "Get memory")
+        return _decode_json(response.content)
+
+    async def list_memories(
+        self,
+        limit: int = 100,
+        offset: int = 0,
+        updated_since: str | None = None,
+    ) -> dict[str, Any] | list:
+        """List memories page by page (see APIClient.list_memories)"""
+        params: dict[str, Any] = {"limit": limit, "offset": offset}
+        if updated_since:
+            params["updated_since"] = updated_since
+        response = await self._send("GET", "/memories", "List memories", params=params)
+        return _decode_json(response.content)
+
+    async def search_threads(
+        self,
+        query: str,
+        limit: int = 20,
+        mode: str = "full",
+    ) -> dict[str, Any]:
+        """Search threads with message matching (see APIClient.search_threads)"""
+        key = ("threads/search", query, limit, mode)
+        cached = self._cached(key)
+        if cached is not None:
+            return cached
+
+        params = {
+            "query": query,
+            "limit": limit,
+            "mode": mode,
+        }
+        response = await self._send(
+            "GET", "/threads/search", "Thread search", with_body=True, params=params,
+        )
+        return self._store(key, response)
+
+    async def get_thread(self, thread_id: str) -> dict[str, Any]:
+        """Get a specific thread with all messages"""
+        response = await self._send(
+            "GET", f"/threads/{thread_id}", "Get thread", hedge_key="threads/get",
+        )
+        return _decode_json(response.content)
+
+    async def get_thread_summaries(self, limit: int = 50) -> dict[str, Any]:
+        """Get thread summaries/titles"""
+        response = await self._send(
+            "GET", "/threads/summaries", "Get summaries", params={"limit": limit},
+        )
+        return _decode_json(response.content)
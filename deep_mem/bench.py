@@ -0,0 +1,175 @@
+"""Latency benchmark against a live server (`deep-mem diagnose bench`)
+
+Runs each operation a fixed number of times at a given concurrency and
+reports latency percentiles, throughput and response bytes, so one can
+tell whether the server is fast enough for agents, not just reachable.
+Byte counts come from the client's hooks and are decoded body sizes.
+"""
+
+import math
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from itertools import cycle, islice
+from typing import Any, Callable
+
+from deep_mem.api import APIClient
+from deep_mem.hooks import Hooks, MultiHooks
+
+# Operations in report order
+OPERATIONS = ("memories/deep", "memories/fast", "threads/search", "threads/get", "search")
+
+PERCENTILES = (0.5, 0.9, 0.99)
+
+
+class _ByteCounter(Hooks):
+    """Sums response sizes of finished requests"""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.requests = 0
+
+    def request_end(self, endpoint, seconds, status, response_bytes, error=None) -> None:
+        with self._lock:
+            self.requests += 1
+            self.bytes += response_bytes or 0
+
+
+@dataclass(slots=True)
+class OperationStats:
+    """Outcome of benchmarking one operation"""
+    name: str
+    latencies: list[float] = field(default_factory=list)
+    errors: int = 0
+    seconds: float = 0.0
+    response_bytes: int = 0
+    requests: int = 0
+    first_error: str | None = None
+    skipped: str | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        """Summary in milliseconds, requests/operations per second and bytes"""
+        done = len(self.latencies)
+        summary: dict[str, Any] = {
+            "iterations": done + self.errors,
+            "errors": self.errors,
+        }
+        if self.skipped:
+            summary["skipped"] = self.skipped
+        if done:
+            ordered = sorted(self.latencies)
+            for q in PERCENTILES:
+                summary[f"p{round(q * 100)}_ms"] = round(_percentile(ordered, q) * 1000, 2)
+            summary["max_ms"] = round(ordered[-1] * 1000, 2)
+            summary["mean_ms"] = round(sum(ordered) / done * 1000, 2)
+        if self.seconds > 0:
+            summary["ops_per_s"] = round((done + self.errors) / self.seconds, 2)
+        summary["requests"] = self.requests
+        summary["response_bytes"] = self.response_bytes
+        if self.first_error:
+            summary["first_error"] = self.first_error
+        return summary
+
+
+def _percentile(ordered: list[float], q: float) -> float:
+    """Nearest-rank percentile of sorted samples"""
+    rank = max(1, min(len(ordered), math.ceil(q * len(ordered))))
+    return ordered[rank - 1]
+
+
+def _thread_ids(client: APIClient, queries: list[str], count: int) -> list[str]:
+    """Existing thread IDs to fetch: recent summaries, else search results"""
+    try:
+        response = client.get_thread_summaries(limit=count)
+        items = response if isinstance(response, list) else (
+            response.get("summaries") or response.get("threads") or []
+        )
+    except Exception:
+        items = []
+    if not items:
+        for query in queries:
+            try:
+                items = client.search_threads(query, limit=count).get("threads", [])
+            except Exception:
+                continue
+            if items:
+                break
+    return [tid for item in items if (tid := item.get("thread_id") or item.get("id"))]
+
+
+def run_benchmark(
+    client: APIClient,
+    queries: list[str],
+    iterations: int = 20,
+    concurrency: int = 1,
+    operations: tuple[str, ...] = OPERATIONS,
+    limit: int = 10,
+    warmup: int = 1,
+    progress: Callable[[str], None] | None = None,
+) -> list[OperationStats]:
+    """Benchmark operations, one after another
+
+    Each operation runs `warmup` uncounted calls, then `iterations` calls
+    spread over `concurrency` threads, cycling through queries (or thread
+    IDs for threads/get). The client's result cache is bypassed so every
+    call reaches the server.
+    """
+    from deep_mem.search import DeepMemorySearcher
+
+    counter = _ByteCounter()
+    client.hooks = MultiHooks([client.hooks, counter])
+    client.result_cache = None
+    report = progress or (lambda message: None)
+    searcher = DeepMemorySearcher(client, thread_concurrency=concurrency)
+
+    calls: dict[str, Callable[[str], Any]] = {
+        "memories/deep": lambda q: client.search_memories_raw(q, limit=limit, mode="deep"),
+        "memories/fast": lambda q: client.search_memories_raw(q, limit=limit, mode="fast"),
+        "threads/search": lambda q: client.search_threads(q, limit=limit),
+        "threads/get": client.get_thread,
+        "search": lambda q: searcher.search(q, memory_limit=limit),
+    }
+
+    results = []
+    for name in operations:
+        stats = OperationStats(name)
+        results.append(stats)
+        args = queries
+        if name == "threads/get":
+            args = _thread_ids(client, queries, min(iterations, 100))
+            if not args:
+                stats.skipped = "no threads found"
+                continue
+
+        call = calls[name]
+        for arg in islice(cycle(args), warmup):
+            try:
+                call(arg)
+            except Exception:
+                pass  # Counted runs will report it
+
+        def timed(arg: str) -> float | Exception:
+            started = time.perf_counter()
+            try:
+                call(arg)
+            except Exception as e:
+                return e
+            return time.perf_counter() - started
+
+        report(f"{name} ({iterations} calls)")
+        bytes_before, requests_before = counter.bytes, counter.requests
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+            outcomes = list(executor.map(timed, islice(cycle(args), iterations)))
+        stats.seconds = time.perf_counter() - started
+        stats.response_bytes = counter.bytes - bytes_before
+        stats.requests = counter.requests - requests_before
+        for outcome in outcomes:
+            if isinstance(outcome, Exception):
+                stats.errors += 1
+                stats.first_error = stats.first_error or str(outcome)
+            else:
+                stats.latencies.append(outcome)
+    return results
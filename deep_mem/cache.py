@@ -0,0 +1,405 @@
+"""Local caches for Nowledge Mem responses"""
+
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Hashable, Iterable, Iterator, Self
+
+from deep_mem.api import APIError
+from deep_mem.config import (
+    DEFAULT_RESULT_CACHE_BYTES,
+    DEFAULT_RESULT_CACHE_SIZE,
+    DEFAULT_RESULT_CACHE_TTL,
+    DEFAULT_SUMMARY_REFRESH_INTERVAL,
+    DEFAULT_THREAD_CACHE_TTL,
+)
+
+# Streamed threads larger than this (in characters) are not cached
+DEFAULT_MAX_STREAM_CACHE_CHARS = 8 * 1024 * 1024
+
+# Milliseconds a connection waits on a lock held by another process
+_BUSY_TIMEOUT_MS = 5000
+
+
+class _SQLiteStore:
+    """Shared connection handling for the on-disk caches
+
+    The database runs in WAL mode with a busy timeout, so several CLI
+    processes can read and write the same file concurrently. A single
+    instance may be shared between threads.
+    """
+
+    _schema: tuple[str, ...] = ()
+
+    def __init__(self, path: Path | str, ttl: float):
+        self.path = Path(path)
+        self.ttl = ttl
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            self.path,
+            timeout=_BUSY_TIMEOUT_MS / 1000,
+            check_same_thread=False,
+            isolation_level=None,  # autocommit; each statement is atomic
+        )
+        self._conn.execute(f"PRAGMA busy_timeout = {_BUSY_TIMEOUT_MS}")
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.execute("PRAGMA synchronous = NORMAL")
+        for statement in self._schema:
+            self._conn.execute(statement)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> bool:
+        self.close()
+        return False
+
+
+class ThreadCache(_SQLiteStore):
+    """SQLite-backed read-through cache for get_thread payloads
+
+    Entries record when they were fetched and expire after `ttl` seconds.
+    Threads the server reported as missing (404) are remembered as well,
+    so they are not requested again until the entry expires.
+    """
+
+    _schema = ("""
+        CREATE TABLE IF NOT EXISTS threads (
+            thread_id TEXT PRIMARY KEY,
+            payload TEXT,
+            status INTEGER NOT NULL,
+            fetched_at REAL NOT NULL
+        )
+    """,)
+
+    def __init__(self, path: Path | str, ttl: float = DEFAULT_THREAD_CACHE_TTL):
+        super().__init__(path, ttl)
+
+    def get(self, thread_id: str) -> dict[str, Any] | None:
+        """Return the cached payload, or None if absent or expired
+
+        Raises:
+            APIError: If the thread is cached as deleted (404)
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload, status, fetched_at FROM threads WHERE thread_id = ?",
+                (thread_id,),
+            ).fetchone()
+        if row is None:
+            return None
+
+        payload, status, fetched_at = row
+        if time.time() - fetched_at > self.ttl:
+            return None
+        if payload is None:
+            raise APIError(f"Get thread failed: {status} (cached)", status_code=status)
+        return json.loads(payload)
+
+    def put(self, thread_id: str, payload: dict[str, Any]) -> None:
+        """Store a thread payload fetched just now"""
+        self._store(thread_id, json.dumps(payload, ensure_ascii=False), 200)
+
+    def put_missing(self, thread_id: str, status: int = 404) -> None:
+        """Remember that the server has no such thread"""
+        self._store(thread_id, None, status)
+
+    def _store(self, thread_id: str, payload: str | None, status: int) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO threads (thread_id, payload, status, fetched_at) "
+                "VALUES (?, ?, ?, ?)",
+                (thread_id, payload, status, time.time()),
+            )
+
+    def invalidate(self, thread_id: str) -> None:
+        """Drop a single entry"""
+        with self._lock:
+            self._conn.execute("DELETE FROM threads WHERE thread_id = ?", (thread_id,))
+
+    def clear(self) -> None:
+        """Drop all entries"""
+        with self._lock:
+            self._conn.execute("DELETE FROM threads")
+
+    def fetch(
+        self,
+        thread_id: str,
+        loader: Callable[[str], dict[str, Any]],
+    ) -> dict[str, Any]:
+        """Return the cached payload, calling loader(thread_id) on a miss
+
+        Cache read and write failures (e.g. a lock held too long by another
+        process) degrade to an uncached fetch instead of failing the call.
+        """
+        try:
+            payload = self.get(thread_id)
+        except sqlite3.Error:
+            payload = None
+        if payload is not None:
+            return payload
+
+        try:
+            payload = loader(thread_id)
+        except APIError as e:
+            if e.status_code == 404 and e.cacheable:
+                self._store_quietly(thread_id, None, e.status_code)
+            raise
+        self._store_quietly(thread_id, json.dumps(payload, ensure_ascii=False), 200)
+        return payload
+
+    async def afetch(
+        self,
+        thread_id: str,
+        loader: Callable[[str], Awaitable[dict[str, Any]]],
+    ) -> dict[str, Any]:
+        """fetch() for async callers: loader is awaited, and cache reads and
+        writes run in a worker thread so SQLite never blocks the event loop
+        """
+        import asyncio
+
+        try:
+            payload = await asyncio.to_thread(self.get, thread_id)
+        except sqlite3.Error:
+            payload = None
+        if payload is not None:
+            return payload
+
+        try:
+            payload = await loader(thread_id)
+        except APIError as e:
+            if e.status_code == 404 and e.cacheable:
+                await asyncio.to_thread(self._store_quietly, thread_id, None, e.status_code)
+            raise
+        await asyncio.to_thread(
+            lambda: self._store_quietly(thread_id, json.dumps(payload, ensure_ascii=False), 200)
+        )
+        return payload
+
+    def tee(
+        self,
+        thread_id: str,
+        events: Iterator[tuple[str, Any]],
+        max_chars: int = DEFAULT_MAX_STREAM_CACHE_CHARS,
+    ) -> Iterator[tuple[str, Any]]:
+        """Pass stream events through, caching the thread once fully read
+
+        The payload is only collected while it stays under max_chars, so
+        huge threads stream with bounded memory and are simply not cached.
+        """
+        fields: dict[str, Any] = {}
+        messages: list[Any] | None = []
+        size = 0
+        try:
+            for kind, payload in events:
+                if messages is not None:
+                    if kind == "message":
+                        # Message content dominates the payload size
+                        size += len(str(payload.get("content", "")))
+                        messages.append(payload)
+                    else:
+                        key, value = payload
+                        fields[key] = value
+                    if size > max_chars:
+                        fields, messages = {}, None
+                yield kind, payload
+        except APIError as e:
+            if e.status_code == 404 and e.cacheable:
+                self._store_quietly(thread_id, None, e.status_code)
+            raise
+
+        if messages is not None:
+            fields["messages"] = messages
+            self._store_quietly(thread_id, json.dumps(fields, ensure_ascii=False), 200)
+
+    def _store_quietly(self, thread_id: str, payload: str | None, status: int) -> None:
+        try:
+            self._store(thread_id, payload, status)
+        except sqlite3.Error:
+            pass
+
+
+# Thread fields kept by ThreadIndex; enough to build a ThreadResult
+_THREAD_META_FIELDS = ("title", "summary", "message_count", "created_at", "last_activity")
+
+
+class ThreadIndex(_SQLiteStore):
+    """Local index of thread metadata (title, summary, message count)
+
+    Lets Phase 2 resolve related threads without downloading their
+    messages. Entries come from get_thread_summaries, thread search results
+    and any full thread payload seen, and expire after `ttl` seconds.
+    """
+
+    _schema = (
+        """
+        CREATE TABLE IF NOT EXISTS thread_meta (
+            thread_id TEXT PRIMARY KEY,
+            meta TEXT NOT NULL,
+            fetched_at REAL NOT NULL
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS index_state (
+            key TEXT PRIMARY KEY,
+            value REAL NOT NULL
+        )
+        """,
+    )
+
+    def __init__(
+        self,
+        path: Path | str,
+        ttl: float = DEFAULT_THREAD_CACHE_TTL,
+        refresh_interval: float = DEFAULT_SUMMARY_REFRESH_INTERVAL,
+    ):
+        super().__init__(path, ttl)
+        self.refresh_interval = refresh_interval
+
+    def get_many(self, thread_ids: Iterable[str]) -> dict[str, dict[str, Any]]:
+        """Return fresh metadata for whichever of thread_ids are indexed"""
+        thread_ids = list(thread_ids)
+        if not thread_ids:
+            return {}
+        placeholders = ",".join("?" * len(thread_ids))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT thread_id, meta FROM thread_meta "
+                f"WHERE thread_id IN ({placeholders}) AND fetched_at >= ?",
+                (*thread_ids, time.time() - self.ttl),
+            ).fetchall()
+        return {tid: json.loads(meta) for tid, meta in rows}
+
+    def put_many(self, threads: Iterable[dict[str, Any]]) -> None:
+        """Index thread objects (from summaries, search results or get_thread)"""
+        now = time.time()
+        rows = []
+        for thread in threads:
+            tid = thread.get("thread_id") or thread.get("id")
+            if not tid:
+                continue
+            meta = {k: thread[k] for k in _THREAD_META_FIELDS if k in thread}
+            meta["thread_id"] = tid
+            rows.append((tid, json.dumps(meta, ensure_ascii=False), now))
+        if not rows:
+            return
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO thread_meta (thread_id, meta, fetched_at) "
+                "VALUES (?, ?, ?)",
+                rows,
+            )
+
+    def needs_refresh(self) -> bool:
+        """True if summaries have not been pulled within refresh_interval"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM index_state WHERE key = 'summaries_refreshed_at'"
+            ).fetchone()
+        return row is None or time.time() - row[0] > self.refresh_interval
+
+    def mark_refreshed(self) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO index_state (key, value) "
+                "VALUES ('summaries_refreshed_at', ?)",
+                (time.time(),),
+            )
+
+
+@dataclass
+class CacheStats:
+    """Counters for a ResultCache"""
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    entries: int = 0
+    bytes: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class ResultCache:
+    """In-memory LRU cache of raw search response bodies
+
+    Bounded by entry count and total body size; entries also expire after
+    `ttl` seconds. Bodies are stored as bytes and decoded on every hit, so
+    callers never share mutable response objects. Thread-safe.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_RESULT_CACHE_SIZE,
+        max_bytes: int = DEFAULT_RESULT_CACHE_BYTES,
+        ttl: float = DEFAULT_RESULT_CACHE_TTL,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries: OrderedDict[Hashable, tuple[bytes, float]] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._stats = CacheStats()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def stats(self) -> CacheStats:
+        """Snapshot of the hit/miss counters and current size"""
+        with self._lock:
+            return CacheStats(
+                hits=self._stats.hits,
+                misses=self._stats.misses,
+                evictions=self._stats.evictions,
+                entries=len(self._entries),
+                bytes=self._bytes,
+            )
+
+    def get(self, key: Hashable) -> bytes | None:
+        """Return the cached body for key, or None on a miss"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry[1] > self.ttl:
+                self._remove(key)
+                entry = None
+            if entry is None:
+                self._stats.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats.hits += 1
+            return entry[0]
+
+    def put(self, key: Hashable, body: bytes) -> None:
+        """Store a response body, evicting least recently used entries"""
+        if len(body) > self.max_bytes or self.max_entries <= 0:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (body, time.monotonic())
+            self._bytes += len(body)
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self._stats.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def _remove(self, key: Hashable) -> None:
+        body, _ = self._entries.pop(key)
+        self._bytes -= len(body)
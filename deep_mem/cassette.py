@@ -0,0 +1,263 @@
+"""HTTP record/replay cassettes
+
+With MEM_RECORD_FILE set, APIClient wraps its network transport in a
+RecordingTransport, which appends every request/response pair to a
+cassette: one compact JSON object per line, e.g.
+
+    {"at":1760000000.12,"elapsed":0.0421,"method":"POST","path":"/memories/search",
+     "request":"{\"query\":...}","status":200,"headers":{...},"body":"{...}"}
+
+"at" is the Unix time the request started and "elapsed" the seconds until
+its body was read. Bodies are stored decoded (no Content-Encoding); the
+Authorization header and other request headers are never written. The
+file is opened in append mode, so the CLI, batch runs and a `deep-mem
+serve` daemon can all record into one cassette. Cassettes hold memory
+contents; they are created readable by the owner only.
+
+With MEM_REPLAY_FILE set, ReplayTransport answers requests from a cassette
+instead of the network, after sleeping the recorded elapsed time times
+MEM_REPLAY_SCALE (0 replies at once). Requests are matched on method,
+path with query string, and request body; repeated requests get the
+recorded responses in order, wrapping around when they run out.
+Unrecorded requests get a 404 marked with REPLAY_MISS_HEADER, which
+APIClient turns into an uncacheable APIError. Cassettes ending in .gz are
+read through gzip, so finished recordings can be compressed.
+
+Both transports serve sync and async clients. Recording reads each body
+before returning it, so streamed thread fetches are buffered.
+"""
+
+import asyncio
+import base64
+import gzip
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+import httpx
+
+from deep_mem.api import REPLAY_MISS_HEADER
+
+# Response headers not worth storing or no longer true once the body is decoded
+_DROPPED_HEADERS = frozenset({
+    "connection", "content-encoding", "content-length", "date",
+    "keep-alive", "set-cookie", "transfer-encoding",
+})
+
+_KEPT_EXTENSIONS = ("http_version", "reason_phrase")
+
+
+
+def _request_key(method: str, path: str, body: bytes) -> tuple[str, str, bytes]:
+    return method.upper(), path, body
+
+
+def _request_path(request: httpx.Request) -> str:
+    """Path with query string; the host is not part of the key"""
+    return request.url.raw_path.decode("ascii")
+
+
+def _text_fields(data: bytes, name: str) -> dict[str, str]:
+    """data as a text field, or base64 under "<name>_b64" if not UTF-8"""
+    if not data:
+        return {}
+    try:
+        return {name: data.decode("utf-8")}
+    except UnicodeDecodeError:
+        return {f"{name}_b64": base64.b64encode(data).decode("ascii")}
+
+
+def _field_bytes(entry: dict[str, Any], name: str) -> bytes:
+    if name in entry:
+        return entry[name].encode("utf-8")
+    if f"{name}_b64" in entry:
+        return base64.b64decode(entry[f"{name}_b64"])
+    return b""
+
+
+def read_cassette(path: Path | str) -> Iterator[dict[str, Any]]:
+    """Yield the entries of a cassette in recorded order
+
+    Lines that don't parse (e.g. cut short when a recording process was
+    killed) are skipped.
+    """
+    path = Path(path).expanduser()
+    opener = gzip.open if path.suffix == ".gz" else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(entry, dict) and "path" in entry:
+                yield entry
+
+
+def recorded_searches(path: Path | str) -> Iterator[dict[str, Any]]:
+    """Memory search payloads in a cassette, in recorded order
+
+    Each is the request body: query, limit, mode and optional filter_labels.
+    """
+    for entry in read_cassette(path):
+        if entry.get("path") != "/memories/search" or "request" not in entry:
+            continue
+        try:
+            payload = json.loads(entry["request"])
+        except ValueError:
+            continue
+        if isinstance(payload, dict) and payload.get("query"):
+            yield payload
+
+
+class RecordingTransport(httpx.BaseTransport, httpx.AsyncBaseTransport):
+    """Forward requests to transport and append each exchange to a cassette
+
+    Transport errors are passed through unrecorded. Failing to write the
+    cassette never fails a request.
+    """
+
+    def __init__(
+        self,
+        transport: httpx.BaseTransport | httpx.AsyncBaseTransport,
+        path: Path | str,
+    ):
+        self._transport = transport
+        path = Path(path).expanduser()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+        # Unbuffered: each entry is a single append, whole lines even with
+        # several recording processes
+        self._file = os.fdopen(fd, "ab", buffering=0)
+        self._lock = threading.Lock()
+
+    def _record(
+        self,
+        request: httpx.Request,
+        response: httpx.Response,
+        body: bytes,
+        started_at: float,
+        started: float,
+    ) -> httpx.Response:
+        """Write the exchange and return a response carrying the read body"""
+        entry = {
+            "at": round(started_at, 6),
+            "elapsed": round(time.perf_counter() - started, 6),
+            "method": request.method,
+            "path": _request_path(request),
+            **_text_fields(request.content, "request"),
+            "status": response.status_code,
+        }
+        headers = {
+            k: v for k, v in response.headers.items() if k.lower() not in _DROPPED_HEADERS
+        }
+        if headers:
+            entry["headers"] = headers
+        entry.update(_text_fields(body, "body"))
+        line = json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n"
+        with self._lock:
+            try:
+                self._file.write(line.encode("utf-8"))
+            except (OSError, ValueError):
+                pass  # Recording must never fail a request
+
+        return httpx.Response(
+            response.status_code,
+            headers=list(headers.items()),
+            content=body,
+            extensions={k: response.extensions[k] for k in _KEPT_EXTENSIONS
+                        if k in response.extensions},
+        )
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        started_at, started = time.time(), time.perf_counter()
+        request.read()
+        response = self._transport.handle_request(request)
+        try:
+            body = response.read()
+        finally:
+            response.close()
+        return self._record(request, response, body, started_at, started)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        started_at, started = time.time(), time.perf_counter()
+        await request.aread()
+        response = await self._transport.handle_async_request(request)
+        try:
+            body = await response.aread()
+        finally:
+            await response.aclose()
+        return self._record(request, response, body, started_at, started)
+
+    def close(self) -> None:
+        self._transport.close()
+        self._file.close()
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+        self._file.close()
+
+
+class ReplayTransport(httpx.BaseTransport, httpx.AsyncBaseTransport):
+    """Answer requests from recorded entries, with their recorded timing
+
+    scale multiplies each recorded elapsed time: 1.0 replays at original
+    speed, 0.5 twice as fast, 0 without delay.
+    """
+
+    def __init__(self, entries: Iterable[dict[str, Any]], scale: float = 1.0):
+        self.scale = scale
+        self._responses: dict[tuple, list[dict[str, Any]]] = defaultdict(list)
+        for entry in entries:
+            key = _request_key(entry["method"], entry["path"], _field_bytes(entry, "request"))
+            self._responses[key].append(entry)
+        self._next: dict[tuple, int] = defaultdict(int)
+        self._lock = threading.Lock()
+        self.misses = 0
+
+    @classmethod
+    def load(cls, path: Path | str, scale: float = 1.0) -> "ReplayTransport":
+        """Replay the cassette at path"""
+        return cls(read_cassette(path), scale=scale)
+
+    def __len__(self) -> int:
+        return sum(len(entries) for entries in self._responses.values())
+
+    def _lookup(self, request: httpx.Request) -> tuple[httpx.Response, float]:
+        """The next recorded response for request and the delay before it"""
+        path = _request_path(request)
+        key = _request_key(request.method, path, request.content)
+        with self._lock:
+            entries = self._responses.get(key)
+            if not entries:
+                self.misses += 1
+                entry = None
+            else:
+                entry = entries[self._next[key] % len(entries)]
+                self._next[key] += 1
+        if entry is None:
+            detail = {"detail": f"No recorded response for {request.method} {path}"}
+            return httpx.Response(404, json=detail, headers={REPLAY_MISS_HEADER: "1"}), 0.0
+
+        return httpx.Response(
+            entry["status"],
+            headers=list(entry.get("headers", {}).items()),
+            content=_field_bytes(entry, "body"),
+        ), entry.get("elapsed", 0.0) * self.scale
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        request.read()
+        response, delay = self._lookup(request)
+        if delay > 0:
+            time.sleep(delay)
+        return response
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        await request.aread()
+        response, delay = self._lookup(request)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return response
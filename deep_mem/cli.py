@@ -1,18 +1,112 @@
-"""CLI interface for deep-mem search"""
+"""CLI interface for deep-mem search
+
+Startup time matters here: agents shell out to deep-mem many times per
+session. Heavy modules (rich, httpx, sqlite3, the daemon and search
+machinery) are imported inside the code paths that need them, so
+`--version`, `--help` and `--json` output never load rich.
+"""
 
 import json
 import sys
+from typing import TYPE_CHECKING, Iterable
 
 import click
-from rich.console import Console
-from rich.markdown import Markdown
 
-from deep_mem.api import APIClient, APIError
+from deep_mem import __version__
+from deep_mem.api import APIError
 from deep_mem.config import Config, ConfigError
-from deep_mem.search import DeepMemorySearcher, DeepSearchResult
 
+if TYPE_CHECKING:
+    from rich.console import Console
+
+    from deep_mem.cache import ThreadCache, ThreadIndex
+    from deep_mem.fulltext import ThreadTextIndex
+    from deep_mem.search import DeepSearchResult
+    from deep_mem.stream import MessageCounter, ThreadEvent
+
+
+class _LazyConsole:
+    """Stand-in for rich's Console that imports rich on first use"""
+
+    _console: "Console | None" = None
+
+    def __getattr__(self, name: str):
+        if self._console is None:
+            from rich.console import Console
+            self._console = Console()
+        return getattr(self._console, name)
+
+
+console = _LazyConsole()
+
+
+def open_thread_cache(config: Config, enabled: bool = True) -> "ThreadCache | None":
+    """Open the on-disk thread cache, or None if disabled or unavailable
+
+    Never used while replaying a cassette: replayed answers must not end
+    up in (or be served from) the live cache.
+    """
+    if not enabled or config.thread_cache_ttl <= 0 or config.replay_file is not None:
+        return None
+
+    import sqlite3
+
+    from deep_mem.cache import ThreadCache
+
+    try:
+        return ThreadCache(config.thread_cache_path, ttl=config.thread_cache_ttl)
+    except (OSError, sqlite3.Error):
+        return None  # Caching is best-effort; fall back to the network
+
+
+def open_thread_index(config: Config, enabled: bool = True) -> "ThreadIndex | None":
+    """Open the local thread metadata index, or None if disabled, unavailable
+    or replaying a cassette
+    """
+    if not enabled or config.thread_cache_ttl <= 0 or config.replay_file is not None:
+        return None
+
+    import sqlite3
+
+    from deep_mem.cache import ThreadIndex
 
-console = Console()
+    try:
+        return ThreadIndex(config.thread_cache_path, ttl=config.thread_cache_ttl)
+    except (OSError, sqlite3.Error):
+        return None
+
+
+def open_thread_search(config: Config, offline: bool = False) -> "ThreadTextIndex | None":
+    """Open the full-text index for local thread search, or None if unused
+
+    Always used offline (`sync` fills it); online only with
+    MEM_LOCAL_THREAD_SEARCH, where threads fetched by searches are added,
+    and never while replaying a cassette.
+    """
+    if not (offline or (config.local_thread_search and config.replay_file is None)):
+        return None
+
+    import sqlite3
+
+    from deep_mem.fulltext import ThreadTextIndex
+
+    try:
+        return ThreadTextIndex(config.fulltext_path)
+    except (OSError, sqlite3.Error):
+        return None  # e.g. SQLite built without FTS5; ask the client instead
+
+
+def open_client(config: Config, offline: bool = False, use_daemon: bool = True):
+    """The client to search with: the offline mirror, the daemon or the API"""
+    if offline:
+        from deep_mem.mirror import Mirror, MirrorClient
+
+        if not config.mirror_path.exists():
+            raise ConfigError("No offline mirror yet; run `deep-mem sync` first")
+        return MirrorClient(Mirror(config.mirror_path))
+
+    from deep_mem.daemon import connect
+    return connect(config, use_daemon=use_daemon)
 
 
 def format_score(score: float) -> str:
@@ -38,7 +132,64 @@ def truncate(text: str, max_len: int = 200) -> str:
     return text[:max_len - 3] + "..."
 
 
-def display_result(result: DeepSearchResult, verbose: bool = False):
+def result_to_dict(result: "DeepSearchResult") -> dict:
+    """Build the JSON representation of a search result"""
+    return {
+        "query": result.query,
+        "total_memories": result.total_memories_found,
+        "total_threads": result.total_threads_found,
+        "memories": [
+            {
+                "id": m.memory_id,
+                "title": m.title,
+                "content": m.content,
+                "score": m.similarity_score,
+                "importance": m.importance,
+                "labels": m.labels,
+                "source_thread_id": m.source_thread_id,
+            }
+            for m in result.memories
+        ],
+        "threads": [
+            {
+                "id": t.thread_id,
+                "title": t.title,
+                "summary": t.summary,
+                "message_count": t.message_count,
+            }
+            for t in result.related_threads
+        ],
+    }
+
+
+def parse_batch_line(index: int, line: str) -> dict:
+    """Parse one batch input line: a plain query or a JSON object"""
+    if line.startswith("{"):
+        request = json.loads(line)
+        if not request.get("query"):
+            raise ValueError('missing "query"')
+    else:
+        request = {"query": line}
+    return {"index": index, **request}
+
+
+def display_timings(phases: dict[str, dict[str, float]]) -> None:
+    """Print a per-phase timing table (milliseconds)"""
+    from rich.table import Table
+
+    from deep_mem.timings import STAGES
+
+    stages = [stage for stage in STAGES if any(stage in row for row in phases.values())]
+    table = Table(title="Timings (ms)", title_justify="left")
+    table.add_column("phase")
+    for stage in stages:
+        table.add_column(stage, justify="right")
+    for phase, row in phases.items():
+        table.add_row(phase, *(f"{row[stage]:.1f}" if stage in row else "" for stage in stages))
+    console.print(table)
+
+
+def display_result(result: "DeepSearchResult", verbose: bool = False):
     """Display search results with progressive disclosure and prompt injection protection"""
 
     # Header
@@ -105,41 +256,103 @@ def display_result(result: DeepSearchResult, verbose: bool = False):
         )
 
 
-def display_thread_detail(thread: dict, console: Console):
-    """Display full thread content with prompt injection protection"""
-    title = thread.get("title") or thread.get("summary") or "Thread Detail"
-    console.print(f"\n[bold cyan]{title}[/]\n")
+def thread_title(fields: dict) -> str:
+    """Title for a thread payload, falling back to its nested thread object"""
+    thread = fields.get("thread")
+    nested = thread if isinstance(thread, dict) else {}
+    return (
+        fields.get("title")
+        or fields.get("summary")
+        or nested.get("title")
+        or nested.get("summary")
+        or "Thread Detail"
+    )
 
-    messages = thread.get("messages", [])
-    if not messages:
-        console.print("[yellow]No messages in this thread.[/]")
-        return
 
-    # Prompt injection protection
-    console.print("\n<untrusted_historical_content>")
+def display_message(msg: dict, console: "Console"):
+    """Display a single thread message"""
+    role = msg.get("role", "unknown")
+    content = msg.get("content", "")
+
+    if role == "user":
+        console.print(f"\n[bold blue]User:[/]")
+    elif role == "assistant":
+        console.print(f"\n[bold green]A:[/]")
+    else:
+        console.print(f"\n[bold]{role}:[/]")
+
+    # Render as markdown if it looks like markdown
+    if "```" in content or content.startswith("#"):
+        from rich.markdown import Markdown
+        console.print(Markdown(content))
+    else:
+        console.print(content)
+
+
+def display_thread_events(
+    events: "Iterable[ThreadEvent]",
+    console: "Console",
+    source: "MessageCounter | None" = None,
+):
+    """Display a streamed thread with prompt injection protection
+
+    Messages are printed as they arrive. The header is printed with the
+    first message, using whichever fields preceded it. When events is a
+    selection of messages, source counts the messages it was taken from,
+    so an empty selection isn't reported as an empty thread.
+    """
+    fields = {}
+    started = False
+    try:
+        for kind, payload in events:
+            if kind == "field":
+                key, value = payload
+                fields[key] = value
+                continue
+            if not started:
+                console.print(f"\n[bold cyan]{thread_title(fields)}[/]\n")
+                # Prompt injection protection
+                console.print("\n<untrusted_historical_content>")
+                started = True
+            display_message(payload, console)
+    finally:
+        if started:
+            console.print("\n</untrusted_historical_content>")
+
+    if not started:
+        console.print(f"\n[bold cyan]{thread_title(fields)}[/]\n")
+        total = None if source is None else _message_total(fields, source)
+        if source is None or total == 0:
+            console.print("[yellow]No messages in this thread.[/]")
+        elif total is None:
+            console.print("[yellow]No messages in the selected range.[/]")
+        else:
+            console.print(f"[yellow]No messages in the selected range ({total} total).[/]")
 
-    for msg in messages:
-        role = msg.get("role", "unknown")
-        content = msg.get("content", "")
 
-        if role == "user":
-            console.print(f"\n[bold blue]User:[/]")
-        elif role == "assistant":
-            console.print(f"\n[bold green]A:[/]")
-        else:
-            console.print(f"\n[bold]{role}:[/]")
+def _message_total(fields: dict, source: "MessageCounter") -> int | None:
+    """Messages in a thread whose selection came out empty, if known
 
-        # Render as markdown if it looks like markdown
-        if "```" in content or content.startswith("#"):
-            console.print(Markdown(content))
-        else:
-            console.print(content)
+    Counted when the selection read the whole thread; otherwise the
+    thread's message_count, if it preceded the messages.
+    """
+    if source.total is not None:
+        return source.total
+    thread = fields.get("thread")
+    nested = thread if isinstance(thread, dict) else {}
+    count = fields.get("message_count", nested.get("message_count"))
+    return count if isinstance(count, int) and count >= source.count else None
+
+
+def display_thread_detail(thread: dict, console: "Console"):
+    """Display full thread content with prompt injection protection"""
+    from deep_mem.stream import iter_payload_events
 
-    console.print("\n</untrusted_historical_content>")
+    display_thread_events(iter_payload_events(thread), console)
 
 
 @click.group()
-@click.version_option()
+@click.version_option(version=__version__)
 def cli():
     """Deep memory search with progressive disclosure"""
     pass
@@ -151,8 +364,29 @@ def cli():
 @click.option("-t", "--threads", default=5, help="Max related threads")
 @click.option("-v", "--verbose", is_flag=True, help="Show more content")
 @click.option("--no-threads", is_flag=True, help="Skip thread search")
+@click.option(
+    "--speculative",
+    is_flag=True,
+    help="Run thread search in parallel with memory search",
+)
+@click.option("--no-cache", is_flag=True, help="Bypass the local thread cache")
+@click.option("--no-daemon", is_flag=True, help="Don't forward to a running daemon")
+@click.option("--offline", is_flag=True, help="Answer from the local mirror (see `sync`)")
 @click.option("--json", "as_json", is_flag=True, help="Output as JSON")
-def search(query: str, limit: int, threads: int, verbose: bool, no_threads: bool, as_json: bool):
+@click.option("--timings", "show_timings", is_flag=True, help="Report time spent per phase")
+def search(
+    query: str,
+    limit: int,
+    threads: int,
+    verbose: bool,
+    no_threads: bool,
+    speculative: bool,
+    no_cache: bool,
+    no_daemon: bool,
+    offline: bool,
+    as_json: bool,
+    show_timings: bool,
+):
     """Search memories with progressive thread discovery
 
     Examples:
@@ -162,6 +396,8 @@ def search(query: str, limit: int, threads: int, verbose: bool, no_threads: bool
         deep-mem search "Python async" --limit 5 --verbose
 
         deep-mem search "项目架构" --no-threads --json
+
+        deep-mem search "Python async" --timings
     """
     try:
         config = Config.from_env()
@@ -169,46 +405,44 @@ def search(query: str, limit: int, threads: int, verbose: bool, no_threads: bool
         console.print(f"[red]Configuration error:[/] {e}")
         sys.exit(1)
 
+    from contextlib import nullcontext
+
+    from deep_mem import timings
+    from deep_mem.search import DeepMemorySearcher
+
+    # The mirror holds whole threads; the caches would only duplicate it
+    thread_cache = open_thread_cache(config, enabled=not (no_cache or offline))
+    thread_index = open_thread_index(config, enabled=not (no_cache or offline))
+    thread_search = open_thread_search(config, offline)
     try:
-        with APIClient(config.api_url, config.auth_token, config.timeout) as client:
-            searcher = DeepMemorySearcher(client)
-            result = searcher.search(
-                query=query,
-                memory_limit=limit,
-                thread_limit=threads,
-                expand_threads=not no_threads,
+        with (
+            timings.collect() if show_timings else nullcontext() as collected,
+            open_client(config, offline, use_daemon=not no_daemon) as client,
+        ):
+            searcher = DeepMemorySearcher(
+                client, thread_cache=thread_cache, thread_index=thread_index,
+                thread_search=thread_search,
             )
+            with timings.phase("search"):
+                result = searcher.search(
+                    query=query,
+                    memory_limit=limit,
+                    thread_limit=threads,
+                    expand_threads=not no_threads,
+                    speculative=speculative,
+                )
 
             if as_json:
-                output = {
-                    "query": result.query,
-                    "total_memories": result.total_memories_found,
-                    "total_threads": result.total_threads_found,
-                    "memories": [
-                        {
-                            "id": m.memory_id,
-                            "title": m.title,
-                            "content": m.content,
-                            "score": m.similarity_score,
-                            "importance": m.importance,
-                            "labels": m.labels,
-                            "source_thread_id": m.source_thread_id,
-                        }
-                        for m in result.memories
-                    ],
-                    "threads": [
-                        {
-                            "id": t.thread_id,
-                            "title": t.title,
-                            "summary": t.summary,
-                            "message_count": t.message_count,
-                        }
-                        for t in result.related_threads
-                    ],
-                }
+                with timings.phase("render"):
+                    output = result_to_dict(result)
+                if collected is not None:
+                    output["timings"] = collected.to_dict()
                 print(json.dumps(output, ensure_ascii=False, indent=2))
             else:
-                display_result(result, verbose=verbose)
+                with timings.phase("render"):
+                    display_result(result, verbose=verbose)
+                if collected is not None:
+                    display_timings(collected.to_dict())
 
     except APIError as e:
         console.print(f"[red]API error:[/] {e}")
@@ -216,36 +450,304 @@ def search(query: str, limit: int, threads: int, verbose: bool, no_threads: bool
     except Exception as e:
         console.print(f"[red]Error:[/] {e}")
         sys.exit(1)
+    finally:
+        for store in (thread_cache, thread_index, thread_search):
+            if store is not None:
+                store.close()
+
+
+@cli.command()
+@click.argument("queries", type=click.File("r", encoding="utf-8"), default="-")
+@click.option("-n", "--limit", default=10, help="Default max memories per query")
+@click.option("-t", "--threads", default=5, help="Default max related threads per query")
+@click.option("-c", "--concurrency", default=8, help="Queries run at once")
+@click.option("--no-threads", is_flag=True, help="Skip thread search")
+@click.option(
+    "--speculative",
+    is_flag=True,
+    help="Run thread search in parallel with memory search",
+)
+@click.option("--no-cache", is_flag=True, help="Bypass the local thread cache")
+@click.option("--no-daemon", is_flag=True, help="Don't forward to a running daemon")
+@click.option("--offline", is_flag=True, help="Answer from the local mirror (see `sync`)")
+def batch(
+    queries,
+    limit: int,
+    threads: int,
+    concurrency: int,
+    no_threads: bool,
+    speculative: bool,
+    no_cache: bool,
+    no_daemon: bool,
+    offline: bool,
+):
+    """Run many searches and stream one JSON result per line
+
+    QUERIES is a file (default: stdin) with one query per line, or JSON
+    objects with "query" and optional "limit", "threads" and "id" keys.
+    Results are printed as they finish, tagged with the input line index.
+    Failed queries get an "error" key, and the exit status is 1 if any
+    query failed.
+
+    Examples:
+
+        deep-mem batch queries.txt -c 16 > results.jsonl
+
+        echo '{"query": "Python async", "limit": 3}' | deep-mem batch
+    """
+    try:
+        config = Config.from_env()
+    except ConfigError as e:
+        console.print(f"[red]Configuration error:[/] {e}")
+        sys.exit(1)
+
+    import functools
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+
+    from deep_mem.search import DeepMemorySearcher
+
+    def run(searcher: DeepMemorySearcher, request: dict) -> dict:
+        result = searcher.search(
+            query=request["query"],
+            memory_limit=int(request.get("limit", limit)),
+            thread_limit=int(request.get("threads", threads)),
+            expand_threads=not no_threads,
+            speculative=speculative,
+        )
+        return result_to_dict(result)
+
+    concurrency = max(1, concurrency)
+    total = failed = 0
+    output_lock = threading.Lock()
+    # Bounds in-flight work so huge inputs stream instead of queueing
+    window = threading.BoundedSemaphore(concurrency * 2)
+
+    def emit(record: dict, error: bool = False) -> None:
+        nonlocal failed
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        with output_lock:
+            failed += error
+            sys.stdout.write(line)
+            sys.stdout.flush()
+
+    def finished(request: dict, future) -> None:
+        """Done-callback: print a result as soon as its search completes"""
+        tag = {k: request[k] for k in ("index", "id") if k in request}
+        try:
+            emit({**tag, **future.result()})
+        except Exception as e:
+            emit({**tag, "query": request["query"], "error": str(e)}, error=True)
+        finally:
+            window.release()
+
+    thread_cache = open_thread_cache(config, enabled=not (no_cache or offline))
+    thread_index = open_thread_index(config, enabled=not (no_cache or offline))
+    thread_search = open_thread_search(config, offline)
+    try:
+        with open_client(config, offline, use_daemon=not no_daemon) as client, \
+                ThreadPoolExecutor(max_workers=concurrency) as executor:
+            searcher = DeepMemorySearcher(
+                client, thread_cache=thread_cache, thread_index=thread_index,
+                thread_search=thread_search,
+            )
+            for index, line in enumerate(queries):
+                line = line.strip()
+                if not line:
+                    continue
+                total += 1
+                try:
+                    request = parse_batch_line(index, line)
+                except ValueError as e:
+                    emit({"index": index, "error": f"Invalid input line: {e}"}, error=True)
+                    continue
+                window.acquire()
+                future = executor.submit(run, searcher, request)
+                future.add_done_callback(functools.partial(finished, request))
+            # Leaving the executor waits for the remaining searches and their
+            # callbacks
+    finally:
+        for store in (thread_cache, thread_index, thread_search):
+            if store is not None:
+                store.close()
+
+    click.echo(f"{total} queries, {failed} failed", err=True)
+    if failed:
+        sys.exit(1)
+
+
+def parse_message_range(text: str) -> tuple[int | None, int | None]:
+    """Parse a START:END message range; either bound may be omitted or negative"""
+    start, sep, stop = text.partition(":")
+    if not sep:
+        raise ValueError(f"expected START:END, got {text!r}")
+    try:
+        return (
+            int(start) if start.strip() else None,
+            int(stop) if stop.strip() else None,
+        )
+    except ValueError:
+        raise ValueError(f"bounds must be integers, got {text!r}") from None
 
 
 @cli.command()
 @click.argument("thread_id")
-def expand(thread_id: str):
+@click.option("--messages", "message_range", metavar="START:END",
+              help="Only show messages[START:END] (Python slice, negatives allowed)")
+@click.option("--head", type=click.IntRange(min=0), help="Only show the first N messages")
+@click.option("--tail", type=click.IntRange(min=0), help="Only show the last N messages")
+@click.option("--no-cache", is_flag=True, help="Bypass the local thread cache")
+@click.option("--no-daemon", is_flag=True, help="Don't forward to a running daemon")
+@click.option("--offline", is_flag=True, help="Answer from the local mirror (see `sync`)")
+def expand(
+    thread_id: str,
+    message_range: str | None,
+    head: int | None,
+    tail: int | None,
+    no_cache: bool,
+    no_daemon: bool,
+    offline: bool,
+):
     """View full content of a specific thread
 
-    Example:
+    Examples:
 
         deep-mem expand abc12345-...
+
+        deep-mem expand abc12345-... --tail 5
+
+        deep-mem expand abc12345-... --messages 10:20
     """
+    if sum(opt is not None for opt in (message_range, head, tail)) > 1:
+        raise click.UsageError("Use only one of --messages, --head and --tail")
+    start = stop = None
+    if message_range is not None:
+        try:
+            start, stop = parse_message_range(message_range)
+        except ValueError as e:
+            raise click.BadParameter(str(e), param_hint="--messages")
+    elif head is not None:
+        start, stop = 0, head
+    elif tail is not None:
+        # messages[-0:] would be everything
+        start, stop = (-tail, None) if tail else (0, 0)
+
     try:
         config = Config.from_env()
     except ConfigError as e:
         console.print(f"[red]Configuration error:[/] {e}")
         sys.exit(1)
 
+    from deep_mem.search import DeepMemorySearcher
+    from deep_mem.stream import MessageCounter, slice_events
+
+    thread_cache = open_thread_cache(config, enabled=not (no_cache or offline))
     try:
-        with APIClient(config.api_url, config.auth_token, config.timeout) as client:
-            thread = client.get_thread(thread_id)
-            display_thread_detail(thread, console)
+        with open_client(config, offline, use_daemon=not no_daemon) as client:
+            searcher = DeepMemorySearcher(client, thread_cache=thread_cache)
+            events = searcher.iter_thread_detail(thread_id)
+            source = None
+            if start is not None or stop is not None:
+                source = MessageCounter(events)
+                events = slice_events(source, start, stop)
+            display_thread_events(events, console, source)
 
     except APIError as e:
         console.print(f"[red]API error:[/] {e}")
         sys.exit(1)
+    except Exception as e:
+        console.print(f"[red]Error:[/] {e}")
+        sys.exit(1)
+    finally:
+        if thread_cache is not None:
+            thread_cache.close()
 
 
 @cli.command()
-def diagnose():
-    """Check API connectivity and configuration"""
+@click.option("--full", is_flag=True, help="Download every thread again, changed or not")
+@click.option("-c", "--concurrency", default=5, help="Threads downloaded at once")
+def sync(full: bool, concurrency: int):
+    """Copy memories and threads into the local mirror for --offline
+
+    Only memories and threads that changed since the last sync are
+    downloaded again. Downloaded threads are also added to the full-text
+    index used for offline thread search.
+
+    Examples:
+
+        deep-mem sync
+
+        deep-mem search "Python async" --offline
+    """
+    try:
+        config = Config.from_env()
+    except ConfigError as e:
+        console.print(f"[red]Configuration error:[/] {e}")
+        sys.exit(1)
+
+    from deep_mem.api import APIClient
+    from deep_mem.mirror import SYNC_THREAD_LIMIT, Mirror
+    from deep_mem.mirror import sync as sync_mirror
+
+    text_index = open_thread_search(config, offline=True)
+    try:
+        with APIClient.from_config(config) as client, Mirror(config.mirror_path) as mirror:
+            with console.status("Syncing...") as status:
+                stats = sync_mirror(
+                    client, mirror, full=full, concurrency=concurrency,
+                    progress=lambda message: status.update(f"Syncing {message}"),
+                    text_index=text_index,
+                )
+            counts = mirror.counts()
+    except APIError as e:
+        console.print(f"[red]API error:[/] {e}")
+        sys.exit(1)
+    except Exception as e:
+        console.print(f"[red]Error:[/] {e}")
+        sys.exit(1)
+    finally:
+        if text_index is not None:
+            text_index.close()
+
+    if stats.memories_listable:
+        console.print(
+            f"Memories: {stats.memories_seen} listed, {stats.memories_written} updated"
+        )
+    else:
+        console.print(
+            "[yellow]Memories: the server has no GET /memories; none mirrored, "
+            "so --offline searches will find no memories[/]"
+        )
+    console.print(
+        f"Threads: {stats.threads_seen} listed, {stats.threads_fetched} downloaded, "
+        f"{stats.threads_removed} removed, {stats.threads_failed} failed"
+    )
+    if stats.threads_truncated:
+        console.print(
+            f"[yellow]Threads: the server lists at most {SYNC_THREAD_LIMIT}; older threads "
+            "are not mirrored, and threads deleted on the server are kept[/]"
+        )
+    if text_index is None:
+        console.print("[yellow]Full-text index unavailable (SQLite lacks FTS5)[/]")
+    elif stats.threads_indexed:
+        console.print(f"Full-text index: {stats.threads_indexed} threads indexed")
+    console.print(
+        f"[dim]Mirror at {config.mirror_path}: {counts['memories']} memories, "
+        f"{counts['threads']} threads ({stats.seconds:.1f}s)[/]"
+    )
+    if stats.threads_failed:
+        sys.exit(1)
+
+
+@cli.group(invoke_without_command=True)
+@click.pass_context
+def diagnose(ctx: click.Context):
+    """Check API connectivity and configuration
+
+    Run `deep-mem diagnose bench` to measure latency as well.
+    """
+    if ctx.invoked_subcommand is not None:
+        return
     console.print("[bold]Checking configuration...[/]\n")
 
     try:
@@ -258,8 +760,10 @@ def diagnose():
 
     console.print("\n[bold]Checking API connectivity...[/]\n")
 
+    from deep_mem.api import APIClient
+
     try:
-        with APIClient(config.api_url, config.auth_token, config.timeout) as client:
+        with APIClient.from_config(config) as client:
             # Test memory search
             result = client.search_memories("test", limit=1)
             console.print(f"[green]OK[/] Memory search working")
@@ -278,5 +782,157 @@ def diagnose():
     console.print("\n[green]All checks passed![/]")
 
 
+@diagnose.command()
+@click.option("-n", "--iterations", default=20, help="Calls per operation")
+@click.option("-c", "--concurrency", default=1, help="Calls in flight at once")
+@click.option("-q", "--query", "queries", multiple=True,
+              help="Query to search for (repeatable; default: \"test\")")
+@click.option("--queries", "queries_file", type=click.File("r", encoding="utf-8"),
+              help="File with one query per line")
+@click.option("-o", "--operation", "operations", multiple=True,
+              type=click.Choice(["memories/deep", "memories/fast", "threads/search",
+                                 "threads/get", "search"]),
+              help="Operation to run (repeatable; default: all)")
+@click.option("-l", "--limit", default=10, help="Results per search")
+@click.option("--warmup", default=1, help="Uncounted calls per operation")
+@click.option("--json", "as_json", is_flag=True, help="Output as JSON")
+def bench(
+    iterations: int,
+    concurrency: int,
+    queries: tuple[str, ...],
+    queries_file,
+    operations: tuple[str, ...],
+    limit: int,
+    warmup: int,
+    as_json: bool,
+):
+    """Measure latency percentiles, throughput and response bytes
+
+    Runs memory search (deep and fast), thread search, get_thread and a
+    full deep search against the configured server. Exits 1 if any call
+    failed.
+
+    Examples:
+
+        deep-mem diagnose bench -n 50 -c 4
+
+        deep-mem diagnose bench -q "AI 工程师成长路线" -o search --json
+    """
+    try:
+        config = Config.from_env()
+    except ConfigError as e:
+        console.print(f"[red]Configuration error:[/] {e}")
+        sys.exit(1)
+
+    from deep_mem.api import APIClient
+    from deep_mem.bench import OPERATIONS, run_benchmark
+
+    query_list = list(queries)
+    if queries_file is not None:
+        query_list += [line.strip() for line in queries_file if line.strip()]
+    query_list = query_list or ["test"]
+
+    from contextlib import nullcontext
+
+    try:
+        with APIClient.from_config(config) as client:
+            # Keep --json output free of rich
+            with nullcontext() if as_json else console.status("Benchmarking...") as status:
+                results = run_benchmark(
+                    client,
+                    query_list,
+                    iterations=max(1, iterations),
+                    concurrency=max(1, concurrency),
+                    operations=operations or OPERATIONS,
+                    limit=limit,
+                    warmup=max(0, warmup),
+                    progress=status and (
+                        lambda message: status.update(f"Benchmarking {message}")
+                    ),
+                )
+    except Exception as e:
+        console.print(f"[red]Error:[/] {e}")
+        sys.exit(1)
+
+    summaries = {stats.name: stats.to_dict() for stats in results}
+    if as_json:
+        print(json.dumps({
+            "api_url": config.api_url,
+            "iterations": iterations,
+            "concurrency": concurrency,
+            "queries": query_list,
+            "operations": summaries,
+        }, ensure_ascii=False, indent=2))
+    else:
+        display_bench(summaries, iterations, concurrency)
+    if any(summary["errors"] for summary in summaries.values()):
+        sys.exit(1)
+
+
+def display_bench(summaries: dict[str, dict], iterations: int, concurrency: int) -> None:
+    """Print a benchmark table (milliseconds, operations/s, kilobytes)"""
+    from rich.table import Table
+
+    table = Table(
+        title=f"{iterations} calls per operation, concurrency {concurrency}",
+        title_justify="left",
+    )
+    table.add_column("operation", no_wrap=True)
+    for column in ("errors", "p50 ms", "p90 ms", "p99 ms", "max ms", "ops/s", "KB/call"):
+        table.add_column(column, justify="right")
+    for name, summary in summaries.items():
+        if "skipped" in summary:
+            table.add_row(name, f"[dim]skipped: {summary['skipped']}[/]")
+            continue
+        calls = summary["iterations"] or 1
+
+        def ms(key: str) -> str:
+            return f"{summary[key]:.1f}" if key in summary else "-"
+
+        errors = summary["errors"]
+        table.add_row(
+            name,
+            f"[red]{errors}[/]" if errors else "0",
+            ms("p50_ms"),
+            ms("p90_ms"),
+            ms("p99_ms"),
+            ms("max_ms"),
+            f"{summary.get('ops_per_s', 0):.1f}",
+            f"{summary['response_bytes'] / calls / 1024:.1f}",
+        )
+    console.print(table)
+    for name, summary in summaries.items():
+        if "first_error" in summary:
+            console.print(f"[red]{name}:[/] {summary['first_error']}")
+
+
+@cli.command()
+@click.option("--socket", "socket_path", type=click.Path(), help="Unix socket path")
+def serve(socket_path: str | None):
+    """Run a daemon that keeps a warm API client behind a Unix socket
+
+    While it runs, search and expand forward their API calls to it.
+
+    Example:
+
+        deep-mem serve &
+    """
+    try:
+        config = Config.from_env()
+    except ConfigError as e:
+        console.print(f"[red]Configuration error:[/] {e}")
+        sys.exit(1)
+
+    from deep_mem.daemon import serve as serve_daemon
+
+    path = socket_path or config.daemon_socket
+    console.print(f"[dim]deep-mem daemon listening on {path}[/]")
+    try:
+        serve_daemon(config, path)
+    except RuntimeError as e:
+        console.print(f"[red]Error:[/] {e}")
+        sys.exit(1)
+
+
 if __name__ == "__main__":
     cli()
@@ -4,10 +4,21 @@ import os
 from dataclasses import dataclass, field
 from pathlib import Path
 
-from dotenv import load_dotenv
-
 DEFAULT_API_URL = "http://localhost:14243"
 DEFAULT_TIMEOUT = 30.0
+DEFAULT_THREAD_CACHE_TTL = 24 * 60 * 60.0
+DEFAULT_SUMMARY_REFRESH_INTERVAL = 5 * 60.0
+DEFAULT_RESULT_CACHE_SIZE = 256
+DEFAULT_RESULT_CACHE_BYTES = 16 * 1024 * 1024
+DEFAULT_RESULT_CACHE_TTL = 30.0
+DEFAULT_MAX_RETRIES = 2
+DEFAULT_RETRY_BACKOFF = 0.25
+DEFAULT_BREAKER_THRESHOLD = 5
+DEFAULT_BREAKER_RESET = 30.0
+DEFAULT_MAX_CONNECTIONS = 100
+DEFAULT_MAX_KEEPALIVE = 20
+DEFAULT_KEEPALIVE_EXPIRY = 30.0
+DEFAULT_CACHE_DIR = Path(os.getenv("XDG_CACHE_HOME") or Path.home() / ".cache") / "deep-mem"
 
 # Skill installation directory (where .env file is located)
 SKILL_DIR = Path(__file__).parent.parent
@@ -23,13 +34,85 @@ class Config:
     """Configuration for deep-mem search
 
     Attributes:
-        api_url: Nowledge Mem API endpoint
+        api_url: Nowledge Mem API endpoint (http(s):// or unix:///path.sock)
         auth_token: Bearer token for authentication
         timeout: Request timeout in seconds
+        cache_dir: Directory for local cache files
+        thread_cache_ttl: Seconds a cached thread stays fresh (0 disables the cache)
+        result_cache_size: Max in-memory search results kept (0 disables the cache)
+        result_cache_bytes: Max total size of in-memory search results
+        result_cache_ttl: Seconds an in-memory search result stays fresh
+        daemon_socket: Unix socket of the `deep-mem serve` daemon
+        max_retries: Retries for transient failures (0 disables retrying)
+        retry_backoff: Base delay in seconds for exponential backoff
+        breaker_threshold: Consecutive failures that open the circuit (0 disables it)
+        breaker_reset: Seconds the circuit stays open before a probe request
+        hedge_percentile: Latency percentile (0-1) after which slow searches and
+            thread fetches are duplicated (0 disables hedging)
+        max_connections: Max concurrent connections to the server
+        max_keepalive_connections: Idle connections kept open for reuse
+        keepalive_expiry: Seconds an idle connection is kept open
+        http2: Negotiate HTTP/2 (requires the `http2` extra)
+        compression: Accept gzip/deflate compressed responses
+        connect_timeout: Connect timeout in seconds (defaults to timeout)
+        read_timeout: Read timeout in seconds (defaults to timeout)
+        write_timeout: Write timeout in seconds (defaults to timeout)
+        pool_timeout: Seconds to wait for a pooled connection (defaults to timeout)
+        trace_file: JSONL file receiving request, cache and phase events
+        metrics_file: File kept updated with Prometheus metrics (textfile collector)
+        local_thread_search: Answer Strategy 2 thread searches from the local
+            full-text index when a thread matches every query term (always
+            on with --offline, where any term may match)
+        record_file: Cassette file receiving every request/response pair
+        replay_file: Cassette file answering requests instead of the server
+        replay_scale: Factor applied to recorded response times when replaying
+            (1 keeps them, 0 replies at once)
     """
     api_url: str
     auth_token: str
     timeout: float = field(default=DEFAULT_TIMEOUT)
+    cache_dir: Path = field(default=DEFAULT_CACHE_DIR)
+    thread_cache_ttl: float = field(default=DEFAULT_THREAD_CACHE_TTL)
+    result_cache_size: int = 0
+    result_cache_bytes: int = field(default=DEFAULT_RESULT_CACHE_BYTES)
+    result_cache_ttl: float = field(default=DEFAULT_RESULT_CACHE_TTL)
+    daemon_socket: Path = field(default=DEFAULT_CACHE_DIR / "daemon.sock")
+    max_retries: int = field(default=DEFAULT_MAX_RETRIES)
+    retry_backoff: float = field(default=DEFAULT_RETRY_BACKOFF)
+    breaker_threshold: int = field(default=DEFAULT_BREAKER_THRESHOLD)
+    breaker_reset: float = field(default=DEFAULT_BREAKER_RESET)
+    hedge_percentile: float = 0.0
+    max_connections: int = field(default=DEFAULT_MAX_CONNECTIONS)
+    max_keepalive_connections: int = field(default=DEFAULT_MAX_KEEPALIVE)
+    keepalive_expiry: float = field(default=DEFAULT_KEEPALIVE_EXPIRY)
+    http2: bool = False
+    compression: bool = True
+    connect_timeout: float | None = None
+    read_timeout: float | None = None
+    write_timeout: float | None = None
+    pool_timeout: float | None = None
+    trace_file: Path | None = None
+    metrics_file: Path | None = None
+    local_thread_search: bool = False
+    record_file: Path | None = None
+    replay_file: Path | None = None
+    replay_scale: float = 1.0
+
+    @property
+    def thread_cache_path(self) -> Path:
+        return self.cache_dir / "threads.db"
+
+    @property
+    def mirror_path(self) -> Path:
+        return self.cache_dir / "mirror.db"
+
+    @property
+    def fulltext_path(self) -> Path:
+        return self.cache_dir / "fulltext.db"
+
+    @property
+    def breaker_state_path(self) -> Path:
+        return self.cache_dir / "breaker.json"
 
     def __post_init__(self):
         if not self.auth_token or self.auth_token.strip() == "":
@@ -47,6 +130,8 @@ class Config:
             2. Existing environment variables
             3. .env file in skill installation directory
         """
+        from dotenv import load_dotenv
+
         if dotenv_path:
             load_dotenv(dotenv_path=dotenv_path, override=False)
         else:
@@ -58,8 +143,54 @@ class Config:
                 # Fallback to default dotenv behavior
                 load_dotenv(override=False)
 
+        cache_dir = Path(os.getenv("MEM_CACHE_DIR") or DEFAULT_CACHE_DIR).expanduser()
         return cls(
             api_url=os.getenv("MEM_API_URL", DEFAULT_API_URL),
             auth_token=os.getenv("MEM_AUTH_TOKEN", "").strip(),
             timeout=float(os.getenv("MEM_TIMEOUT", DEFAULT_TIMEOUT)),
+            cache_dir=cache_dir,
+            thread_cache_ttl=float(os.getenv("MEM_THREAD_CACHE_TTL", DEFAULT_THREAD_CACHE_TTL)),
+            result_cache_size=int(os.getenv("MEM_RESULT_CACHE_SIZE", 0)),
+            result_cache_bytes=int(os.getenv("MEM_RESULT_CACHE_BYTES", DEFAULT_RESULT_CACHE_BYTES)),
+            result_cache_ttl=float(os.getenv("MEM_RESULT_CACHE_TTL", DEFAULT_RESULT_CACHE_TTL)),
+            daemon_socket=Path(
+                os.getenv("MEM_DAEMON_SOCKET") or cache_dir / "daemon.sock"
+            ).expanduser(),
+            max_retries=int(os.getenv("MEM_MAX_RETRIES", DEFAULT_MAX_RETRIES)),
+            retry_backoff=float(os.getenv("MEM_RETRY_BACKOFF", DEFAULT_RETRY_BACKOFF)),
+            breaker_threshold=int(os.getenv("MEM_BREAKER_THRESHOLD", DEFAULT_BREAKER_THRESHOLD)),
+            breaker_reset=float(os.getenv("MEM_BREAKER_RESET", DEFAULT_BREAKER_RESET)),
+            hedge_percentile=float(os.getenv("MEM_HEDGE_PERCENTILE", 0)),
+            max_connections=int(os.getenv("MEM_MAX_CONNECTIONS", DEFAULT_MAX_CONNECTIONS)),
+            max_keepalive_connections=int(os.getenv("MEM_MAX_KEEPALIVE", DEFAULT_MAX_KEEPALIVE)),
+            keepalive_expiry=float(os.getenv("MEM_KEEPALIVE_EXPIRY", DEFAULT_KEEPALIVE_EXPIRY)),
+            http2=_env_flag("MEM_HTTP2", False),
+            compression=_env_flag("MEM_COMPRESSION", True),
+            connect_timeout=_env_float("MEM_CONNECT_TIMEOUT"),
+            read_timeout=_env_float("MEM_READ_TIMEOUT"),
+            write_timeout=_env_float("MEM_WRITE_TIMEOUT"),
+            pool_timeout=_env_float("MEM_POOL_TIMEOUT"),
+            trace_file=_env_path("MEM_TRACE_FILE"),
+            metrics_file=_env_path("MEM_METRICS_FILE"),
+            local_thread_search=_env_flag("MEM_LOCAL_THREAD_SEARCH", False),
+            record_file=_env_path("MEM_RECORD_FILE"),
+            replay_file=_env_path("MEM_REPLAY_FILE"),
+            replay_scale=float(os.getenv("MEM_REPLAY_SCALE", 1.0)),
         )
+
+
+def _env_flag(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None or value.strip() == "":
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def _env_float(name: str) -> float | None:
+    value = os.getenv(name)
+    return float(value) if value else None
+
+
+def _env_path(name: str) -> Path | None:
+    value = os.getenv(name)
+    return Path(value).expanduser() if value else None
@@ -0,0 +1,319 @@
+"""Synthetic Nowledge Mem corpora for scale testing
+
+Generates memories and threads shaped like the real API's, at any size
+from a few thousand to tens of millions of memories:
+
+- text mixes Chinese and English words drawn from a Zipf distribution,
+  so a few words are very common and most are rare, as in real notes
+- thread lengths (message counts) are Zipfian: most threads are short,
+  a few run to hundreds of messages
+- labels follow a Zipf distribution over a fixed label vocabulary
+- memories link to threads through metadata.source_id, popular threads
+  collecting more memories; a share of memories has no source, which
+  sends searches down Strategy 2 (thread search by keywords)
+
+Memories and threads are produced by independent iterators, so neither
+needs to fit in memory. Output goes to JSONL files (write_jsonl) or into
+a deep_mem.testing.MockServer (load_into). The same spec and seed always
+yield the same corpus.
+
+    python -m deep_mem.corpus --memories 1000000 --out corpus/
+    python -m deep_mem.testing --corpus corpus/
+"""
+
+import json
+import random
+from dataclasses import dataclass
+from itertools import accumulate
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Iterator
+
+if TYPE_CHECKING:
+    from deep_mem.testing import MockServer
+
+MEMORIES_FILE = "memories.jsonl"
+THREADS_FILE = "threads.jsonl"
+QUERIES_FILE = "queries.txt"
+
+_CJK_WORDS = (
+    "异步", "数据库", "索引", "缓存", "延迟", "向量", "检索", "架构", "部署", "评审",
+    "工程师", "成长", "项目", "记忆", "线程", "性能", "模型", "训练", "推理", "提示词",
+    "上下文", "知识库", "搜索", "排序", "召回", "分词", "中文", "服务器", "客户端", "接口",
+    "并发", "协程", "队列", "日志", "监控", "告警", "容器", "集群", "网络", "存储",
+    "压缩", "序列化", "配置", "测试", "基准", "回归", "优化", "瓶颈", "内存", "磁盘",
+    "团队", "会议", "计划", "复盘", "需求", "设计", "文档", "代码", "重构", "发布",
+    "用户", "反馈", "数据", "分析", "指标", "实验", "论文", "笔记", "读书", "学习",
+    "路线", "面试", "职业", "管理", "沟通", "产品", "增长", "成本", "预算", "安全",
+)
+_EN_WORDS = (
+    "python", "async", "database", "index", "cache", "latency", "agent", "memory",
+    "thread", "search", "vector", "prompt", "deploy", "review", "design", "budget",
+    "model", "embedding", "retrieval", "ranking", "context", "token", "server", "client",
+    "request", "response", "timeout", "retry", "queue", "worker", "pool", "socket",
+    "sqlite", "postgres", "redis", "kafka", "docker", "kubernetes", "linux", "kernel",
+    "benchmark", "profile", "regression", "throughput", "percentile", "histogram",
+    "refactor", "release", "migration", "schema", "api", "endpoint", "json", "http",
+    "rust", "golang", "typescript", "react", "notebook", "paper", "meeting", "roadmap",
+)
+_LABELS = (
+    "python", "ml", "infra", "career", "notes", "project", "reading", "database",
+    "frontend", "ops", "research", "management", "writing", "security", "finance",
+    "health", "travel", "ideas", "bugs", "interview",
+)
+
+
+@dataclass(frozen=True, slots=True)
+class CorpusSpec:
+    """What to generate
+
+    Attributes:
+        memories: Number of memories
+        threads: Number of threads (default: one per 10 memories, at least 1)
+        cjk_ratio: Share of words drawn from the Chinese vocabulary
+        word_skew: Zipf exponent of word frequencies
+        content_words: Mean words per memory content
+        max_messages: Longest thread, in messages
+        message_skew: Zipf exponent of thread lengths (higher: shorter threads)
+        message_words: Mean words per message
+        label_skew: Zipf exponent of label popularity
+        max_labels: Most labels on one memory
+        orphan_rate: Share of memories without metadata.source_id
+        seed: Random seed
+    """
+    memories: int = 10_000
+    threads: int | None = None
+    cjk_ratio: float = 0.6
+    word_skew: float = 1.0
+    content_words: int = 60
+    max_messages: int = 400
+    message_skew: float = 1.3
+    message_words: int = 80
+    label_skew: float = 1.2
+    max_labels: int = 3
+    orphan_rate: float = 0.2
+    seed: int = 0
+
+    @property
+    def thread_count(self) -> int:
+        if self.threads is not None:
+            return self.threads
+        return max(1, self.memories // 10)
+
+
+# Multiplier permuting thread popularity ranks over thread IDs
+_SPREAD = 2_654_435_761
+
+
+def _zipf_weights(n: int, skew: float) -> list[float]:
+    """Cumulative Zipf weights for ranks 1..n (for random.choices)"""
+    return list(accumulate(1 / rank ** skew for rank in range(1, n + 1)))
+
+
+def thread_id(index: int) -> str:
+    return f"thread-{index:08d}"
+
+
+def memory_id(index: int) -> str:
+    return f"mem-{index:09d}"
+
+
+def _vocabulary(words: tuple[str, ...], joiner: str) -> list[str]:
+    """Base words by frequency rank, then a long tail of compounds"""
+    compounds = [f"{a}{joiner}{b}" for a in words for b in words if a != b]
+    random.Random(0).shuffle(compounds)
+    return [*words, *compounds]
+
+
+class _Text:
+    """Mixed Chinese/English text with Zipf-distributed words"""
+
+    def __init__(self, spec: CorpusSpec, rng: random.Random):
+        self.rng = rng
+        cjk = [(word, spec.cjk_ratio) for word in _vocabulary(_CJK_WORDS, "")]
+        en = [(word, 1 - spec.cjk_ratio) for word in _vocabulary(_EN_WORDS, "-")]
+        # Interleave the languages so both have common and rare words
+        vocabulary = [pair for pairs in zip(cjk, en) for pair in pairs]
+        vocabulary += cjk[len(en):] + en[len(cjk):]
+        self.words = [word for word, _ in vocabulary]
+        self.cum_weights = list(accumulate(
+            share / rank ** spec.word_skew
+            for rank, (_, share) in enumerate(vocabulary, 1)
+        ))
+
+    def words_around(self, mean: int) -> list[str]:
+        count = max(1, int(self.rng.expovariate(1 / mean))) if mean > 0 else 1
+        return self.rng.choices(self.words, cum_weights=self.cum_weights, k=count)
+
+    def sentence(self, mean: int) -> str:
+        words = self.words_around(mean)
+        # Chinese runs are written without spaces, as in real text
+        parts: list[str] = []
+        for word in words:
+            if parts and not word.isascii() and not parts[-1][-1].isascii():
+                parts[-1] += word
+            else:
+                parts.append(word)
+        return " ".join(parts)
+
+
+def _timestamp(rng: random.Random) -> str:
+    return (
+        f"20{rng.randint(22, 25)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+        f"T{rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}:00Z"
+    )
+
+
+def generate_threads(spec: CorpusSpec) -> Iterator[dict[str, Any]]:
+    """get_thread payloads ({"thread": {...}, "messages": [...]}) in ID order"""
+    rng = random.Random(f"{spec.seed}:threads")
+    text = _Text(spec, rng)
+    lengths = range(1, spec.max_messages + 1)
+    length_weights = _zipf_weights(spec.max_messages, spec.message_skew)
+    for index in range(spec.thread_count):
+        count = rng.choices(lengths, cum_weights=length_weights)[0]
+        created = _timestamp(rng)
+        messages = [
+            {
+                "role": "user" if i % 2 == 0 else "assistant",
+                "content": text.sentence(spec.message_words),
+            }
+            for i in range(count)
+        ]
+        yield {
+            "thread": {
+                "thread_id": thread_id(index),
+                "title": text.sentence(6),
+                "summary": text.sentence(25),
+                "message_count": count,
+                "created_at": created,
+                "last_activity": max(created, _timestamp(rng)),
+            },
+            "messages": messages,
+        }
+
+
+def generate_memories(spec: CorpusSpec) -> Iterator[dict[str, Any]]:
+    """Memory objects in ID order, linked to generate_threads' IDs"""
+    rng = random.Random(f"{spec.seed}:memories")
+    text = _Text(spec, rng)
+    label_weights = _zipf_weights(len(_LABELS), spec.label_skew)
+    threads = spec.thread_count
+    ranks = range(threads)
+    thread_weights = _zipf_weights(threads, 0.8)
+    for index in range(spec.memories):
+        labels = sorted(set(rng.choices(
+            _LABELS, cum_weights=label_weights, k=rng.randint(0, spec.max_labels),
+        )))
+        source = None
+        if rng.random() >= spec.orphan_rate:
+            # Popular threads collect more memories. Ranks are permuted
+            # (_SPREAD is prime) so they aren't simply the oldest threads.
+            rank = rng.choices(ranks, cum_weights=thread_weights)[0]
+            source = thread_id(rank * _SPREAD % threads)
+        created = _timestamp(rng)
+        yield {
+            "id": memory_id(index),
+            "title": text.sentence(5),
+            "content": text.sentence(spec.content_words),
+            "importance": round(rng.betavariate(2, 3), 2),
+            "labels": labels,
+            "created_at": created,
+            "updated_at": created,
+            "metadata": {"source_id": source, "labels": labels},
+        }
+
+
+def generate_queries(spec: CorpusSpec, count: int = 100) -> Iterator[str]:
+    """Search queries of one to three words drawn like the corpus text"""
+    rng = random.Random(f"{spec.seed}:queries")
+    text = _Text(spec, rng)
+    for _ in range(count):
+        words = text.rng.choices(text.words, cum_weights=text.cum_weights, k=rng.randint(1, 3))
+        yield " ".join(dict.fromkeys(words))
+
+
+def write_jsonl(spec: CorpusSpec, directory: Path | str, queries: int = 100) -> dict[str, Path]:
+    """Write memories.jsonl, threads.jsonl and queries.txt into directory"""
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    paths = {
+        "memories": directory / MEMORIES_FILE,
+        "threads": directory / THREADS_FILE,
+        "queries": directory / QUERIES_FILE,
+    }
+    for name, records in (
+        ("memories", generate_memories(spec)),
+        ("threads", generate_threads(spec)),
+    ):
+        with open(paths[name], "w", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+    with open(paths["queries"], "w", encoding="utf-8") as f:
+        for query in generate_queries(spec, queries):
+            f.write(query + "\n")
+    return paths
+
+
+def read_jsonl(path: Path | str) -> Iterator[dict[str, Any]]:
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def load_into(server: "MockServer", source: CorpusSpec | Path | str) -> None:
+    """Add a generated corpus, or one written by write_jsonl, to a MockServer
+
+    The mock keeps everything in memory: budget roughly 1 KB per memory
+    plus the size of all messages.
+    """
+    if isinstance(source, CorpusSpec):
+        server.add_threads(generate_threads(source))
+        server.add_memories(generate_memories(source))
+    else:
+        directory = Path(source)
+        server.add_threads(read_jsonl(directory / THREADS_FILE))
+        server.add_memories(read_jsonl(directory / MEMORIES_FILE))
+
+
+def main(argv: list[str] | None = None) -> None:
+    import argparse
+    import time
+
+    defaults = CorpusSpec()
+    parser = argparse.ArgumentParser(
+        prog="python -m deep_mem.corpus",
+        description="Write a synthetic memory/thread corpus as JSONL",
+    )
+    parser.add_argument("--out", required=True, help="Output directory")
+    parser.add_argument("--memories", type=int, default=defaults.memories)
+    parser.add_argument("--threads", type=int, help="Default: memories / 10")
+    parser.add_argument("--cjk-ratio", type=float, default=defaults.cjk_ratio)
+    parser.add_argument("--content-words", type=int, default=defaults.content_words)
+    parser.add_argument("--max-messages", type=int, default=defaults.max_messages)
+    parser.add_argument("--message-words", type=int, default=defaults.message_words)
+    parser.add_argument("--orphan-rate", type=float, default=defaults.orphan_rate)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    spec = CorpusSpec(
+        memories=args.memories,
+        threads=args.threads,
+        cjk_ratio=args.cjk_ratio,
+        content_words=args.content_words,
+        max_messages=args.max_messages,
+        message_words=args.message_words,
+        orphan_rate=args.orphan_rate,
+        seed=args.seed,
+    )
+    started = time.perf_counter()
+    paths = write_jsonl(spec, args.out, args.queries)
+    for name, path in paths.items():
+        print(f"{name:<9} {path} ({path.stat().st_size / 1e6:.1f} MB)")
+    print(f"{spec.memories} memories, {spec.thread_count} threads "
+          f"in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,262 @@
+"""Long-lived deep-mem daemon serving API calls over a Unix domain socket
+
+The daemon keeps a warm APIClient (connection pool and result cache) so
+short-lived CLI invocations can skip connection setup. The wire protocol is
+one JSON request line and one JSON response line per connection:
+
+    -> {"method": "search_memories", "kwargs": {"query": "...", "limit": 10}}
+    <- {"ok": true, "result": {...}}
+    <- {"ok": false, "error": "...", "status_code": 503, "error_type": "CircuitOpenError"}
+
+error_type names the APIError subclass raised in the daemon, so clients
+raise the same one (e.g. CircuitOpenError, which callers fail fast on).
+"""
+
+import dataclasses
+import json
+import os
+import socket
+import socketserver
+import time
+from pathlib import Path
+from typing import Any, Iterator
+
+from deep_mem import timings
+from deep_mem.api import APIClient, APIError, CircuitOpenError
+from deep_mem.config import DEFAULT_RESULT_CACHE_SIZE, Config
+from deep_mem.hooks import NO_HOOKS, Hooks
+
+# Client methods the daemon will forward; anything else is rejected
+FORWARDED_METHODS = frozenset({
+    "search_memories",
+    "get_memory",
+    "search_threads",
+    "get_thread",
+    "get_thread_summaries",
+})
+
+
+# APIError subclasses re-raised as themselves on the client side
+_ERROR_TYPES = {cls.__name__: cls for cls in (APIError, CircuitOpenError)}
+
+# Seconds the client allows the daemon beyond its worst-case request time
+_DAEMON_TIMEOUT_MARGIN = 5.0
+
+
+class DaemonUnavailable(ConnectionError):
+    """Raised when no daemon is listening on the socket"""
+    pass
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    server: "DaemonServer"
+
+    def handle(self) -> None:
+        line = self.rfile.readline()
+        if not line:
+            return
+        try:
+            request = json.loads(line)
+            reply = {"ok": True, "result": self.server.dispatch(
+                request.get("method", ""), request.get("kwargs") or {},
+            )}
+        except APIError as e:
+            reply = {
+                "ok": False, "error": str(e), "status_code": e.status_code,
+                "error_type": type(e).__name__,
+            }
+        except Exception as e:
+            reply = {"ok": False, "error": f"{type(e).__name__}: {e}", "status_code": None}
+        self.wfile.write(json.dumps(reply, ensure_ascii=False).encode() + b"\n")
+
+
+class DaemonServer(socketserver.ThreadingUnixStreamServer):
+    """Threaded Unix socket server forwarding calls to one shared APIClient"""
+
+    daemon_threads = True
+
+    def __init__(self, socket_path: Path | str, client: APIClient):
+        self.socket_path = Path(socket_path)
+        self.client = client
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        _remove_stale_socket(self.socket_path)
+        super().__init__(str(self.socket_path), _RequestHandler)
+
+    def server_bind(self) -> None:
+        # The daemon acts with the owner's auth token, so the socket must be
+        # private from the moment it exists; chmod after bind() would leave a
+        # window in which other local users could connect
+        old_umask = os.umask(0o177)
+        try:
+            super().server_bind()
+        finally:
+            os.umask(old_umask)
+
+    def dispatch(self, method: str, kwargs: dict[str, Any]) -> Any:
+        if method == "ping":
+            return "pong"
+        if method not in FORWARDED_METHODS:
+            raise ValueError(f"Unsupported method: {method!r}")
+        return getattr(self.client, method)(**kwargs)
+
+    def server_close(self) -> None:
+        super().server_close()
+        self.socket_path.unlink(missing_ok=True)
+
+
+def _remove_stale_socket(path: Path) -> None:
+    """Remove a socket file left by a daemon that is no longer running"""
+    if not path.exists():
+        return
+    if DaemonClient(path).ping():
+        raise RuntimeError(f"A deep-mem daemon is already listening on {path}")
+    path.unlink()
+
+
+def serve(config: Config, socket_path: Path | str | None = None) -> None:
+    """Run the daemon until interrupted"""
+    if config.result_cache_size <= 0:
+        # Caching is the point of a long-lived process
+        config = dataclasses.replace(config, result_cache_size=DEFAULT_RESULT_CACHE_SIZE)
+    with APIClient.from_config(config) as client:
+        server = DaemonServer(socket_path or config.daemon_socket, client)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+
+
+class DaemonClient:
+    """Drop-in replacement for APIClient that forwards calls to the daemon
+
+    Each call uses its own connection, so one instance may be shared
+    between threads. As with APIClient, hooks passed in are left open on
+    close(); those connect() sets up are closed.
+    """
+
+    def __init__(
+        self,
+        socket_path: Path | str,
+        timeout: float = 30.0,
+        hooks: Hooks | None = None,
+    ):
+        self.socket_path = Path(socket_path)
+        self.timeout = timeout
+        self.hooks = hooks or NO_HOOKS
+        self._owns_hooks = False
+
+    def close(self) -> None:
+        if self._owns_hooks:
+            self.hooks.close()
+
+    def __enter__(self) -> "DaemonClient":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> bool:
+        self.close()
+        return False
+
+    def _call(self, method: str, **kwargs: Any) -> Any:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            try:
+                sock.connect(str(self.socket_path))
+            except OSError as e:
+                raise DaemonUnavailable(f"No daemon at {self.socket_path}: {e}") from e
+            request = {"method": method, "kwargs": kwargs}
+            self.hooks.request_start(method)
+            started = time.perf_counter()
+            # Round trip through the daemon, including its own request
+            with timings.stage("daemon"):
+                try:
+                    sock.sendall(json.dumps(request, ensure_ascii=False).encode() + b"\n")
+                    with sock.makefile("rb") as reader:
+                        line = reader.readline()
+                except OSError as e:
+                    self.hooks.request_end(
+                        method, time.perf_counter() - started, None, None, type(e).__name__,
+                    )
+                    raise
+            seconds = time.perf_counter() - started
+        finally:
+            sock.close()
+
+        if not line:
+            self.hooks.request_end(method, seconds, None, 0, "DaemonUnavailable")
+            raise DaemonUnavailable("Daemon closed the connection without replying")
+        with timings.stage("decode"):
+            reply = json.loads(line)
+        status = 200 if reply.get("ok") else reply.get("status_code")
+        self.hooks.request_end(method, seconds, status, len(line), reply.get("error"))
+        if not reply.get("ok"):
+            error_type = _ERROR_TYPES.get(reply.get("error_type"), APIError)
+            raise error_type(reply.get("error", "Daemon request failed"), reply.get("status_code"))
+        return reply["result"]
+
+    def ping(self) -> bool:
+        """Return True if a daemon answers on the socket"""
+        try:
+            return self._call("ping") == "pong"
+        except (DaemonUnavailable, OSError, ValueError):
+            return False
+
+    def search_memories(
+        self,
+        query: str,
+        limit: int = 10,
+        mode: str = "deep",
+        filter_labels: str | None = None,
+    ) -> dict[str, Any]:
+        return self._call(
+            "search_memories",
+            query=query, limit=limit, mode=mode, filter_labels=filter_labels,
+        )
+
+    def get_memory(self, memory_id: str) -> dict[str, Any]:
+        return self._call("get_memory", memory_id=memory_id)
+
+    def search_threads(
+        self,
+        query: str,
+        limit: int = 20,
+        mode: str = "full",
+    ) -> dict[str, Any]:
+        return self._call("search_threads", query=query, limit=limit, mode=mode)
+
+    def get_thread(self, thread_id: str) -> dict[str, Any]:
+        return self._call("get_thread", thread_id=thread_id)
+
+    def stream_thread(self, thread_id: str) -> Iterator[tuple[str, Any]]:
+        # The daemon replies with whole payloads; replay them as events
+        from deep_mem.stream import iter_payload_events
+
+        yield from iter_payload_events(self.get_thread(thread_id))
+
+    def get_thread_summaries(self, limit: int = 50) -> dict[str, Any]:
+        return self._call("get_thread_summaries", limit=limit)
+
+
+def connect(config: Config, use_daemon: bool = True) -> APIClient | DaemonClient:
+    """Return a DaemonClient if a daemon is running, otherwise an APIClient
+
+    Recording and replaying never go through the daemon: it talks to the
+    real server and records (or not) according to its own environment.
+    """
+    bypass = config.record_file is not None or config.replay_file is not None
+    if use_daemon and not bypass and config.daemon_socket.exists():
+        from deep_mem.hooks import hooks_from_config
+        from deep_mem.resilience import RetryPolicy
+
+        # The daemon retries on its own; give up only after it would have
+        retry_policy = RetryPolicy(max_retries=config.max_retries, backoff_base=config.retry_backoff)
+        timeout = retry_policy.max_duration(config.timeout) + _DAEMON_TIMEOUT_MARGIN
+        client = DaemonClient(config.daemon_socket, timeout=timeout)
+        if client.ping():
+            # The daemon's own client keeps the metrics file up to date
+            client.hooks = hooks_from_config(config, metrics=False)
+            client._owns_hooks = True
+            return client
+    return APIClient.from_config(config)
@@ -0,0 +1,77 @@
+"""Typed decoding of memory search responses
+
+With msgspec installed (the `fast` extra), response bytes are decoded in
+one pass into typed structs and then MemoryResult objects, without
+building a dict per record. Without it, callers fall back to json.loads
+and the dict-based parsing in deep_mem.search.
+"""
+
+from typing import Any
+
+import msgspec
+
+from deep_mem.search import MemoryResult
+
+
+class _Metadata(msgspec.Struct, gc=False):
+    source_id: str | None = None
+    labels: list[str] | None = None
+
+
+class _Memory(msgspec.Struct, gc=False):
+    id: str | None = None
+    memory_id: str | None = None
+    title: str | None = None
+    content: str | None = ""
+    importance: float | None = 0.5
+    labels: list[str] | None = None
+    metadata: _Metadata | None = None
+    created_at: str | None = None
+
+
+class _Item(_Memory, gc=False):
+    # Items are either {"memory": {...}, "similarity_score": ...} or a flat
+    # memory carrying its own score
+    memory: _Memory | None = None
+    similarity_score: float | None = 0.0
+    relevance_reason: str | None = None
+
+
+class _Response(msgspec.Struct, gc=False):
+    results: list[_Item] = []
+    total_found: int | None = None
+
+
+_decoder = msgspec.json.Decoder(list[_Item] | _Response)
+
+
+def decode_memory_search(body: bytes) -> tuple[list[MemoryResult], int]:
+    """Decode a memory search response into results and the total found
+
+    Raises:
+        msgspec.DecodeError: If the body is not valid JSON or does not match
+            the expected shape (msgspec.ValidationError is a subclass)
+    """
+    response: Any = _decoder.decode(body)
+    items = response if isinstance(response, list) else response.results
+    memories = []
+    for item in items:
+        memory = item.memory if item.memory is not None else item
+        metadata = memory.metadata
+        labels = memory.labels
+        if not labels and metadata is not None:
+            labels = metadata.labels
+        memories.append(MemoryResult(
+            memory_id=memory.id or memory.memory_id or "",
+            title=memory.title,
+            content=memory.content,
+            importance=memory.importance,
+            similarity_score=item.similarity_score,
+            relevance_reason=item.relevance_reason,
+            source_thread_id=metadata.source_id if metadata is not None else None,
+            labels=labels or [],
+            created_at=memory.created_at,
+        ))
+    if isinstance(response, list) or response.total_found is None:
+        return memories, len(memories)
+    return memories, response.total_found
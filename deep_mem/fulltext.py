@@ -0,0 +1,224 @@
+"""Local full-text index over thread messages
+
+Strategy 2 normally sends every keyword lookup to /threads/search. The
+ThreadTextIndex keeps title, summary and message text of mirrored (and,
+optionally, cached) threads in an SQLite FTS5 table, so the lookup is a
+local query instead of a round trip.
+
+FTS5's unicode61 tokenizer treats a run of CJK characters as one token,
+which makes Chinese text unsearchable by anything but its exact run.
+Text is therefore pre-tokenized here: CJK runs become overlapping
+character bigrams ("向量数据库" -> "向量 量数 数据 据库") and everything else
+stays a word, before FTS5 sees it. Queries are split the same way, so a
+query matches whenever all of its bigrams and words occur in a thread.
+"""
+
+import json
+import re
+import time
+from pathlib import Path
+from typing import Any, Iterable
+
+from deep_mem.cache import _SQLiteStore
+
+# Hiragana/katakana, CJK ideographs (incl. extension A and compatibility)
+# and Hangul syllables
+_CJK = "\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af\uf900-\ufaff"
+_TOKEN_RE = re.compile(f"([{_CJK}]+)|([^\\W{_CJK}]+)")
+
+# bm25 column weights: title, summary, messages
+_WEIGHTS = (10.0, 5.0, 1.0)
+
+
+def tokenize(text: str) -> list[str]:
+    """Split text into lowercase words and CJK character bigrams
+
+    A CJK run of a single character is kept as a unigram.
+    """
+    tokens = []
+    for cjk, word in _TOKEN_RE.findall(text):
+        if word:
+            tokens.append(word.lower())
+        elif len(cjk) == 1:
+            tokens.append(cjk)
+        else:
+            tokens.extend(cjk[i:i + 2] for i in range(len(cjk) - 1))
+    return tokens
+
+
+def _match_expression(query: str, operator: str) -> str | None:
+    """An FTS5 MATCH expression for query, or None if it has no tokens"""
+    terms = []
+    for token in dict.fromkeys(tokenize(query)):
+        term = '"' + token.replace('"', '""') + '"'
+        if len(token) == 1 and _TOKEN_RE.fullmatch(token).group(1):
+            term += "*"  # A lone CJK character also matches bigrams it starts
+        terms.append(term)
+    return f" {operator} ".join(terms) if terms else None
+
+
+def _version(thread: dict[str, Any], payload: dict[str, Any]) -> str:
+    """Change marker for an indexed thread: message count plus last activity"""
+    activity = thread.get("updated_at") or thread.get("last_activity") or ""
+    return f"{len(payload.get('messages') or [])}|{activity}"
+
+
+def _message_text(payload: dict[str, Any]) -> str:
+    return "\n".join(
+        str(message.get("content") or "")
+        for message in payload.get("messages") or []
+        if isinstance(message, dict)
+    )
+
+
+class ThreadTextIndex(_SQLiteStore):
+    """FTS5 index of thread titles, summaries and messages
+
+    Filled by `deep-mem sync` and, with MEM_LOCAL_THREAD_SEARCH, by the
+    threads fetched during Phase 2. Entries never expire; re-indexing a
+    thread replaces its previous text.
+
+    Raises:
+        sqlite3.OperationalError: If SQLite was built without FTS5
+    """
+
+    _schema = (
+        """
+        CREATE TABLE IF NOT EXISTS thread_docs (
+            doc_id INTEGER PRIMARY KEY,
+            thread_id TEXT UNIQUE NOT NULL,
+            meta TEXT NOT NULL,
+            version TEXT NOT NULL,
+            indexed_at REAL NOT NULL
+        )
+        """,
+        """
+        CREATE VIRTUAL TABLE IF NOT EXISTS thread_text USING fts5(
+            title, summary, messages,
+            tokenize = 'unicode61 remove_diacritics 2'
+        )
+        """,
+    )
+
+    def __init__(self, path: Path | str):
+        super().__init__(path, ttl=float("inf"))
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM thread_docs").fetchone()[0]
+
+    def add(self, payload: dict[str, Any], meta: dict[str, Any] | None = None) -> None:
+        """Index a get_thread payload, replacing an earlier version of it
+
+        meta (e.g. a thread summary) supplies fields the payload lacks. A
+        thread whose message count and last activity are unchanged is
+        skipped, so re-adding cached threads is cheap.
+        """
+        self.add_many([(payload, meta)])
+
+    def add_many(self, threads: Iterable[tuple[dict[str, Any], dict[str, Any] | None]]) -> int:
+        """Index (payload, meta) pairs in one transaction
+
+        Returns:
+            How many threads were new or changed, and so (re)indexed
+        """
+        candidates = []
+        for payload, meta in threads:
+            # get_thread returns {"thread": {...}, "messages": [...]}
+            thread = {**(meta or {}), **payload.get("thread", {})}
+            thread_id = thread.get("thread_id") or thread.get("id")
+            if thread_id:
+                thread["thread_id"] = thread_id
+                candidates.append((thread_id, thread, payload, _version(thread, payload)))
+        if not candidates:
+            return 0
+
+        known = self._versions([thread_id for thread_id, *_ in candidates])
+        rows = []
+        for thread_id, thread, payload, version in candidates:
+            if known.get(thread_id) == version:
+                continue
+            known[thread_id] = version  # Index only the first of duplicates
+            rows.append((
+                thread_id,
+                json.dumps(thread, ensure_ascii=False),
+                version,
+                " ".join(tokenize(thread.get("title") or "")),
+                " ".join(tokenize(thread.get("summary") or "")),
+                " ".join(tokenize(_message_text(payload))),
+            ))
+        if not rows:
+            return 0
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                for thread_id, meta_json, version, title, summary, messages in rows:
+                    self._delete(thread_id)
+                    doc_id = self._conn.execute(
+                        "INSERT INTO thread_docs (thread_id, meta, version, indexed_at) "
+                        "VALUES (?, ?, ?, ?)",
+                        (thread_id, meta_json, version, now),
+                    ).lastrowid
+                    self._conn.execute(
+                        "INSERT INTO thread_text (rowid, title, summary, messages) "
+                        "VALUES (?, ?, ?, ?)",
+                        (doc_id, title, summary, messages),
+                    )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return len(rows)
+
+    def _versions(self, thread_ids: list[str]) -> dict[str, str]:
+        placeholders = ",".join("?" * len(thread_ids))
+        with self._lock:
+            return dict(self._conn.execute(
+                f"SELECT thread_id, version FROM thread_docs WHERE thread_id IN ({placeholders})",
+                thread_ids,
+            ))
+
+    def remove(self, thread_id: str) -> None:
+        """Drop a thread (e.g. deleted on the server)"""
+        with self._lock:
+            self._delete(thread_id)
+
+    def _delete(self, thread_id: str) -> None:
+        row = self._conn.execute(
+            "SELECT doc_id FROM thread_docs WHERE thread_id = ?", (thread_id,)
+        ).fetchone()
+        if row is not None:
+            self._conn.execute("DELETE FROM thread_text WHERE rowid = ?", row)
+            self._conn.execute("DELETE FROM thread_docs WHERE doc_id = ?", row)
+
+    def search(self, query: str, limit: int, fallback: bool = True) -> dict[str, Any]:
+        """Threads matching query, best first, in the server's response format
+
+        Threads containing every query term are preferred; when there are
+        none and fallback is set, threads containing any term are returned
+        instead.
+        """
+        for operator in ("AND", "OR") if fallback else ("AND",):
+            expression = _match_expression(query, operator)
+            if expression is None:
+                break
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT d.meta FROM thread_text "
+                    "JOIN thread_docs AS d ON d.doc_id = thread_text.rowid "
+                    "WHERE thread_text MATCH ? "
+                    "ORDER BY bm25(thread_text, ?, ?, ?) LIMIT ?",
+                    (expression, *_WEIGHTS, limit),
+                ).fetchall()
+                total = self._conn.execute(
+                    "SELECT COUNT(*) FROM thread_text WHERE thread_text MATCH ?",
+                    (expression,),
+                ).fetchone()[0] if rows else 0
+            if rows:
+                return {
+                    "threads": [json.loads(meta) for (meta,) in rows],
+                    "total_found": total,
+                }
+        return {"threads": [], "total_found": 0}
+
@@ -0,0 +1,315 @@
+"""Tracing and metrics hooks for the request lifecycle
+
+APIClient, DaemonClient and the searchers call a Hooks object at request
+start and end, on result/thread cache hits and misses, before each retry
+and at the end of every search phase. The base class does nothing; subclass
+it and override the events of interest, or use one of the exporters here:
+
+- JSONLSpanWriter appends one JSON object per event to a file
+- PrometheusExporter keeps counters and histograms and renders them in the
+  Prometheus text exposition format, optionally to a textfile-collector file
+
+Hooks run inline on the request path (possibly from several threads at
+once), so they must be cheap and thread-safe, and must not raise.
+"""
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import IO, TYPE_CHECKING, Any, Iterable
+
+if TYPE_CHECKING:
+    from deep_mem.config import Config
+
+
+class Hooks:
+    """No-op hooks; the default for every client and searcher"""
+
+    def request_start(self, endpoint: str) -> None:
+        """A request attempt to endpoint (e.g. "Memory search") is starting"""
+
+    def request_end(
+        self,
+        endpoint: str,
+        seconds: float,
+        status: int | None,
+        response_bytes: int | None,
+        error: str | None = None,
+    ) -> None:
+        """A request attempt finished
+
+        status is None on transport errors (error names the exception);
+        response_bytes is None for streamed responses.
+        """
+
+    def cache_hit(self, cache: str) -> None:
+        """A lookup in cache ("result", "thread", "index" or "fulltext") was served locally"""
+
+    def cache_miss(self, cache: str) -> None:
+        """A lookup in cache had to go to the server"""
+
+    def retry(self, endpoint: str, attempt: int, delay: float, reason: str) -> None:
+        """Attempt number `attempt` will be retried after delay seconds"""
+
+    def span(self, name: str, seconds: float, attrs: dict[str, Any] | None = None) -> None:
+        """A search phase ("phase1", "phase2", "phase2/thread", "strategy2") ended"""
+
+    def close(self) -> None:
+        """Flush any buffered output"""
+
+
+NO_HOOKS = Hooks()
+
+
+class MultiHooks(Hooks):
+    """Fan events out to several hooks"""
+
+    def __init__(self, hooks: Iterable[Hooks]):
+        self.hooks = list(hooks)
+
+    def request_start(self, endpoint: str) -> None:
+        for hooks in self.hooks:
+            hooks.request_start(endpoint)
+
+    def request_end(self, endpoint, seconds, status, response_bytes, error=None) -> None:
+        for hooks in self.hooks:
+            hooks.request_end(endpoint, seconds, status, response_bytes, error)
+
+    def cache_hit(self, cache: str) -> None:
+        for hooks in self.hooks:
+            hooks.cache_hit(cache)
+
+    def cache_miss(self, cache: str) -> None:
+        for hooks in self.hooks:
+            hooks.cache_miss(cache)
+
+    def retry(self, endpoint, attempt, delay, reason) -> None:
+        for hooks in self.hooks:
+            hooks.retry(endpoint, attempt, delay, reason)
+
+    def span(self, name, seconds, attrs=None) -> None:
+        for hooks in self.hooks:
+            hooks.span(name, seconds, attrs)
+
+    def close(self) -> None:
+        for hooks in self.hooks:
+            hooks.close()
+
+
+class JSONLSpanWriter(Hooks):
+    """Append each event as one JSON line
+
+    Every line carries "ts" (Unix time), "pid" and "event", plus the event's
+    fields; durations are reported as "ms". The file is opened in append
+    mode, so several processes can share it.
+    """
+
+    def __init__(self, path: Path | str | IO[str]):
+        if isinstance(path, (str, Path)):
+            path = Path(path).expanduser()
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(path, "a", encoding="utf-8", buffering=1)
+            self._owns_file = True
+        else:
+            self._file = path
+            self._owns_file = False
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+
+    def _write(self, event: str, **fields: Any) -> None:
+        line = json.dumps(
+            {"ts": round(time.time(), 6), "pid": self._pid, "event": event, **fields},
+            ensure_ascii=False,
+        )
+        with self._lock:
+            try:
+                self._file.write(line + "\n")
+            except (OSError, ValueError):
+                pass  # Tracing must never fail a request
+
+    def request_start(self, endpoint: str) -> None:
+        self._write("request_start", endpoint=endpoint)
+
+    def request_end(self, endpoint, seconds, status, response_bytes, error=None) -> None:
+        self._write(
+            "request_end",
+            endpoint=endpoint,
+            ms=round(seconds * 1000, 3),
+            status=status,
+            bytes=response_bytes,
+            error=error,
+        )
+
+    def cache_hit(self, cache: str) -> None:
+        self._write("cache_hit", cache=cache)
+
+    def cache_miss(self, cache: str) -> None:
+        self._write("cache_miss", cache=cache)
+
+    def retry(self, endpoint, attempt, delay, reason) -> None:
+        self._write("retry", endpoint=endpoint, attempt=attempt, delay=delay, reason=reason)
+
+    def span(self, name, seconds, attrs=None) -> None:
+        self._write("span", name=name, ms=round(seconds * 1000, 3), **(attrs or {}))
+
+    def close(self) -> None:
+        with self._lock:
+            if self._owns_file and not self._file.closed:
+                self._file.close()
+
+
+# Histogram buckets in seconds, from a warm local cache hit to a slow
+# deep search over the network
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class _Histogram:
+    __slots__ = ("counts", "sum", "count")
+
+    def __init__(self, buckets: int):
+        self.counts = [0] * buckets
+        self.sum = 0.0
+        self.count = 0
+
+
+class PrometheusExporter(Hooks):
+    """Counters and latency histograms in Prometheus text format
+
+    render() returns the exposition text. With a path, the text is also
+    written there (atomically, for node_exporter's textfile collector) at
+    most every write_interval seconds and on close().
+    """
+
+    def __init__(
+        self,
+        path: Path | str | None = None,
+        write_interval: float = 15.0,
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        self.path = Path(path).expanduser() if path is not None else None
+        self.write_interval = write_interval
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._counters: dict[tuple[str, tuple[tuple[str, str], ...]], float] = {}
+        self._histograms: dict[tuple[str, tuple[tuple[str, str], ...]], _Histogram] = {}
+        self._last_write = float("-inf")  # Write on the first request
+
+    def _inc(self, name: str, labels: dict[str, str], value: float = 1) -> None:
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def _observe(self, name: str, labels: dict[str, str], seconds: float) -> None:
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = _Histogram(len(self.buckets))
+            for i, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    histogram.counts[i] += 1
+            histogram.sum += seconds
+            histogram.count += 1
+
+    def request_end(self, endpoint, seconds, status, response_bytes, error=None) -> None:
+        outcome = str(status) if status is not None else "error"
+        self._inc("deep_mem_requests_total", {"endpoint": endpoint, "status": outcome})
+        self._observe("deep_mem_request_duration_seconds", {"endpoint": endpoint}, seconds)
+        if response_bytes:
+            self._inc("deep_mem_response_bytes_total", {"endpoint": endpoint}, response_bytes)
+        self._maybe_write()
+
+    def cache_hit(self, cache: str) -> None:
+        self._inc("deep_mem_cache_hits_total", {"cache": cache})
+
+    def cache_miss(self, cache: str) -> None:
+        self._inc("deep_mem_cache_misses_total", {"cache": cache})
+
+    def retry(self, endpoint, attempt, delay, reason) -> None:
+        self._inc("deep_mem_retries_total", {"endpoint": endpoint, "reason": reason})
+
+    def span(self, name, seconds, attrs=None) -> None:
+        # attrs (thread IDs) are left out to keep label cardinality bounded
+        self._observe("deep_mem_phase_duration_seconds", {"phase": name}, seconds)
+
+    def render(self) -> str:
+        """The current metrics in Prometheus text exposition format"""
+        lines = []
+        with self._lock:
+            counters = sorted(self._counters.items())
+            histograms = sorted(self._histograms.items())
+
+            seen = set()
+            for (name, labels), value in counters:
+                if name not in seen:
+                    seen.add(name)
+                    lines.append(f"# TYPE {name} counter")
+                lines.append(f"{name}{_labels(labels)} {_number(value)}")
+
+            for (name, labels), histogram in histograms:
+                if name not in seen:
+                    seen.add(name)
+                    lines.append(f"# TYPE {name} histogram")
+                for bound, count in zip(self.buckets, histogram.counts):
+                    bucket_labels = labels + (("le", _number(bound)),)
+                    lines.append(f"{name}_bucket{_labels(bucket_labels)} {count}")
+                inf_labels = labels + (("le", "+Inf"),)
+                lines.append(f"{name}_bucket{_labels(inf_labels)} {histogram.count}")
+                lines.append(f"{name}_sum{_labels(labels)} {_number(histogram.sum)}")
+                lines.append(f"{name}_count{_labels(labels)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def write(self) -> None:
+        """Write render() to path, replacing the previous file atomically"""
+        if self.path is None:
+            return
+        tmp = self.path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp.write_text(self.render(), encoding="utf-8")
+            os.replace(tmp, self.path)
+        except OSError:
+            pass
+
+    def _maybe_write(self) -> None:
+        if self.path is None:
+            return
+        now = time.monotonic()
+        if now - self._last_write >= self.write_interval:
+            self._last_write = now
+            self.write()
+
+    def close(self) -> None:
+        self.write()
+
+
+def _labels(labels: tuple[tuple[str, str], ...]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels) + "}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+def hooks_from_config(config: "Config", metrics: bool = True) -> Hooks:
+    """Hooks enabled by MEM_TRACE_FILE / MEM_METRICS_FILE, or NO_HOOKS
+
+    Pass metrics=False when another process (the daemon) owns the metrics
+    file, so the two don't overwrite each other's counters.
+    """
+    hooks: list[Hooks] = []
+    if config.trace_file:
+        hooks.append(JSONLSpanWriter(config.trace_file))
+    if metrics and config.metrics_file:
+        hooks.append(PrometheusExporter(config.metrics_file))
+    if not hooks:
+        return NO_HOOKS
+    return hooks[0] if len(hooks) == 1 else MultiHooks(hooks)
@@ -0,0 +1,505 @@
+"""Offline mirror of the knowledge base
+
+`deep-mem sync` copies memories and threads into a local SQLite database;
+`--offline` then serves search, expand and batch from it through
+MirrorClient, which has the same surface as APIClient.
+
+Syncs are incremental: memories are listed from the newest
+updated_at/created_at seen by the previous sync on (for servers that honour
+`updated_since`) and only rewritten when that changed, and full threads
+are only downloaded when their summary's message_count or last activity
+differs from the mirrored copy. Threads the server no longer lists are
+dropped from the mirror, as long as the listing is complete: the
+summaries endpoint has no paging, so only the newest SYNC_THREAD_LIMIT
+threads are mirrored, and a sync that hits that limit says so.
+
+Memories come from GET /memories, which not every server has; without it
+the mirror holds threads only and offline searches find no memories.
+"""
+
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from itertools import islice
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Iterator
+
+from deep_mem.api import APIClient, APIError
+from deep_mem.cache import _SQLiteStore
+
+if TYPE_CHECKING:
+    from deep_mem.fulltext import ThreadTextIndex
+
+# Memories requested per list_memories page
+SYNC_PAGE_SIZE = 100
+
+# Thread summaries requested per sync; the summaries endpoint has no paging
+SYNC_THREAD_LIMIT = 1000
+
+# Concurrent get_thread requests while syncing
+SYNC_CONCURRENCY = 5
+
+# sync_state key of the newest memory version from the last complete listing
+MEMORY_CURSOR_KEY = "memories_cursor"
+
+
+def _memory_fields(item: dict[str, Any]) -> dict[str, Any]:
+    """The memory object of a list/search item (nested or flat format)"""
+    return item.get("memory", item)
+
+
+def _memory_version(memory: dict[str, Any]) -> str:
+    return str(memory.get("updated_at") or memory.get("created_at") or "")
+
+
+def _thread_version(thread: dict[str, Any]) -> str:
+    """Change marker for a thread: message count plus last activity"""
+    activity = thread.get("updated_at") or thread.get("last_activity") or ""
+    return f"{thread.get('message_count', '')}|{activity}"
+
+
+def _search_terms(query: str) -> list[str]:
+    return [term for term in query.lower().split() if term] or [query.lower()]
+
+
+class Mirror(_SQLiteStore):
+    """SQLite copy of memories and threads, filled by sync()
+
+    Mirrored data never expires; it is as fresh as the last sync.
+    """
+
+    _schema = (
+        """
+        CREATE TABLE IF NOT EXISTS memories (
+            memory_id TEXT PRIMARY KEY,
+            payload TEXT NOT NULL,
+            search_text TEXT NOT NULL,
+            version TEXT NOT NULL,
+            synced_at REAL NOT NULL
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS threads (
+            thread_id TEXT PRIMARY KEY,
+            meta TEXT NOT NULL,
+            payload TEXT,
+            search_text TEXT NOT NULL,
+            version TEXT NOT NULL,
+            synced_at REAL NOT NULL
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS sync_state (
+            key TEXT PRIMARY KEY,
+            value TEXT NOT NULL
+        )
+        """,
+    )
+
+    def __init__(self, path: Path | str):
+        super().__init__(path, ttl=float("inf"))
+
+    def memory_versions(self) -> dict[str, str]:
+        with self._lock:
+            return dict(self._conn.execute("SELECT memory_id, version FROM memories"))
+
+    def thread_versions(self) -> dict[str, str]:
+        """Versions of mirrored threads, including ones known to be deleted"""
+        with self._lock:
+            return dict(self._conn.execute("SELECT thread_id, version FROM threads"))
+
+    def put_memories(self, memories: Iterable[dict[str, Any]]) -> int:
+        """Store memory objects, returning how many were written"""
+        now = time.time()
+        rows = []
+        for memory in memories:
+            memory_id = memory.get("id") or memory.get("memory_id")
+            if not memory_id:
+                continue
+            text = f"{memory.get('title') or ''}\n{memory.get('content') or ''}".lower()
+            rows.append((
+                memory_id,
+                json.dumps(memory, ensure_ascii=False),
+                text,
+                _memory_version(memory),
+                now,
+            ))
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO memories "
+                "(memory_id, payload, search_text, version, synced_at) VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+        return len(rows)
+
+    def put_thread(
+        self,
+        meta: dict[str, Any],
+        payload: dict[str, Any] | None = None,
+        version: str | None = None,
+    ) -> None:
+        """Store thread metadata and its full get_thread payload
+
+        Rows without a payload mark deleted threads and are never returned.
+        version is the change marker sync compares against the next
+        summary; it defaults to that of meta.
+        """
+        thread_id = meta.get("thread_id") or meta.get("id")
+        if not thread_id:
+            return
+        text = f"{meta.get('title') or ''}\n{meta.get('summary') or ''}".lower()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO threads "
+                "(thread_id, meta, payload, search_text, version, synced_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    thread_id,
+                    json.dumps(meta, ensure_ascii=False),
+                    None if payload is None else json.dumps(payload, ensure_ascii=False),
+                    text,
+                    _thread_version(meta) if version is None else version,
+                    time.time(),
+                ),
+            )
+
+    def mark_deleted(self, meta: dict[str, Any]) -> None:
+        """Remember that a listed thread 404s, so unchanged it isn't retried"""
+        self.put_thread(meta, None)
+
+    def prune_threads(self, listed: set[str]) -> list[str]:
+        """Drop threads not in listed, the complete set of the server's threads
+
+        Returns the IDs of dropped threads that were mirrored, as opposed
+        to only remembered as deleted.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT thread_id, payload IS NOT NULL FROM threads"
+            ).fetchall()
+            gone = [(thread_id, live) for thread_id, live in rows if thread_id not in listed]
+            self._conn.executemany(
+                "DELETE FROM threads WHERE thread_id = ?", [(thread_id,) for thread_id, _ in gone],
+            )
+        return [thread_id for thread_id, live in gone if live]
+
+    def get_state(self, key: str) -> str | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM sync_state WHERE key = ?", (key,)
+            ).fetchone()
+        return None if row is None else row[0]
+
+    def set_state(self, key: str, value: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sync_state (key, value) VALUES (?, ?)", (key, value),
+            )
+
+    def counts(self) -> dict[str, int]:
+        with self._lock:
+            memories = self._conn.execute("SELECT COUNT(*) FROM memories").fetchone()[0]
+            threads = self._conn.execute(
+                "SELECT COUNT(*) FROM threads WHERE payload IS NOT NULL"
+            ).fetchone()[0]
+        return {"memories": memories, "threads": threads}
+
+    def _search(
+        self,
+        table: str,
+        column: str,
+        query: str,
+        limit: int,
+    ) -> tuple[list[tuple[str, float]], int]:
+        """Substring match on search_text, scored by the fraction of terms found"""
+        terms = _search_terms(query)
+        score = " + ".join(["(instr(search_text, ?) > 0)"] * len(terms))
+        live = " AND payload IS NOT NULL" if table == "threads" else ""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {column}, ({score}) AS hits FROM {table} "
+                f"WHERE hits > 0{live} ORDER BY hits DESC, synced_at DESC",
+                terms,
+            ).fetchall()
+        return [(value, hits / len(terms)) for value, hits in rows[:limit]], len(rows)
+
+    def search_memories(self, query: str, limit: int) -> dict[str, Any]:
+        """Local memory search in the server's response format"""
+        rows, total = self._search("memories", "payload", query, limit)
+        return {
+            "results": [
+                {"memory": json.loads(payload), "similarity_score": score}
+                for payload, score in rows
+            ],
+            "total_found": total,
+        }
+
+    def search_threads(self, query: str, limit: int) -> dict[str, Any]:
+        """Local thread search (titles and summaries) in the server's format"""
+        rows, total = self._search("threads", "meta", query, limit)
+        return {"threads": [json.loads(meta) for meta, _ in rows], "total_found": total}
+
+    def get_memory(self, memory_id: str) -> dict[str, Any] | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload FROM memories WHERE memory_id = ?", (memory_id,)
+            ).fetchone()
+        return None if row is None else json.loads(row[0])
+
+    def get_thread(self, thread_id: str) -> dict[str, Any] | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload FROM threads WHERE thread_id = ?", (thread_id,)
+            ).fetchone()
+        return None if row is None or row[0] is None else json.loads(row[0])
+
+    def iter_threads(self) -> Iterator[tuple[dict[str, Any], dict[str, Any]]]:
+        """(payload, meta) of every mirrored thread, e.g. to rebuild an index"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT payload, meta FROM threads WHERE payload IS NOT NULL"
+            ).fetchall()
+        for payload, meta in rows:
+            yield json.loads(payload), json.loads(meta)
+
+    def thread_summaries(self, limit: int) -> list[dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT meta FROM threads WHERE payload IS NOT NULL "
+                "ORDER BY synced_at DESC LIMIT ?", (limit,)
+            ).fetchall()
+        return [json.loads(meta) for (meta,) in rows]
+
+
+class MirrorClient:
+    """Drop-in replacement for APIClient that answers from a Mirror
+
+    Never touches the network. Items missing from the mirror raise
+    APIError with status 404, as the server would.
+    """
+
+    # Searchers check this to know there is no server to fall back on
+    offline = True
+
+    def __init__(self, mirror: Mirror):
+        self.mirror = mirror
+
+    def close(self) -> None:
+        self.mirror.close()
+
+    def __enter__(self) -> "MirrorClient":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> bool:
+        self.close()
+        return False
+
+    def search_memories(
+        self,
+        query: str,
+        limit: int = 10,
+        mode: str = "deep",
+        filter_labels: str | None = None,
+    ) -> dict[str, Any]:
+        response = self.mirror.search_memories(query, limit)
+        if filter_labels:
+            wanted = {label.strip() for label in filter_labels.split(",")}
+            response["results"] = [
+                item for item in response["results"]
+                if wanted & set(_memory_labels(item["memory"]))
+            ]
+        return response
+
+    def get_memory(self, memory_id: str) -> dict[str, Any]:
+        memory = self.mirror.get_memory(memory_id)
+        if memory is None:
+            raise APIError("Get memory failed: 404 (not in mirror)", status_code=404)
+        return memory
+
+    def search_threads(
+        self,
+        query: str,
+        limit: int = 20,
+        mode: str = "full",
+    ) -> dict[str, Any]:
+        return self.mirror.search_threads(query, limit)
+
+    def get_thread(self, thread_id: str) -> dict[str, Any]:
+        thread = self.mirror.get_thread(thread_id)
+        if thread is None:
+            raise APIError("Get thread failed: 404 (not in mirror)", status_code=404)
+        return thread
+
+    def get_thread_summaries(self, limit: int = 50) -> dict[str, Any]:
+        return {"summaries": self.mirror.thread_summaries(limit)}
+
+
+def _memory_labels(memory: dict[str, Any]) -> list[str]:
+    return memory.get("labels") or memory.get("metadata", {}).get("labels", [])
+
+
+@dataclass(slots=True)
+class SyncStats:
+    """What a sync() run did"""
+    memories_seen: int = 0
+    memories_written: int = 0
+    threads_seen: int = 0
+    threads_fetched: int = 0
+    threads_removed: int = 0
+    threads_failed: int = 0
+    threads_indexed: int = 0
+    # The summaries listing hit SYNC_THREAD_LIMIT: older threads are not
+    # mirrored and deleted ones can't be told apart from them
+    threads_truncated: bool = False
+    memories_listable: bool = True
+    seconds: float = 0.0
+
+
+def sync(
+    client: APIClient,
+    mirror: Mirror,
+    full: bool = False,
+    concurrency: int = SYNC_CONCURRENCY,
+    progress: Callable[[str], None] | None = None,
+    text_index: "ThreadTextIndex | None" = None,
+) -> SyncStats:
+    """Bring the mirror up to date with the server
+
+    With full=True every thread is downloaded again, regardless of whether
+    its summary changed. With a text_index, downloaded threads are indexed
+    for local thread search and removed ones dropped from it; an empty
+    index is first filled from the threads already mirrored.
+    """
+    started = time.perf_counter()
+    stats = SyncStats()
+    report = progress or (lambda message: None)
+
+    if text_index is not None and not len(text_index):
+        threads = mirror.iter_threads()
+        while chunk := list(islice(threads, SYNC_PAGE_SIZE)):
+            stats.threads_indexed += text_index.add_many(chunk)
+            report(f"index: {stats.threads_indexed} mirrored threads indexed")
+
+    _sync_memories(client, mirror, stats, report, full)
+    _sync_threads(client, mirror, stats, report, full, max(1, concurrency), text_index)
+
+    mirror.set_state("synced_at", str(time.time()))
+    stats.seconds = time.perf_counter() - started
+    return stats
+
+
+def _sync_memories(
+    client: APIClient,
+    mirror: Mirror,
+    stats: SyncStats,
+    report: Callable[[str], None],
+    full: bool,
+) -> None:
+    known = mirror.memory_versions()
+    cursor = None if full else mirror.get_state(MEMORY_CURSOR_KEY)
+    newest = cursor or ""
+    seen: set[str] = set()
+    offset = 0
+    while True:
+        try:
+            page = client.list_memories(
+                limit=SYNC_PAGE_SIZE, offset=offset, updated_since=cursor,
+            )
+        except APIError as e:
+            if e.status_code in (404, 405) and offset == 0:
+                # Older servers can't list memories; search results are the
+                # only source then
+                stats.memories_listable = False
+                return
+            raise
+        items = page if isinstance(page, list) else (
+            page.get("memories") or page.get("results") or []
+        )
+        memories = [_memory_fields(item) for item in items]
+        new = [m for m in memories if (m.get("id") or m.get("memory_id")) not in seen]
+        if not new:
+            break  # Empty page, or the server ignores offset
+        for memory in new:
+            seen.add(memory.get("id") or memory.get("memory_id"))
+            newest = max(newest, _memory_version(memory))
+        stats.memories_seen += len(new)
+        changed = [
+            m for m in new
+            if known.get(m.get("id") or m.get("memory_id")) != _memory_version(m)
+        ]
+        stats.memories_written += mirror.put_memories(changed)
+        report(f"memories: {stats.memories_seen} seen, {stats.memories_written} updated")
+        if len(items) < SYNC_PAGE_SIZE:
+            break
+        offset += len(items)
+    # Only after a complete listing, so an interrupted sync can't skip memories
+    if newest:
+        mirror.set_state(MEMORY_CURSOR_KEY, newest)
+
+
+def _sync_threads(
+    client: APIClient,
+    mirror: Mirror,
+    stats: SyncStats,
+    report: Callable[[str], None],
+    full: bool,
+    concurrency: int,
+    text_index: "ThreadTextIndex | None",
+) -> None:
+    response = client.get_thread_summaries(limit=SYNC_THREAD_LIMIT)
+    if isinstance(response, list):
+        summaries, recognized = response, True
+    else:
+        summaries = (
+            response.get("summaries")
+            or response.get("threads")
+            or response.get("results")
+            or []
+        )
+        recognized = any(key in response for key in ("summaries", "threads", "results"))
+    stats.threads_seen = len(summaries)
+    stats.threads_truncated = len(summaries) >= SYNC_THREAD_LIMIT
+
+    if recognized and not stats.threads_truncated:
+        # Threads deleted on the server simply drop out of the listing
+        listed = {summary.get("thread_id") or summary.get("id") for summary in summaries}
+        for thread_id in mirror.prune_threads(listed):
+            stats.threads_removed += 1
+            if text_index is not None:
+                text_index.remove(thread_id)
+
+    known = {} if full else mirror.thread_versions()
+    stale = [
+        summary for summary in summaries
+        if (summary.get("thread_id") or summary.get("id"))
+        and known.get(summary.get("thread_id") or summary.get("id")) != _thread_version(summary)
+    ]
+
+    def fetch(summary: dict[str, Any]) -> tuple[dict[str, Any], dict[str, Any] | None, bool]:
+        """(summary, payload or None, True if the thread is gone)"""
+        thread_id = summary.get("thread_id") or summary.get("id")
+        try:
+            return summary, client.get_thread(thread_id), False
+        except APIError as e:
+            return summary, None, e.status_code == 404 and e.cacheable
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for done, (summary, payload, gone) in enumerate(executor.map(fetch, stale), 1):
+            if payload is not None:
+                # Prefer the full thread object's metadata when present
+                meta = {**summary, **payload.get("thread", {})}
+                # Versioned like the summary, which is what the next sync
+                # compares against
+                mirror.put_thread(meta, payload, version=_thread_version(summary))
+                stats.threads_fetched += 1
+                if text_index is not None:
+                    stats.threads_indexed += text_index.add_many([(payload, summary)])
+            elif gone:
+                mirror.mark_deleted(summary)
+                stats.threads_removed += 1
+                if text_index is not None:
+                    text_index.remove(summary.get("thread_id") or summary.get("id"))
+            else:
+                stats.threads_failed += 1
+            report(f"threads: {done}/{len(stale)} changed threads processed")
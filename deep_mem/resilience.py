@@ -0,0 +1,237 @@
+"""Retry and circuit breaker policies for the Mem API clients"""
+
+import json
+import os
+import random
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+
+from deep_mem.api import CircuitOpenError
+
+# Statuses that indicate a transient server-side condition
+RETRYABLE_STATUS_CODES = frozenset({408, 429, 500, 502, 503, 504})
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Parse a Retry-After header (delta-seconds or HTTP-date) into seconds"""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass
+class RetryPolicy:
+    """Exponential backoff with full jitter
+
+    Attributes:
+        max_retries: Retries after the first attempt (0 disables retrying)
+        backoff_base: Upper bound of the first delay, in seconds
+        backoff_max: Cap on the exponential delay, in seconds
+        max_retry_after: Cap on a server-provided Retry-After, in seconds
+        retry_statuses: HTTP statuses worth retrying
+    """
+    max_retries: int = 2
+    backoff_base: float = 0.25
+    backoff_max: float = 4.0
+    max_retry_after: float = 10.0
+    retry_statuses: frozenset[int] = RETRYABLE_STATUS_CODES
+
+    def max_duration(self, attempt_timeout: float) -> float:
+        """Upper bound on the seconds a request may take, retries included,
+        when each attempt takes at most attempt_timeout
+        """
+        backoff = sum(
+            max(min(self.backoff_max, self.backoff_base * 2 ** attempt), self.max_retry_after)
+            for attempt in range(self.max_retries)
+        )
+        return (self.max_retries + 1) * attempt_timeout + backoff
+
+    def delay(self, attempt: int, retry_after: str | None = None) -> float:
+        """Seconds to wait before retry number attempt + 1"""
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+        server_delay = parse_retry_after(retry_after)
+        if server_delay is not None:
+            delay = max(delay, min(server_delay, self.max_retry_after))
+        return delay
+
+
+class CircuitBreaker:
+    """Fail fast after repeated server failures
+
+    After `failure_threshold` consecutive failures the circuit opens and
+    requests raise CircuitOpenError for `reset_timeout` seconds. Then one
+    probe request is let through: success closes the circuit, failure
+    re-opens it.
+
+    With `state_path`, the failure count and open time are shared through
+    a small JSON file, so separate CLI processes stop waiting on a server
+    that another process already found down.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        state_path: Path | str | None = None,
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state_path = Path(state_path) if state_path else None
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._probing = False
+
+    @property
+    def is_open(self) -> bool:
+        with self._lock:
+            self._load()
+            return self._opened_at is not None
+
+    def before_request(self) -> bool:
+        """Raise CircuitOpenError unless a request may be sent now
+
+        Returns True if the request is the half-open probe; the caller must
+        then call end_probe() once it is done, whatever the outcome.
+        """
+        with self._lock:
+            self._load()
+            if self._opened_at is None:
+                return False
+            remaining = self._opened_at + self.reset_timeout - time.time()
+            if remaining <= 0 and not self._probing:
+                self._probing = True  # Half-open: let one probe through
+                return True
+        raise CircuitOpenError(
+            f"Nowledge Mem server unavailable after {self._failures} failures; "
+            f"failing fast for {max(remaining, 0):.1f}s",
+        )
+
+    def record_success(self) -> None:
+        with self._lock:
+            changed = self._failures or self._opened_at is not None
+            self._failures = 0
+            self._opened_at = None
+            self._probing = False
+            if changed:
+                self._save()
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._load()
+            self._failures += 1
+            if self._probing or self._failures >= self.failure_threshold:
+                self._opened_at = time.time()
+                self._probing = False
+            self._save()
+
+    def end_probe(self) -> None:
+        """Let another probe through if this one recorded no outcome"""
+        with self._lock:
+            self._probing = False
+
+    def _load(self) -> None:
+        if self.state_path is None:
+            return
+        try:
+            state = json.loads(self.state_path.read_text())
+        except (OSError, ValueError):
+            return
+        self._failures = int(state.get("failures", 0))
+        self._opened_at = state.get("opened_at")
+
+    def _save(self) -> None:
+        if self.state_path is None:
+            return
+        state = {"failures": self._failures, "opened_at": self._opened_at}
+        tmp = self.state_path.with_name(f".{self.state_path.name}.{os.getpid()}")
+        try:
+            self.state_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp.write_text(json.dumps(state))
+            os.replace(tmp, self.state_path)
+        except OSError:
+            pass  # Sharing state is best-effort
+
+
+class LatencyTracker:
+    """Rolling window of observed request latencies (thread-safe)"""
+
+    def __init__(self, window: int = 200):
+        self._samples: deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, fraction: float) -> float | None:
+        """Latency at the given fraction (0-1) of the window, or None if empty"""
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return None
+        index = min(len(samples) - 1, int(fraction * len(samples)))
+        return samples[index]
+
+
+@dataclass
+class HedgingPolicy:
+    """Send a duplicate request when the first one runs unusually long
+
+    The hedge fires once a request has been outstanding longer than the
+    `percentile` of recently observed latencies for the same endpoint, and
+    whichever response arrives first wins. Nothing is hedged until
+    `min_samples` latencies have been observed.
+
+    Attributes:
+        percentile: Fraction (0-1) of recent latencies to wait before hedging
+        min_samples: Observations needed before hedging starts
+        min_delay: Lower bound on the hedging delay, in seconds
+        window: Latencies remembered per endpoint
+    """
+    percentile: float = 0.95
+    min_samples: int = 20
+    min_delay: float = 0.01
+    window: int = 200
+    hedged: int = 0
+    hedge_wins: int = 0
+    _trackers: dict[str, LatencyTracker] = field(default_factory=dict, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def tracker(self, key: str) -> LatencyTracker:
+        with self._lock:
+            tracker = self._trackers.get(key)
+            if tracker is None:
+                tracker = self._trackers[key] = LatencyTracker(self.window)
+            return tracker
+
+    def record(self, key: str, seconds: float) -> None:
+        self.tracker(key).record(seconds)
+
+    def delay(self, key: str) -> float | None:
+        """Seconds to wait before hedging a request to key, or None to not hedge"""
+        tracker = self.tracker(key)
+        if len(tracker) < self.min_samples:
+            return None
+        return max(self.min_delay, tracker.percentile(self.percentile))
+
+    def record_hedge(self, won: bool) -> None:
+        with self._lock:
+            self.hedged += 1
+            if won:
+                self.hedge_wins += 1
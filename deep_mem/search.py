@@ -1,12 +1,35 @@
 """Core search logic for deep memory retrieval"""
 
+import json
+import threading
+import time
+from contextlib import contextmanager
 from dataclasses import dataclass, field
-from typing import Any
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Iterator
 
-from deep_mem.api import APIClient
+from deep_mem import timings
+from deep_mem.api import APIError, CircuitOpenError
+from deep_mem.hooks import NO_HOOKS, Hooks
 
+if TYPE_CHECKING:
+    # asyncio and concurrent.futures are imported where used; together they
+    # cost more CLI startup time than everything else in this module
+    import asyncio
+    from concurrent.futures import Future
 
-@dataclass
+    from deep_mem.api import APIClient, AsyncAPIClient
+    from deep_mem.cache import ThreadCache, ThreadIndex
+    from deep_mem.fulltext import ThreadTextIndex
+    from deep_mem.stream import ThreadEvent
+
+# Max concurrent get_thread requests during Phase 2
+DEFAULT_THREAD_CONCURRENCY = 5
+
+# Thread summaries pulled per thread index refresh
+SUMMARY_INDEX_LIMIT = 200
+
+
+@dataclass(slots=True)
 class MemoryResult:
     """A memory search result with optional thread references"""
     memory_id: str
@@ -20,7 +43,7 @@ class MemoryResult:
     created_at: str | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class ThreadResult:
     """A thread search result"""
     thread_id: str
@@ -30,7 +53,7 @@ class ThreadResult:
     created_at: str | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class DeepSearchResult:
     """Combined search result with memories and related threads"""
     query: str
@@ -40,85 +63,191 @@ class DeepSearchResult:
     total_threads_found: int = 0
 
 
-class DeepMemorySearcher:
-    """Progressive disclosure search: memories -> related threads"""
+def _run_in_background(fn: Callable[..., Any], *args: Any) -> "Future":
+    """Call fn(*args) on a daemon thread and return a future for its result
 
-    def __init__(self, client: APIClient) -> None:
-        self.client = client
+    Unlike a ThreadPoolExecutor worker, the thread is not joined at
+    interpreter exit, so an abandoned request never delays the process.
+    """
+    from concurrent.futures import Future
 
-    def search(
-        self,
-        query: str,
-        memory_limit: int = 10,
-        thread_limit: int = 5,
-        expand_threads: bool = True,
-    ) -> DeepSearchResult:
-        """Execute deep memory search with progressive disclosure
+    future: Future = Future()
 
-        Phase 1: Search memories (brief descriptions)
-        Phase 2: Find related threads (detail references)
+    def run() -> None:
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(fn(*args))
+        except BaseException as e:
+            future.set_exception(e)
 
-        Args:
-            query: Search query
-            memory_limit: Max memories to return
-            thread_limit: Max threads per memory
-            expand_threads: Whether to search for related threads
+    threading.Thread(target=run, name="deep-mem-speculative", daemon=True).start()
+    return future
 
-        Returns:
-            DeepSearchResult with memories and related threads
-        """
-        # Phase 1: Search memories
-        memory_response = self.client.search_memories(
-            query=query,
-            limit=memory_limit,
-            mode="deep",
-        )
 
-        memories = self._parse_memories(memory_response)
+class _SearcherBase:
+    """Response parsing shared by the sync and async searchers"""
+
+    thread_index: "ThreadIndex | None" = None
+    thread_search: "ThreadTextIndex | None" = None
+    hooks: Hooks = NO_HOOKS
+
+    @contextmanager
+    def _phase(self, name: str, thread_id: str | None = None) -> Iterator[None]:
+        """Time a search phase for --timings and report it as a hook span"""
+        label = name if thread_id is None else f"{name}/{thread_id}"
+        started = time.perf_counter()
+        try:
+            with timings.phase(label):
+                yield
+        finally:
+            attrs = None if thread_id is None else {"thread_id": thread_id}
+            self.hooks.span(name, time.perf_counter() - started, attrs)
+
+    def _report_index_lookups(self, requested: int, missing: int) -> None:
+        if self.thread_index is None:
+            return
+        for _ in range(requested - missing):
+            self.hooks.cache_hit("index")
+        for _ in range(missing):
+            self.hooks.cache_miss("index")
+
+    def _total_memories(
+        self,
+        memory_response: dict[str, Any] | list,
+        memories: list[MemoryResult],
+    ) -> int:
         # Handle both array and dict response for total count
         if isinstance(memory_response, list):
-            total_memories = len(memory_response)
-        else:
-            total_memories = memory_response.get("total_found", len(memories))
+            return len(memory_response)
+        return memory_response.get("total_found", len(memories))
 
-        # Phase 2: Find related threads
-        related_threads: list[ThreadResult] = []
-        total_threads = 0
+    def _referenced_thread_ids(self, memories: list[MemoryResult]) -> list[str]:
+        """Thread IDs referenced by memories, deduplicated in first-seen order"""
+        return list(dict.fromkeys(
+            mem.source_thread_id for mem in memories if mem.source_thread_id
+        ))
 
-        if expand_threads and memories:
-            # Strategy 1: Use source_thread_id from memories (metadata reference)
-            thread_ids_from_memories = set()
-            for mem in memories:
-                if mem.source_thread_id:
-                    thread_ids_from_memories.add(mem.source_thread_id)
+    def _thread_from_payload(self, thread_data: dict[str, Any], index: bool = True) -> ThreadResult:
+        # get_thread returns {"thread": {...}, "messages": [...]}
+        thread_obj = thread_data.get("thread", thread_data)
+        if index:
+            self._index_threads([thread_obj])
+        return self._parse_thread(thread_obj)
 
-            # Fetch threads by ID if we have references
-            for tid in list(thread_ids_from_memories)[:thread_limit]:
-                try:
-                    thread_data = self.client.get_thread(tid)
-                    # get_thread returns {"thread": {...}, "messages": [...]}
-                    thread_obj = thread_data.get("thread", thread_data)
-                    related_threads.append(self._parse_thread(thread_obj))
-                except Exception:
-                    pass  # Thread may have been deleted
-
-            # Strategy 2: If no thread references, search by query keywords
-            if not related_threads:
-                thread_response = self.client.search_threads(
-                    query=query,
-                    limit=thread_limit,
-                    mode="full",
+    def _indexed_threads(self, thread_ids: list[str]) -> dict[str, ThreadResult]:
+        """Threads resolvable from the local metadata index, by requested ID"""
+        if self.thread_index is None:
+            return {}
+        try:
+            found = self.thread_index.get_many(thread_ids)
+        except Exception:
+            return {}  # The index is best-effort
+        return {tid: self._parse_thread(meta) for tid, meta in found.items()}
+
+    def _index_needs_refresh(self, found: dict[str, ThreadResult], thread_ids: list[str]) -> bool:
+        if self.thread_index is None or len(found) == len(thread_ids):
+            return False
+        try:
+            return self.thread_index.needs_refresh()
+        except Exception:
+            return False
+
+    def _index_threads(self, threads: Iterable[dict[str, Any]]) -> None:
+        if self.thread_index is None:
+            return
+        try:
+            self.thread_index.put_many(threads)
+        except Exception:
+            pass
+
+    def _index_summaries(self, response: dict[str, Any] | list | None) -> None:
+        """Store a get_thread_summaries response (None if the call failed)"""
+        if response is not None:
+            if isinstance(response, list):
+                items = response
+            else:
+                items = (
+                    response.get("summaries")
+                    or response.get("threads")
+                    or response.get("results")
+                    or []
                 )
-                related_threads = self._parse_threads(thread_response)
-                total_threads = thread_response.get("total_found", len(related_threads))
+            self._index_threads(items)
+        try:
+            # Also after a failure, so a broken endpoint isn't hit every search
+            self.thread_index.mark_refreshed()
+        except Exception:
+            pass
 
-        return DeepSearchResult(
-            query=query,
-            memories=memories,
-            related_threads=related_threads,
-            total_memories_found=total_memories,
-            total_threads_found=total_threads or len(related_threads),
-        )
+    def _local_thread_search(self, query: str, limit: int) -> dict[str, Any] | None:
+        """Strategy 2 answered from the full-text index, or None to ask the client
+
+        Online, only threads matching every query term count: the index
+        holds just the threads seen so far, and the server's search beats
+        a local match on some of the terms. Offline there is no server, so
+        threads matching any term are better than none.
+        """
+        if self.thread_search is None:
+            return None
+        offline = getattr(self.client, "offline", False)
+        try:
+            response = self.thread_search.search(query, limit, fallback=offline)
+        except Exception:
+            return None  # The index is best-effort
+        if not response["threads"]:
+            self.hooks.cache_miss("fulltext")
+            return None
+        self.hooks.cache_hit("fulltext")
+        return response
+
+    def _index_thread_text(self, thread_data: dict[str, Any]) -> None:
+        """Make a fetched thread's messages searchable by the full-text index"""
+        if self.thread_search is None:
+            return
+        try:
+            with timings.stage("index"):
+                self.thread_search.add(thread_data)
+        except Exception:
+            pass
+
+    def _memories_from_body(self, body: bytes) -> tuple[list[MemoryResult], int]:
+        """Decode a raw memory search response into results and total found"""
+        try:
+            from deep_mem.decode import decode_memory_search
+        except ImportError:
+            pass  # msgspec not installed
+        else:
+            import msgspec
+            try:
+                # Decoding and parsing happen in the same pass
+                with timings.stage("decode"):
+                    return decode_memory_search(body)
+            except msgspec.DecodeError:
+                pass  # Unexpected shape; the dict-based parser is more lenient
+        with timings.stage("decode"):
+            response = json.loads(body)
+        return self._parse_memory_response(response)
+
+    def _parse_memory_response(
+        self,
+        response: dict[str, Any] | list,
+    ) -> tuple[list[MemoryResult], int]:
+        with timings.stage("parse"):
+            memories = self._parse_memories(response)
+            return memories, self._total_memories(response, memories)
+
+    def _parse_thread_response(
+        self,
+        response: dict[str, Any],
+        index: bool = True,
+    ) -> tuple[list[ThreadResult], int]:
+        """Strategy 2 results and total found, indexing the threads returned"""
+        with timings.stage("parse"):
+            threads = self._parse_threads(response)
+            if index:
+                self._index_threads(response.get("threads", []))
+            return threads, response.get("total_found", len(threads))
 
     def _parse_memories(self, response: dict[str, Any] | list) -> list[MemoryResult]:
         """Parse memory search response into MemoryResult objects"""
@@ -164,6 +293,400 @@ class DeepMemorySearcher:
             created_at=thread.get("created_at") or thread.get("last_activity"),
         )
 
+
+class DeepMemorySearcher(_SearcherBase):
+    """Progressive disclosure search: memories -> related threads"""
+
+    def __init__(
+        self,
+        client: "APIClient",
+        thread_concurrency: int = DEFAULT_THREAD_CONCURRENCY,
+        thread_cache: "ThreadCache | None" = None,
+        thread_index: "ThreadIndex | None" = None,
+        hooks: Hooks | None = None,
+        thread_search: "ThreadTextIndex | None" = None,
+    ) -> None:
+        self.client = client
+        self.thread_concurrency = max(1, thread_concurrency)
+        self.thread_cache = thread_cache
+        self.thread_index = thread_index
+        self.thread_search = thread_search
+        # Share the client's hooks unless told otherwise
+        self.hooks = hooks or getattr(client, "hooks", NO_HOOKS)
+
+    def search(
+        self,
+        query: str,
+        memory_limit: int = 10,
+        thread_limit: int = 5,
+        expand_threads: bool = True,
+        speculative: bool = False,
+    ) -> DeepSearchResult:
+        """Execute deep memory search with progressive disclosure
+
+        Phase 1: Search memories (brief descriptions)
+        Phase 2: Find related threads (detail references)
+
+        Args:
+            query: Search query
+            memory_limit: Max memories to return
+            thread_limit: Max threads per memory
+            expand_threads: Whether to search for related threads
+            speculative: Start the Strategy 2 thread search alongside
+                Phase 1 and discard it if Strategy 1 finds threads
+
+        Returns:
+            DeepSearchResult with memories and related threads
+        """
+        thread_future: "Future | None" = None
+        if speculative and expand_threads:
+            thread_future = _run_in_background(
+                timings.bind(self._search_threads), query, thread_limit,
+            )
+
+        try:
+            # Phase 1: Search memories
+            with self._phase("phase1"):
+                memories, total_memories = self._search_memories(query, memory_limit)
+
+            # Phase 2: Find related threads
+            related_threads: list[ThreadResult] = []
+            total_threads = 0
+
+            if expand_threads and memories:
+                # Strategy 1: Use source_thread_id from memories (metadata reference)
+                thread_ids_from_memories = self._referenced_thread_ids(memories)
+
+                # Fetch threads by ID if we have references
+                with self._phase("phase2"):
+                    related_threads = self._fetch_threads(thread_ids_from_memories[:thread_limit])
+
+                # Strategy 2: If no thread references, search by query keywords
+                if not related_threads:
+                    if thread_future is not None:
+                        thread_response = thread_future.result()
+                    else:
+                        thread_response = self._search_threads(query, thread_limit)
+                    with timings.phase("strategy2"):  # Parsing; the request is its own span
+                        related_threads, total_threads = self._parse_thread_response(
+                            thread_response
+                        )
+        finally:
+            if thread_future is not None:
+                # Stops it if it hasn't started; a request in flight runs on
+                # in its daemon thread and is abandoned
+                thread_future.cancel()
+
+        return DeepSearchResult(
+            query=query,
+            memories=memories,
+            related_threads=related_threads,
+            total_memories_found=total_memories,
+            total_threads_found=total_threads or len(related_threads),
+        )
+
+    def _search_memories(self, query: str, limit: int) -> tuple[list[MemoryResult], int]:
+        """Phase 1 request, decoding raw bytes when the client can supply them"""
+        search_raw = getattr(self.client, "search_memories_raw", None)
+        if search_raw is not None:
+            return self._memories_from_body(search_raw(query=query, limit=limit, mode="deep"))
+        response = self.client.search_memories(query=query, limit=limit, mode="deep")
+        return self._parse_memory_response(response)
+
+    def _search_threads(self, query: str, limit: int) -> dict[str, Any]:
+        """Strategy 2: the local full-text index, else a request"""
+        with self._phase("strategy2"):
+            response = self._local_thread_search(query, limit)
+            if response is not None:
+                return response
+            return self.client.search_threads(query=query, limit=limit, mode="full")
+
+    def _fetch_threads(self, thread_ids: list[str]) -> list[ThreadResult]:
+        """Resolve threads, preserving the order of thread_ids
+
+        Metadata comes from the thread index when possible, refreshed from
+        get_thread_summaries at most once per refresh interval. Only threads
+        missing from it are downloaded in full, concurrently. Threads that
+        fail to load are skipped.
+        """
+        if not thread_ids:
+            return []
+
+        resolved = self._indexed_threads(thread_ids)
+        if self._index_needs_refresh(resolved, thread_ids):
+            with self._phase("phase2/summaries"):
+                try:
+                    summaries = self.client.get_thread_summaries(limit=SUMMARY_INDEX_LIMIT)
+                except Exception:
+                    summaries = None
+                self._index_summaries(summaries)
+            resolved = self._indexed_threads(thread_ids)
+
+        missing = [tid for tid in thread_ids if tid not in resolved]
+        self._report_index_lookups(len(thread_ids), len(missing))
+        workers = min(self.thread_concurrency, len(missing))
+        if workers == 1:
+            fetched = map(self._fetch_thread, missing)
+        elif workers > 1:
+            from concurrent.futures import ThreadPoolExecutor
+
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                fetched = list(executor.map(timings.bind(self._fetch_thread), missing))
+        else:
+            fetched = []
+        for tid, thread in zip(missing, fetched):
+            if thread is not None:
+                resolved[tid] = thread
+        return [resolved[tid] for tid in thread_ids if tid in resolved]
+
+    def _fetch_thread(self, thread_id: str) -> ThreadResult | None:
+        """Fetch a single thread, returning None if it cannot be loaded"""
+        with self._phase("phase2/thread", thread_id):
+            try:
+                thread_data = self.get_thread_detail(thread_id)
+            except CircuitOpenError:
+                raise  # Server is down; fail fast instead of dropping threads
+            except Exception:
+                return None  # Thread may have been deleted
+            self._index_thread_text(thread_data)
+            with timings.stage("parse"):
+                return self._thread_from_payload(thread_data)
+
     def get_thread_detail(self, thread_id: str) -> dict[str, Any]:
         """Get full thread content for expanded view"""
-        return self.client.get_thread(thread_id)
+        if self.thread_cache is None:
+            return self.client.get_thread(thread_id)
+
+        loaded = False
+
+        def load(thread_id: str) -> dict[str, Any]:
+            nonlocal loaded
+            loaded = True
+            return self.client.get_thread(thread_id)
+
+        try:
+            return self.thread_cache.fetch(thread_id, load)
+        finally:
+            # A remembered 404 raised from the cache also counts as a hit
+            if loaded:
+                self.hooks.cache_miss("thread")
+            else:
+                self.hooks.cache_hit("thread")
+
+    def iter_thread_detail(self, thread_id: str) -> Iterator["ThreadEvent"]:
+        """Stream full thread content as events (see deep_mem.stream)
+
+        Cached threads are replayed from the cache. Otherwise the thread is
+        streamed from the server, and cached if it turns out small enough.
+        """
+        from deep_mem.stream import iter_payload_events
+
+        cached = None
+        if self.thread_cache is not None:
+            try:
+                cached = self.thread_cache.get(thread_id)
+            except APIError:
+                raise  # Known-deleted thread
+            except Exception:
+                pass  # Unreadable cache; stream from the server
+        if cached is not None:
+            self.hooks.cache_hit("thread")
+            yield from iter_payload_events(cached)
+            return
+        if self.thread_cache is not None:
+            self.hooks.cache_miss("thread")
+
+        stream_thread = getattr(self.client, "stream_thread", None)
+        if stream_thread is None:
+            yield from iter_payload_events(self.get_thread_detail(thread_id))
+            return
+
+        events = stream_thread(thread_id)
+        if self.thread_cache is not None:
+            events = self.thread_cache.tee(thread_id, events)
+        yield from events
+
+
+class AsyncDeepMemorySearcher(_SearcherBase):
+    """Asyncio counterpart of DeepMemorySearcher built on AsyncAPIClient"""
+
+    def __init__(
+        self,
+        client: "AsyncAPIClient",
+        thread_concurrency: int = DEFAULT_THREAD_CONCURRENCY,
+        thread_cache: "ThreadCache | None" = None,
+        thread_index: "ThreadIndex | None" = None,
+        hooks: Hooks | None = None,
+        thread_search: "ThreadTextIndex | None" = None,
+    ) -> None:
+        self.client = client
+        self.thread_concurrency = max(1, thread_concurrency)
+        self.thread_cache = thread_cache
+        self.thread_index = thread_index
+        self.thread_search = thread_search
+        # Share the client's hooks unless told otherwise
+        self.hooks = hooks or getattr(client, "hooks", NO_HOOKS)
+
+    async def search(
+        self,
+        query: str,
+        memory_limit: int = 10,
+        thread_limit: int = 5,
+        expand_threads: bool = True,
+        speculative: bool = False,
+    ) -> DeepSearchResult:
+        """Execute deep memory search with progressive disclosure
+
+        See DeepMemorySearcher.search for the phases and arguments.
+        """
+        import asyncio
+
+        thread_task: "asyncio.Task | None" = None
+        if speculative and expand_threads:
+            thread_task = asyncio.create_task(self._search_threads(query, thread_limit))
+
+        try:
+            # Phase 1: Search memories
+            with self._phase("phase1"):
+                memories, total_memories = await self._search_memories(query, memory_limit)
+
+            # Phase 2: Find related threads
+            related_threads: list[ThreadResult] = []
+            total_threads = 0
+
+            if expand_threads and memories:
+                # Strategy 1: Use source_thread_id from memories (metadata reference)
+                thread_ids_from_memories = self._referenced_thread_ids(memories)
+                with self._phase("phase2"):
+                    related_threads = await self._fetch_threads(
+                        thread_ids_from_memories[:thread_limit]
+                    )
+
+                # Strategy 2: If no thread references, search by query keywords
+                if not related_threads:
+                    if thread_task is not None:
+                        thread_response = await thread_task
+                    else:
+                        thread_response = await self._search_threads(query, thread_limit)
+                    with timings.phase("strategy2"):  # Parsing; the request is its own span
+                        related_threads, total_threads = self._parse_thread_response(
+                            thread_response, index=False,
+                        )
+                        if self.thread_index is not None:
+                            await asyncio.to_thread(
+                                self._index_threads, thread_response.get("threads", [])
+                            )
+        finally:
+            if thread_task is not None:
+                thread_task.cancel()
+                # Consume any error from an unused speculative request
+                thread_task.add_done_callback(lambda t: t.cancelled() or t.exception())
+
+        return DeepSearchResult(
+            query=query,
+            memories=memories,
+            related_threads=related_threads,
+            total_memories_found=total_memories,
+            total_threads_found=total_threads or len(related_threads),
+        )
+
+    async def _search_memories(self, query: str, limit: int) -> tuple[list[MemoryResult], int]:
+        """Phase 1 request, decoding raw bytes when the client can supply them"""
+        search_raw = getattr(self.client, "search_memories_raw", None)
+        if search_raw is not None:
+            body = await search_raw(query=query, limit=limit, mode="deep")
+            return self._memories_from_body(body)
+        response = await self.client.search_memories(query=query, limit=limit, mode="deep")
+        return self._parse_memory_response(response)
+
+    async def _search_threads(self, query: str, limit: int) -> dict[str, Any]:
+        """Strategy 2: the local full-text index, else a request"""
+        import asyncio
+
+        with self._phase("strategy2"):
+            if self.thread_search is not None:
+                # An FTS5 query; keep it off the event loop
+                response = await asyncio.to_thread(self._local_thread_search, query, limit)
+                if response is not None:
+                    return response
+            return await self.client.search_threads(query=query, limit=limit, mode="full")
+
+    async def _fetch_threads(self, thread_ids: list[str]) -> list[ThreadResult]:
+        """Resolve threads, preserving the order of thread_ids
+
+        See DeepMemorySearcher._fetch_threads.
+        """
+        import asyncio
+
+        if not thread_ids:
+            return []
+
+        resolved: dict[str, ThreadResult] = {}
+        if self.thread_index is not None:
+            # SQLite calls run in a worker thread, as in ThreadCache.afetch
+            resolved = await asyncio.to_thread(self._indexed_threads, thread_ids)
+            if await asyncio.to_thread(self._index_needs_refresh, resolved, thread_ids):
+                with self._phase("phase2/summaries"):
+                    try:
+                        summaries = await self.client.get_thread_summaries(
+                            limit=SUMMARY_INDEX_LIMIT,
+                        )
+                    except Exception:
+                        summaries = None
+                    await asyncio.to_thread(self._index_summaries, summaries)
+                resolved = await asyncio.to_thread(self._indexed_threads, thread_ids)
+
+        missing = [tid for tid in thread_ids if tid not in resolved]
+        self._report_index_lookups(len(thread_ids), len(missing))
+        semaphore = asyncio.Semaphore(self.thread_concurrency)
+
+        async def fetch(thread_id: str) -> ThreadResult | None:
+            async with semaphore:
+                return await self._fetch_thread(thread_id)
+
+        fetched = await asyncio.gather(*(fetch(tid) for tid in missing))
+        for tid, thread in zip(missing, fetched):
+            if thread is not None:
+                resolved[tid] = thread
+        return [resolved[tid] for tid in thread_ids if tid in resolved]
+
+    async def _fetch_thread(self, thread_id: str) -> ThreadResult | None:
+        """Fetch a single thread, returning None if it cannot be loaded"""
+        import asyncio
+
+        with self._phase("phase2/thread", thread_id):
+            try:
+                thread_data = await self.get_thread_detail(thread_id)
+            except CircuitOpenError:
+                raise  # Server is down; fail fast instead of dropping threads
+            except Exception:
+                return None  # Thread may have been deleted
+            if self.thread_search is not None:
+                await asyncio.to_thread(self._index_thread_text, thread_data)
+            if self.thread_index is not None:
+                await asyncio.to_thread(
+                    self._index_threads, [thread_data.get("thread", thread_data)]
+                )
+            with timings.stage("parse"):
+                return self._thread_from_payload(thread_data, index=False)
+
+    async def get_thread_detail(self, thread_id: str) -> dict[str, Any]:
+        """Get full thread content for expanded view"""
+        if self.thread_cache is None:
+            return await self.client.get_thread(thread_id)
+
+        loaded = False
+
+        async def load(thread_id: str) -> dict[str, Any]:
+            nonlocal loaded
+            loaded = True
+            return await self.client.get_thread(thread_id)
+
+        try:
+            return await self.thread_cache.afetch(thread_id, load)
+        finally:
+            # A remembered 404 raised from the cache also counts as a hit
+            if loaded:
+                self.hooks.cache_miss("thread")
+            else:
+                self.hooks.cache_hit("thread")
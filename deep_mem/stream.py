@@ -0,0 +1,231 @@
+"""Incremental decoding of thread payloads
+
+get_thread responses look like {"thread": {...}, "messages": [...]} and can
+run to tens of megabytes. iter_thread_events decodes such a body from a
+stream of byte chunks and yields each message as soon as it is complete,
+so memory stays bounded by the largest single message rather than the
+whole thread.
+
+Events are (kind, payload) tuples:
+
+    ("field", (key, value))   any top-level key other than "messages"
+    ("message", message)      one element of the top-level "messages" array
+"""
+
+import codecs
+import json
+from collections import deque
+from typing import Any, Iterable, Iterator
+
+ThreadEvent = tuple[str, Any]
+
+_WHITESPACE = " \t\n\r"
+_decoder = json.JSONDecoder()
+
+
+class _Reader:
+    """Cursor over a growing text buffer fed from byte chunks"""
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self._chunks = iter(chunks)
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self, min_size: int = 0) -> bool:
+        """Append chunks until the buffer holds at least min_size chars
+
+        Returns False if the stream is exhausted before anything was read.
+        """
+        # Drop consumed text so memory doesn't grow with the stream
+        if self.pos:
+            self.buf = self.buf[self.pos:]
+            self.pos = 0
+        read_any = False
+        while not self.eof:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                self.eof = True
+                self.buf += self._utf8.decode(b"", final=True)
+                break
+            self.buf += self._utf8.decode(chunk)
+            read_any = True
+            if len(self.buf) >= min_size:
+                break
+        return read_any
+
+    def peek(self) -> str | None:
+        """Next non-whitespace char (not consumed), or None at end of stream"""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self.fill():
+                return None
+
+    def expect(self, chars: str) -> str:
+        char = self.peek()
+        if char is None or char not in chars:
+            raise ValueError(f"Expected one of {chars!r} in thread payload, got {char!r}")
+        self.pos += 1
+        return char
+
+    def value(self) -> Any:
+        """Decode one complete JSON value at the cursor"""
+        self.peek()
+        while True:
+            try:
+                obj, end = _decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                # Incomplete value: at least double the pending text before
+                # retrying, so huge values are not re-scanned per chunk
+                pending = len(self.buf) - self.pos
+                if not self.fill(min_size=2 * pending + 1):
+                    raise
+                continue
+            if end == len(self.buf) and not self.eof:
+                # A number or literal may continue in the next chunk
+                if self.fill():
+                    continue
+            self.pos = end
+            return obj
+
+
+def iter_thread_events(chunks: Iterable[bytes]) -> Iterator[ThreadEvent]:
+    """Decode a thread JSON object from byte chunks, yielding events"""
+    reader = _Reader(chunks)
+    reader.expect("{")
+    if reader.peek() == "}":
+        return
+
+    while True:
+        key = reader.value()
+        reader.expect(":")
+        if key == "messages" and reader.peek() == "[":
+            reader.expect("[")
+            if reader.peek() == "]":
+                reader.expect("]")
+            else:
+                while True:
+                    yield "message", reader.value()
+                    if reader.expect(",]") == "]":
+                        break
+        else:
+            yield "field", (key, reader.value())
+
+        if reader.expect(",}") == "}":
+            return
+
+
+def iter_payload_events(payload: dict[str, Any]) -> Iterator[ThreadEvent]:
+    """Yield the events for an already decoded thread payload"""
+    for key, value in payload.items():
+        if key == "messages" and isinstance(value, list):
+            for message in value:
+                yield "message", message
+        else:
+            yield "field", (key, value)
+
+
+def slice_events(
+    events: Iterable[ThreadEvent],
+    start: int | None = None,
+    stop: int | None = None,
+) -> Iterator[ThreadEvent]:
+    """Keep only messages[start:stop] (Python slice semantics)
+
+    Field events pass through. With non-negative bounds the source is
+    abandoned as soon as the window is filled, which closes a streamed
+    response without decoding the rest. Negative bounds are counted from
+    the end and buffer at most abs(bound) messages.
+    """
+    start = start or 0
+    events = iter(events)
+
+    if start >= 0 and (stop is None or stop >= 0):
+        index = 0
+        try:
+            for kind, payload in events:
+                if kind != "message":
+                    yield kind, payload
+                    continue
+                if stop is not None and index >= stop:
+                    break
+                if index >= start:
+                    yield kind, payload
+                index += 1
+                if stop is not None and index >= stop:
+                    break
+        finally:
+            # Release a streamed response right away instead of at GC time
+            close = getattr(events, "close", None)
+            if close is not None:
+                close()
+        return
+
+    if start >= 0:
+        # stop < 0: hold back the last abs(stop) messages, which are dropped
+        held: deque = deque()
+        index = 0
+        for kind, payload in events:
+            if kind != "message":
+                yield kind, payload
+                continue
+            if index >= start:
+                held.append(payload)
+                if len(held) > -stop:
+                    yield "message", held.popleft()
+            index += 1
+        return
+
+    # start < 0: keep a ring of the last abs(start) messages
+    ring: deque = deque(maxlen=-start)
+    total = 0
+    for kind, payload in events:
+        if kind != "message":
+            yield kind, payload
+            continue
+        ring.append(payload)
+        total += 1
+    first = total - len(ring)
+    lo, hi, _ = slice(start, stop).indices(total)
+    for offset, message in enumerate(ring):
+        if lo <= first + offset < hi:
+            yield "message", message
+
+
+class MessageCounter:
+    """Pass events through unchanged, counting the messages among them
+
+    total is the number of messages in the source once it has been read to
+    the end, else None (e.g. after slice_events abandoned it early).
+    """
+
+    def __init__(self, events: Iterable[ThreadEvent]):
+        self._events = iter(events)
+        self.count = 0
+        self._exhausted = False
+
+    def __iter__(self) -> "MessageCounter":
+        return self
+
+    def __next__(self) -> ThreadEvent:
+        try:
+            kind, payload = next(self._events)
+        except StopIteration:
+            self._exhausted = True
+            raise
+        if kind == "message":
+            self.count += 1
+        return kind, payload
+
+    def close(self) -> None:
+        close = getattr(self._events, "close", None)
+        if close is not None:
+            close()
+
+    @property
+    def total(self) -> int | None:
+        return self.count if self._exhausted else None
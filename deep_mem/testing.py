@@ -0,0 +1,636 @@
+"""Local stand-in for the Nowledge Mem API
+
+MockServer answers the endpoints deep-mem uses (memory search, get and
+list, thread search, get and summaries) from an in-memory corpus, with
+response shapes _SearcherBase._parse_memories accepts. Latency, error
+rate and error status can be set globally or per endpoint, and payload
+sizes follow from the corpus (see sample_corpus), so client features can
+be measured locally and reproducibly. All randomness comes from one
+seeded generator.
+
+The same server runs in-process or on a socket:
+
+    server = MockServer(*sample_corpus(), latency=Latency("lognormal", 20, 0.5))
+    client = APIClient.for_app(server)             # WSGI, no sockets
+    client = AsyncAPIClient.for_app(server.asgi)   # ASGI, no sockets
+    with server.start() as running:                # threaded HTTP/1.1 server
+        client = APIClient(running.url, "token")
+
+or from a shell: python -m deep_mem.testing --port 18765 --latency lognormal:20:0.5
+"""
+
+import gzip
+import json
+import math
+import os
+import random
+import re
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from socketserver import ThreadingUnixStreamServer
+from typing import Any, Callable, Iterable, Self
+from urllib.parse import parse_qs
+
+# Endpoint names, as used for per-endpoint behavior and request counts
+ENDPOINTS = (
+    "memories/search",
+    "memories/get",
+    "memories/list",
+    "threads/search",
+    "threads/get",
+    "threads/summaries",
+)
+
+# Responses smaller than this are never gzipped
+_MIN_COMPRESS_BYTES = 1024
+
+_WORDS = (
+    "python", "async", "database", "index", "cache", "latency", "agent", "memory",
+    "thread", "search", "vector", "prompt", "deploy", "review", "design", "budget",
+)
+_CJK_WORDS = (
+    "异步", "数据库", "索引", "缓存", "延迟", "向量", "检索", "架构",
+    "部署", "评审", "工程师", "成长", "项目", "记忆", "线程", "性能",
+)
+_LABELS = ("python", "ml", "infra", "career", "notes", "project")
+
+
+@dataclass(frozen=True, slots=True)
+class Latency:
+    """A response delay distribution, in milliseconds
+
+    distribution is one of:
+        fixed: always ms
+        uniform: ms +/- spread
+        normal: mean ms, standard deviation spread
+        lognormal: median ms, shape (sigma of the log) spread; long-tailed
+        exponential: mean ms
+    Samples are never negative.
+    """
+    distribution: str = "fixed"
+    ms: float = 0.0
+    spread: float = 0.0
+
+    def __post_init__(self) -> None:
+        if self.distribution not in ("fixed", "uniform", "normal", "lognormal", "exponential"):
+            raise ValueError(f"Unknown latency distribution: {self.distribution!r}")
+
+    @classmethod
+    def parse(cls, text: str) -> Self:
+        """Parse "DISTRIBUTION:MS[:SPREAD]" (e.g. "lognormal:20:0.5") or plain "MS" """
+        parts = text.split(":")
+        if len(parts) == 1:
+            return cls("fixed", float(parts[0]))
+        if len(parts) > 3:
+            raise ValueError(f"Expected DISTRIBUTION:MS[:SPREAD], got {text!r}")
+        return cls(parts[0], *(float(part) for part in parts[1:]))
+
+    def sample(self, rng: random.Random) -> float:
+        """One delay in seconds"""
+        if self.ms <= 0:
+            return 0.0
+        match self.distribution:
+            case "fixed":
+                ms = self.ms
+            case "uniform":
+                ms = rng.uniform(self.ms - self.spread, self.ms + self.spread)
+            case "normal":
+                ms = rng.gauss(self.ms, self.spread)
+            case "lognormal":
+                ms = rng.lognormvariate(math.log(self.ms), self.spread)
+            case _:
+                ms = rng.expovariate(1 / self.ms)
+        return max(ms, 0.0) / 1000
+
+
+@dataclass(slots=True)
+class Behavior:
+    """How an endpoint responds: delay and injected failures"""
+    latency: Latency = field(default_factory=Latency)
+    error_rate: float = 0.0
+    error_status: int = 503
+
+
+def sample_corpus(
+    memories: int = 200,
+    threads: int = 40,
+    content_chars: int = 300,
+    messages_per_thread: int = 10,
+    message_chars: int = 400,
+    seed: int = 0,
+) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+    """A small mixed Chinese/English corpus: (memories, thread payloads)
+
+    Every memory references one of the threads through metadata.source_id.
+    content_chars, messages_per_thread and message_chars set the payload
+    sizes of memory search and get_thread responses.
+    """
+    rng = random.Random(seed)
+
+    def text(chars: int) -> str:
+        words = []
+        size = 0
+        while size < chars:
+            word = rng.choice(_CJK_WORDS if rng.random() < 0.5 else _WORDS)
+            words.append(word)
+            size += len(word) + 1
+        return " ".join(words)[:chars]
+
+    thread_payloads = []
+    for i in range(threads):
+        messages = [
+            {"role": "user" if j % 2 == 0 else "assistant", "content": text(message_chars)}
+            for j in range(messages_per_thread)
+        ]
+        thread_payloads.append({
+            "thread": {
+                "thread_id": f"thread-{i:05d}",
+                "title": text(30),
+                "summary": text(120),
+                "message_count": len(messages),
+                "created_at": f"2024-{i % 12 + 1:02d}-01T00:00:00Z",
+                "last_activity": f"2024-{i % 12 + 1:02d}-02T00:00:00Z",
+            },
+            "messages": messages,
+        })
+
+    memory_records = []
+    for i in range(memories):
+        labels = rng.sample(_LABELS, rng.randint(0, 2))
+        source = thread_payloads[i % threads]["thread"]["thread_id"] if threads else None
+        memory_records.append({
+            "id": f"mem-{i:06d}",
+            "title": text(40),
+            "content": text(content_chars),
+            "importance": round(rng.random(), 2),
+            "labels": labels,
+            "created_at": f"2024-{i % 12 + 1:02d}-{i % 28 + 1:02d}T00:00:00Z",
+            "metadata": {"source_id": source, "labels": labels},
+        })
+    return memory_records, thread_payloads
+
+
+def _terms(query: str) -> list[str]:
+    return [term for term in query.lower().split() if term] or [query.lower()]
+
+
+def _score(text: str, terms: list[str]) -> float:
+    return sum(term in text for term in terms) / len(terms)
+
+
+class MockServer:
+    """In-memory Nowledge Mem API with latency and fault injection
+
+    Args:
+        memories: Memory objects (id, title, content, metadata.source_id, ...)
+        threads: get_thread payloads ({"thread": {...}, "messages": [...]})
+        latency: Default response delay for every endpoint
+        error_rate: Fraction of requests answered with error_status
+        error_status: Status of injected errors (e.g. 429, 500, 503)
+        endpoints: Behavior overrides by endpoint name (see ENDPOINTS)
+        memory_format: Memory search response shape: "nested"
+            ({"results": [{"memory": {...}, "similarity_score"}]}), "flat"
+            ({"results": [{...memory, "similarity_score"}]}) or "list"
+        auth_token: If set, requests without this bearer token get 401
+        compress: gzip responses for clients that accept it
+        seed: Seed for latency and error sampling
+    """
+
+    def __init__(
+        self,
+        memories: Iterable[dict[str, Any]] = (),
+        threads: Iterable[dict[str, Any]] = (),
+        latency: Latency | None = None,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        endpoints: dict[str, Behavior] | None = None,
+        memory_format: str = "nested",
+        auth_token: str | None = None,
+        compress: bool = True,
+        seed: int = 0,
+    ):
+        if memory_format not in ("nested", "flat", "list"):
+            raise ValueError(f"Unknown memory_format: {memory_format!r}")
+        unknown = set(endpoints or ()) - set(ENDPOINTS)
+        if unknown:
+            raise ValueError(f"Unknown endpoints: {', '.join(sorted(unknown))}")
+        self.default = Behavior(latency or Latency(), error_rate, error_status)
+        self.endpoints = dict(endpoints or {})
+        self.memory_format = memory_format
+        self.auth_token = auth_token
+        self.compress = compress
+        self.requests: Counter[str] = Counter()
+        self.errors: Counter[str] = Counter()
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._memories: list[dict[str, Any]] = []
+        self._memory_text: list[str] = []
+        self._memory_by_id: dict[str, dict[str, Any]] = {}
+        self._threads: dict[str, dict[str, Any]] = {}
+        self._thread_text: dict[str, str] = {}
+        self.add_memories(memories)
+        self.add_threads(threads)
+
+    def add_memories(self, memories: Iterable[dict[str, Any]]) -> None:
+        for memory in memories:
+            self._memories.append(memory)
+            self._memory_text.append(
+                f"{memory.get('title') or ''}\n{memory.get('content') or ''}".lower()
+            )
+            self._memory_by_id[memory.get("id") or memory.get("memory_id")] = memory
+
+    def add_threads(self, threads: Iterable[dict[str, Any]]) -> None:
+        for payload in threads:
+            meta = payload["thread"]
+            self._threads[meta["thread_id"]] = payload
+            messages = "\n".join(m.get("content") or "" for m in payload.get("messages", []))
+            self._thread_text[meta["thread_id"]] = (
+                f"{meta.get('title') or ''}\n{meta.get('summary') or ''}\n{messages}".lower()
+            )
+
+    def remove_threads(self, thread_ids: Iterable[str]) -> None:
+        """Delete threads, as if removed on the server"""
+        for thread_id in thread_ids:
+            self._threads.pop(thread_id, None)
+            self._thread_text.pop(thread_id, None)
+
+    @property
+    def memory_count(self) -> int:
+        return len(self._memories)
+
+    @property
+    def thread_count(self) -> int:
+        return len(self._threads)
+
+    def behavior(self, endpoint: str) -> Behavior:
+        return self.endpoints.get(endpoint, self.default)
+
+    def reset_counts(self) -> None:
+        with self._lock:
+            self.requests.clear()
+            self.errors.clear()
+
+    # Request handling, shared by the WSGI, ASGI and socket front ends
+
+    def handle(
+        self,
+        method: str,
+        path: str,
+        query_string: str,
+        headers: dict[str, str],
+        body: bytes,
+    ) -> tuple[int, list[tuple[str, str]], bytes, float]:
+        """Answer one request: (status, headers, body, seconds to delay)
+
+        headers must have lowercase names.
+        """
+        endpoint, route = self._route(method, path)
+        if endpoint is None:
+            if route is None:
+                return self._respond(404, {"detail": "Not Found"}, headers)
+            return self._respond(405, {"detail": "Method Not Allowed"}, headers)
+
+        behavior = self.behavior(endpoint)
+        with self._lock:
+            self.requests[endpoint] += 1
+            failed = behavior.error_rate > 0 and self._rng.random() < behavior.error_rate
+            delay = behavior.latency.sample(self._rng)
+            if failed:
+                self.errors[endpoint] += 1
+
+        if self.auth_token and headers.get("authorization") != f"Bearer {self.auth_token}":
+            status, payload = 401, {"detail": "Invalid token"}
+        elif failed:
+            status, payload = behavior.error_status, {"detail": "Injected fault"}
+        else:
+            params = {k: v[-1] for k, v in parse_qs(query_string).items()}
+            status, payload = route(params, body)
+        status, response_headers, response_body, _ = self._respond(status, payload, headers)
+        return status, response_headers, response_body, delay
+
+    def _route(self, method: str, path: str) -> tuple[str | None, Callable | None]:
+        """(endpoint name, handler); (None, None) if unknown, (None, handler) if wrong method"""
+        path = path.rstrip("/")
+        if path == "/memories/search":
+            endpoint, route, allowed = "memories/search", self._search_memories, "POST"
+        elif path == "/memories":
+            endpoint, route, allowed = "memories/list", self._list_memories, "GET"
+        elif path == "/threads/search":
+            endpoint, route, allowed = "threads/search", self._search_threads, "GET"
+        elif path == "/threads/summaries":
+            endpoint, route, allowed = "threads/summaries", self._summaries, "GET"
+        elif match := re.fullmatch(r"/memories/([^/]+)", path):
+            memory_id = match.group(1)
+            endpoint, allowed = "memories/get", "GET"
+            route = lambda params, body: self._get_memory(memory_id)  # noqa: E731
+        elif match := re.fullmatch(r"/threads/([^/]+)", path):
+            thread_id = match.group(1)
+            endpoint, allowed = "threads/get", "GET"
+            route = lambda params, body: self._get_thread(thread_id)  # noqa: E731
+        else:
+            return None, None
+        if method != allowed:
+            return None, route
+        return endpoint, route
+
+    def _respond(
+        self,
+        status: int,
+        payload: Any,
+        request_headers: dict[str, str],
+    ) -> tuple[int, list[tuple[str, str]], bytes, float]:
+        body = json.dumps(payload, ensure_ascii=False).encode()
+        headers = [("Content-Type", "application/json")]
+        if (
+            self.compress
+            and len(body) >= _MIN_COMPRESS_BYTES
+            and "gzip" in request_headers.get("accept-encoding", "")
+        ):
+            body = gzip.compress(body, compresslevel=1)
+            headers.append(("Content-Encoding", "gzip"))
+        headers.append(("Content-Length", str(len(body))))
+        return status, headers, body, 0.0
+
+    def _search_memories(self, params: dict[str, str], body: bytes) -> tuple[int, Any]:
+        try:
+            request = json.loads(body or b"{}")
+            query = str(request["query"])
+            limit = int(request.get("limit", 10))
+        except (ValueError, KeyError, TypeError):
+            return 422, {"detail": "Expected a JSON body with a query"}
+        wanted = {
+            label.strip() for label in (request.get("filter_labels") or "").split(",")
+            if label.strip()
+        }
+
+        terms = _terms(query)
+        matches = []
+        for i, text in enumerate(self._memory_text):
+            score = _score(text, terms)
+            if score > 0:
+                if wanted and not wanted & set(self._memories[i].get("labels") or ()):
+                    continue
+                matches.append((score, i))
+        matches.sort(key=lambda match: (-match[0], match[1]))
+
+        results = []
+        for score, i in matches[:limit]:
+            memory = self._memories[i]
+            similarity = round(0.5 + score / 2, 4)
+            if self.memory_format == "nested":
+                results.append({
+                    "memory": memory,
+                    "similarity_score": similarity,
+                    "relevance_reason": f"matched {score:.0%} of query terms",
+                })
+            else:
+                results.append({**memory, "similarity_score": similarity})
+        if self.memory_format == "list":
+            return 200, results
+        return 200, {"results": results, "total_found": len(matches)}
+
+    def _get_memory(self, memory_id: str) -> tuple[int, Any]:
+        memory = self._memory_by_id.get(memory_id)
+        if memory is None:
+            return 404, {"detail": "Memory not found"}
+        return 200, memory
+
+    def _list_memories(self, params: dict[str, str], body: bytes) -> tuple[int, Any]:
+        limit = int(params.get("limit", 100))
+        offset = int(params.get("offset", 0))
+        memories = self._memories
+        if since := params.get("updated_since"):
+            memories = [
+                m for m in memories if (m.get("updated_at") or m.get("created_at") or "") >= since
+            ]
+        return 200, {"memories": memories[offset:offset + limit]}
+
+    def _search_threads(self, params: dict[str, str], body: bytes) -> tuple[int, Any]:
+        query = params.get("query", "")
+        limit = int(params.get("limit", 20))
+        terms = _terms(query)
+        matches = sorted(
+            (
+                (score, thread_id)
+                for thread_id, text in self._thread_text.items()
+                if (score := _score(text, terms)) > 0
+            ),
+            key=lambda match: -match[0],
+        )
+        return 200, {
+            "threads": [self._threads[thread_id]["thread"] for _, thread_id in matches[:limit]],
+            "total_found": len(matches),
+        }
+
+    def _get_thread(self, thread_id: str) -> tuple[int, Any]:
+        payload = self._threads.get(thread_id)
+        if payload is None:
+            return 404, {"detail": "Thread not found"}
+        return 200, payload
+
+    def _summaries(self, params: dict[str, str], body: bytes) -> tuple[int, Any]:
+        limit = int(params.get("limit", 50))
+        threads = list(self._threads.values())[:limit]
+        return 200, {"summaries": [payload["thread"] for payload in threads]}
+
+    # Front ends
+
+    def __call__(self, environ: dict[str, Any], start_response: Callable) -> list[bytes]:
+        """WSGI entry point (blocks for the sampled latency)"""
+        length = int(environ.get("CONTENT_LENGTH") or 0)
+        body = environ["wsgi.input"].read(length) if length else b""
+        headers = {
+            key[5:].replace("_", "-").lower(): value
+            for key, value in environ.items() if key.startswith("HTTP_")
+        }
+        status, response_headers, payload, delay = self.handle(
+            environ["REQUEST_METHOD"],
+            environ.get("PATH_INFO", "/"),
+            environ.get("QUERY_STRING", ""),
+            headers,
+            body,
+        )
+        if delay:
+            time.sleep(delay)
+        start_response(f"{status} {_reason(status)}", response_headers)
+        return [payload]
+
+    async def asgi(self, scope: dict[str, Any], receive: Callable, send: Callable) -> None:
+        """ASGI entry point (awaits the sampled latency)"""
+        import asyncio
+
+        if scope["type"] != "http":
+            return
+        body = b""
+        while True:
+            message = await receive()
+            body += message.get("body", b"")
+            if not message.get("more_body"):
+                break
+        headers = {key.decode().lower(): value.decode() for key, value in scope["headers"]}
+        status, response_headers, payload, delay = self.handle(
+            scope["method"], scope["path"], scope["query_string"].decode(), headers, body,
+        )
+        if delay:
+            await asyncio.sleep(delay)
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [(key.encode(), value.encode()) for key, value in response_headers],
+        })
+        await send({"type": "http.response.body", "body": payload})
+
+    def start(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        uds: str | None = None,
+    ) -> "RunningServer":
+        """Serve over HTTP/1.1 with keep-alive in a background thread
+
+        Listens on host:port (port 0 picks a free one) or, with uds, on a
+        Unix socket. Each connection gets its own thread, so latency is
+        concurrent as on a real server.
+        """
+        handler = _handler_for(self, tcp=uds is None)
+        if uds is not None:
+            server: Any = _UnixHTTPServer(uds, handler)
+            url = f"unix://{uds}"
+        else:
+            server = ThreadingHTTPServer((host, port), handler)
+            url = f"http://{host}:{server.server_address[1]}"
+        server.daemon_threads = True
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        return RunningServer(server, thread, url)
+
+
+class _UnixHTTPServer(ThreadingUnixStreamServer):
+    def server_bind(self) -> None:
+        if os.path.exists(self.server_address):
+            os.unlink(self.server_address)
+        super().server_bind()
+
+
+def _handler_for(server: MockServer, tcp: bool = True) -> type[BaseHTTPRequestHandler]:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # Keep connections open
+        # Headers and body go out in separate writes; with Nagle on, every
+        # keep-alive response after the first waits ~40 ms for a delayed ACK.
+        # TCP_NODELAY doesn't exist for Unix sockets.
+        disable_nagle_algorithm = tcp
+
+        def _dispatch(self) -> None:
+            length = int(self.headers.get("Content-Length") or 0)
+            body = self.rfile.read(length) if length else b""
+            path, _, query_string = self.path.partition("?")
+            status, headers, payload, delay = server.handle(
+                self.command,
+                path,
+                query_string,
+                {key.lower(): value for key, value in self.headers.items()},
+                body,
+            )
+            if delay:
+                time.sleep(delay)
+            self.send_response(status)
+            for key, value in headers:
+                self.send_header(key, value)
+            self.end_headers()
+            self.wfile.write(payload)
+
+        do_GET = do_POST = do_PUT = do_DELETE = _dispatch
+
+        def log_message(self, format: str, *args: Any) -> None:
+            pass
+
+    return Handler
+
+
+def _reason(status: int) -> str:
+    try:
+        return HTTPStatus(status).phrase
+    except ValueError:
+        return ""
+
+
+class RunningServer:
+    """A MockServer listening on a socket; stop with close() or a with block"""
+
+    def __init__(self, server: Any, thread: threading.Thread, url: str):
+        self.server = server
+        self.thread = thread
+        self.url = url
+
+    def close(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> bool:
+        self.close()
+        return False
+
+
+def main(argv: list[str] | None = None) -> None:
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="python -m deep_mem.testing",
+        description="Run a mock Nowledge Mem server with a synthetic corpus",
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=18765)
+    parser.add_argument("--uds", help="Listen on this Unix socket instead")
+    parser.add_argument("--corpus", help="Serve a directory written by python -m deep_mem.corpus")
+    parser.add_argument("--memories", type=int, default=200)
+    parser.add_argument("--threads", type=int, default=40)
+    parser.add_argument("--content-chars", type=int, default=300)
+    parser.add_argument("--messages", type=int, default=10, help="Messages per thread")
+    parser.add_argument("--message-chars", type=int, default=400)
+    parser.add_argument("--latency", type=Latency.parse, default=Latency(),
+                        help="MS or DISTRIBUTION:MS[:SPREAD], e.g. lognormal:20:0.5")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--format", dest="memory_format", default="nested",
+                        choices=("nested", "flat", "list"))
+    parser.add_argument("--token", help="Require this bearer token")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    if args.corpus:
+        memories, threads = [], []
+    else:
+        memories, threads = sample_corpus(
+            args.memories, args.threads, args.content_chars, args.messages, args.message_chars,
+            seed=args.seed,
+        )
+    server = MockServer(
+        memories, threads,
+        latency=args.latency,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        memory_format=args.memory_format,
+        auth_token=args.token,
+        seed=args.seed,
+    )
+    if args.corpus:
+        from deep_mem.corpus import load_into
+        load_into(server, args.corpus)
+    running = server.start(args.host, args.port, args.uds)
+    print(f"Mock Nowledge Mem server at {running.url}", flush=True)
+    try:
+        running.thread.join()
+    except KeyboardInterrupt:
+        running.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+"""Per-phase timing instrumentation
+
+A Timings collector is activated for the current context with collect();
+code on the search path then attributes durations to the active phase
+("phase1", "strategy2", "phase2/thread/<id>", ...) and a stage within it
+("setup", "connect", "ttfb", "download", "decode", "parse", "total").
+Without an active collector every hook is a cheap no-op.
+
+State lives in context variables, so asyncio tasks inherit it. Threads do
+not: work submitted to an executor must be wrapped with bind().
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar, copy_context
+from typing import Any, Callable, Iterator
+
+_collector: ContextVar["Timings | None"] = ContextVar("deep_mem_timings", default=None)
+_phase: ContextVar[str] = ContextVar("deep_mem_phase", default="other")
+
+# Stages in display order; unknown stages are listed after these
+STAGES = (
+    "setup", "connect", "ttfb", "download", "daemon", "decode", "parse", "index", "total",
+)
+
+
+class Timings:
+    """Accumulated seconds per (phase, stage); safe to share between threads"""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._seconds: dict[str, dict[str, float]] = {}
+
+    def add(self, phase: str, stage: str, seconds: float) -> None:
+        with self._lock:
+            stages = self._seconds.setdefault(phase, {})
+            stages[stage] = stages.get(stage, 0.0) + seconds
+
+    def to_dict(self) -> dict[str, dict[str, float]]:
+        """Milliseconds per stage, keyed by phase in first-recorded order"""
+        with self._lock:
+            return {
+                phase: {
+                    stage: round(stages[stage] * 1000, 2)
+                    for stage in sorted(stages, key=_stage_order)
+                }
+                for phase, stages in self._seconds.items()
+            }
+
+
+def _stage_order(stage: str) -> int:
+    return STAGES.index(stage) if stage in STAGES else len(STAGES)
+
+
+@contextmanager
+def collect() -> Iterator[Timings]:
+    """Record timings for everything run in this context"""
+    timings = Timings()
+    token = _collector.set(timings)
+    try:
+        yield timings
+    finally:
+        _collector.reset(token)
+
+
+def active() -> bool:
+    return _collector.get() is not None
+
+
+def record(stage: str, seconds: float) -> None:
+    """Add seconds to stage of the current phase"""
+    timings = _collector.get()
+    if timings is not None:
+        timings.add(_phase.get(), stage, seconds)
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    """Attribute timings inside the block to phase name, recording its total"""
+    if _collector.get() is None:
+        yield
+        return
+    token = _phase.set(name)
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record("total", time.perf_counter() - started)
+        _phase.reset(token)
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Time the block as stage name of the current phase"""
+    if _collector.get() is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, time.perf_counter() - started)
+
+
+def bind(fn: Callable[..., Any]) -> Callable[..., Any]:
+    """Wrap fn to run in a copy of the current context (for thread pools)"""
+    if _collector.get() is None:
+        return fn
+    context = copy_context()
+    return lambda *args, **kwargs: context.copy().run(fn, *args, **kwargs)
+
+
+class RequestTrace:
+    """httpx "trace" extension splitting a request into network stages
+
+    Records connect (TCP/Unix connect plus TLS), ttfb (request sent until
+    response headers) and, via finish(), download (headers until end() was
+    called, i.e. the body was read). The trace of a hedged request that
+    lost the race is cancelled instead, so the request is only counted
+    once.
+    """
+
+    __slots__ = ("started", "events", "ended", "cancelled")
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.events: dict[str, float] = {}
+        self.ended: float | None = None
+        self.cancelled = False
+
+    def __call__(self, name: str, info: dict[str, Any]) -> None:
+        self.events[name] = time.perf_counter()
+
+    async def trace_async(self, name: str, info: dict[str, Any]) -> None:
+        self(name, info)
+
+    def end(self) -> None:
+        """Note that the response is in; finish() may be called later"""
+        self.ended = time.perf_counter()
+
+    def cancel(self) -> None:
+        """Never record this request (e.g. the losing copy of a hedge)"""
+        self.cancelled = True
+
+    def finish(self, body_read: bool = True) -> None:
+        """Record the stages of a completed request, unless cancelled"""
+        if self.cancelled:
+            return
+        events = self.events
+        connect = 0.0
+        for step in ("connect_tcp", "connect_unix_socket", "start_tls"):
+            started = events.get(f"connection.{step}.started")
+            complete = events.get(f"connection.{step}.complete")
+            if started is not None and complete is not None:
+                connect += complete - started
+        if connect:
+            record("connect", connect)
+
+        sent = headers = None
+        for proto in ("http11", "http2"):
+            sent = sent or events.get(f"{proto}.send_request_headers.started")
+            headers = headers or events.get(f"{proto}.receive_response_headers.complete")
+        if headers is None:
+            return  # In-process transports don't emit trace events
+        record("ttfb", headers - (sent or self.started))
+        if body_read:
+            record("download", (self.ended or time.perf_counter()) - headers)